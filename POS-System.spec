@@ -5,7 +5,7 @@ a = Analysis(
     ['src\\pos_app.py'],
     pathex=[],
     binaries=[],
-    datas=[('data', 'data')],
+    datas=[('data', 'data'), ('database/schema.sql', 'database')],
     hiddenimports=['ttkbootstrap', 'PIL', 'PIL._tkinter_finder'],
     hookspath=[],
     hooksconfig={},
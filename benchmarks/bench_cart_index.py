@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: cart lookups with a list scan vs the Cart product-id index
+
+Scenario: 200-line cart against a 2,000-item menu
+- grid render: one quantity lookup per product card
+- tap: find the line for one product and bump its quantity
+
+Usage: python benchmarks/bench_cart_index.py
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import Cart
+
+MENU_SIZE = 2000
+CART_LINES = 200
+REPEAT = 20
+
+
+def make_menu():
+    return [
+        {'id': i, 'name': f"Item {i}", 'price': 10.0 + i % 50, 'category': f"Category {i % 10}"}
+        for i in range(1, MENU_SIZE + 1)
+    ]
+
+
+def list_qty(cart, product_id):
+    """Old lookup: linear scan of the cart list"""
+    for item in cart:
+        if item['id'] == product_id:
+            return item['qty']
+    return 0
+
+
+def list_add(cart, product):
+    """Old add_to_cart: scan then bump or append"""
+    for item in cart:
+        if item['id'] == product['id']:
+            item['qty'] += 1
+            item['total'] = item['price'] * item['qty']
+            return
+    cart.append({**product, 'qty': 1, 'total': product['price']})
+
+
+def main():
+    menu = make_menu()
+    in_cart = random.Random(3).sample(menu, CART_LINES)
+
+    cart_list = [{**p, 'qty': 1, 'total': p['price']} for p in in_cart]
+    cart = Cart()
+    for product in in_cart:
+        cart.add(product)
+
+    taps = random.Random(5).choices(in_cart, k=1000)
+
+    cases = [
+        ("grid render / list", lambda: [list_qty(cart_list, p['id']) for p in menu]),
+        ("grid render / Cart", lambda: [cart.qty(p['id']) for p in menu]),
+        ("1000 taps / list", lambda: [list_add(cart_list, p) for p in taps]),
+        ("1000 taps / Cart", lambda: [cart.add(p) for p in taps]),
+        ("subtotal / list", lambda: sum(item['total'] for item in cart_list)),
+        ("subtotal / Cart", lambda: cart.subtotal),
+    ]
+
+    print(f"Cart index ({CART_LINES}-line cart, {MENU_SIZE}-item menu, best of {REPEAT})")
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        print(f"{name:<22} {best * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: patch size of a cart sidebar click
+
+Clicks "+" on one line of a filled cart and measures the Flet patch
+sent to the client: commands, controls added and serialized bytes.
+The rebuild case reproduces the old behaviour of recreating every row.
+
+Usage: python benchmarks/bench_cart_sidebar.py [cart_lines] [clicks]
+"""
+import sys
+import time
+
+from flet_harness import BenchApp, make_page, make_products
+
+from src.views_flet.pos_view import POSView
+
+
+def mount_view(products, cart_lines):
+    """Create a POS view with a filled cart mounted on a recording page"""
+    page, conn = make_page()
+    view = POSView(BenchApp(page, products))
+    page.add(view.create())
+    for product in products[:cart_lines]:
+        view.add_to_cart(product)
+    conn.reset()
+    return view, conn
+
+
+def rebuild_click(view, item):
+    """Old behaviour: every click recreated all cart rows"""
+    view.app.cart.increase(item['id'])
+    view.cart_rows.clear()
+    view.cart_list.controls.clear()
+    view.update_cart_display()
+
+
+def incremental_click(view, item):
+    """Current behaviour: only the clicked row is patched"""
+    view.increase_quantity(item)
+
+
+def run(name, click, products, cart_lines, clicks):
+    view, conn = mount_view(products, cart_lines)
+    items = list(view.app.cart)
+
+    start = time.perf_counter()
+    for n in range(clicks):
+        click(view, items[n % len(items)])
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<12} {elapsed / clicks * 1000:>8.2f} ms/click "
+          f"{conn.commands / clicks:>8.1f} commands "
+          f"{conn.controls_sent / clicks:>8.1f} controls "
+          f"{conn.bytes_sent / clicks:>10.0f} bytes")
+
+
+def main():
+    cart_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    clicks = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    products = make_products(max(cart_lines, 100))
+
+    print(f"Cart sidebar click ({cart_lines}-line cart, {clicks} clicks)")
+    run("rebuild", rebuild_click, products, cart_lines, clicks)
+    run("incremental", incremental_click, products, cart_lines, clicks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: catalog load from SQLite vs the binary snapshot
+
+Scenario: 5,000 and 100,000 products in 40 categories
+- sqlite: DatabaseManager.get_all_products() (previous startup read)
+- snapshot: catalog version check + load_snapshot() of a current snapshot
+- catalog: ProductCatalog.load() end to end (indexes included), either way
+- stale: a product changed elsewhere, load falls back to SQLite and rewrites the snapshot
+
+Usage: python benchmarks/bench_catalog_snapshot.py [products...]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager, ProductCatalog, load_snapshot, snapshot_path
+
+SIZES = [5_000, 100_000]
+CATEGORIES = 40
+REPEAT = 5
+
+
+def make_db(path, products):
+    db = DatabaseManager(path)
+    with db.write_transaction() as cursor:
+        cursor.executemany("INSERT INTO categories (name) VALUES (?)", [(f"หมวด {i}",) for i in range(CATEGORIES)])
+        cursor.executemany(
+            "INSERT INTO products (name, price, category_id) SELECT ?, ?, id FROM categories WHERE name = ?",
+            [(f"เมนู {i:06d} Product", float(10 + i % 500), f"หมวด {i % CATEGORIES}") for i in range(products)]
+        )
+    return db
+
+
+def best_ms(load):
+    return min(timeit.repeat(load, number=1, repeat=REPEAT)) * 1000
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+
+    print(f"Catalog load (best of {REPEAT})")
+    print(f"{'products':>10} {'sqlite ms':>10} {'snapshot ms':>12} {'catalog/db ms':>14} "
+          f"{'catalog/snap ms':>16} {'stale ms':>9} {'snap KB':>8}")
+    for products in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = make_db(os.path.join(tmp, "bench.db"), products)
+            path = snapshot_path(db.db_path)
+
+            ProductCatalog(db, snapshot_path=path).load()
+            assert load_snapshot(path, db.get_catalog_version()) == (db.get_categories(), db.get_all_products())
+
+            sqlite_ms = best_ms(db.get_all_products)
+            snapshot_ms = best_ms(lambda: load_snapshot(path, db.get_catalog_version()))
+            catalog_db_ms = best_ms(lambda: ProductCatalog(db).load())
+            catalog_snap_ms = best_ms(lambda: ProductCatalog(db, snapshot_path=path).load())
+
+            product = db.get_all_products()[0]
+
+            def stale():
+                db.update_product(product['id'], product['name'], product['price'] + 1, product['category'])
+                ProductCatalog(db, snapshot_path=path).load()
+
+            stale_ms = best_ms(stale)
+
+            print(f"{products:>10,} {sqlite_ms:>10.1f} {snapshot_ms:>12.1f} {catalog_db_ms:>14.1f} "
+                  f"{catalog_snap_ms:>16.1f} {stale_ms:>9.1f} {os.path.getsize(path) / 1024:>8.1f}")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: POS category tab switch latency
+
+Scenario: 4,000 products in 40 categories, every tab clicked in turn
+- cold: no cards built yet (first visit of each tab)
+- rebuild: cards cached by product, card list rebuilt per click (previous grid)
+- swap: per-category card lists kept, a click swaps them into the grid
+- after edit: a product of the tab edited before each click (its category's list is synced)
+"logic" leaves out sending the page update, "total" includes it.
+
+Usage: python benchmarks/bench_category_tabs.py [products] [categories]
+"""
+import sys
+import time
+
+from flet_harness import BenchApp, make_page, make_products
+
+from database import CatalogChange
+from src.views_flet.pos_view import POSView
+
+PRODUCTS = 4_000
+CATEGORIES = 40
+ROUNDS = 5
+
+
+def mount_view(products):
+    """Create a POS view mounted on a recording page"""
+    page, conn = make_page()
+    app = BenchApp(page, products)
+    view = POSView(app)
+    page.add(view.create())
+    return app, view, conn
+
+
+def click_tabs(view, conn, tabs, before=None, send=True):
+    """Best ms and bytes per click over a few rounds through every tab"""
+    update_controls = view.update_controls
+    if not send:
+        view.update_controls = lambda *controls: None
+
+    best = None
+    for _ in range(ROUNDS):
+        conn.reset()
+        elapsed = 0.0
+        for category in tabs:
+            if before is not None:
+                before(category)
+            start = time.perf_counter()
+            view.filter_by_category(category)
+            elapsed += time.perf_counter() - start
+        per_click = elapsed * 1000 / len(tabs)
+        best = per_click if best is None else min(best, per_click)
+
+    view.update_controls = update_controls
+    return best, conn.bytes_sent / len(tabs)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PRODUCTS
+    category_count = int(sys.argv[2]) if len(sys.argv) > 2 else CATEGORIES
+    products = make_products(count, categories=category_count)
+
+    app, view, conn = mount_view(products)
+    tabs = app.categories + ["All"]
+
+    def cold(category):
+        view.invalidate_product_cards()
+
+    def rebuild(category):
+        view.category_cards.clear()
+
+    def edit(category):
+        # Catalog event of an edit in the tab's category (no database behind the bench app)
+        product = app.catalog.by_category(category if category != "All" else tabs[0])[0]
+        view.on_catalog_change(CatalogChange('updated', product, product))
+
+    print(f"Category tab switch ({count:,} products, {category_count} categories, best of {ROUNDS})")
+    print(f"{'case':<12} {'logic ms':>10} {'total ms':>10} {'KB/click':>10}")
+    for name, before in [("cold", cold), ("rebuild", rebuild), ("swap", None), ("after edit", edit)]:
+        logic_ms, _ = click_tabs(view, conn, tabs, before, send=False)
+        total_ms, size = click_tabs(view, conn, tabs, before)
+        print(f"{name:<12} {logic_ms:>10.3f} {total_ms:>10.2f} {size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: checkout latency seen by the UI, synchronous save vs the receipt writer
+
+Scenario: 2,000 checkouts of an 8-line cart, durable profile (fsync every commit).
+A second connection (e.g. History view, backup) holds the write lock for
+50 ms once every 200 checkouts.
+- sync: save_receipt() on the event handler (old confirm_payment)
+- queued: ReceiptWriter.submit() (journal append + fsync, write in background)
+
+Usage: python benchmarks/bench_checkout_latency.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import DatabaseManager, ReceiptWriter
+from database.connection import open_connection
+
+CHECKOUTS = 2000
+LOCK_EVERY = 200
+LOCK_SECONDS = 0.05
+PROFILE = "durable"
+BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100]
+CART = [
+    {'id': i, 'name': f"Item {i}", 'price': 20.0 + i, 'qty': 1, 'total': 20.0 + i}
+    for i in range(1, 9)
+]
+TOTAL = sum(item['total'] for item in CART)
+
+
+def make_db(path):
+    db = DatabaseManager(path, PROFILE)
+    db.conn.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+    db.conn.executemany(
+        "INSERT INTO products (id, name, price, category_id) VALUES (?, ?, ?, 1)",
+        [(item['id'], item['name'], item['price']) for item in CART]
+    )
+    db.conn.commit()
+    return db
+
+
+def hold_write_lock(path):
+    """Another connection takes the write lock for a while"""
+    conn = open_connection(path, PROFILE)
+    conn.execute("BEGIN IMMEDIATE")
+    time.sleep(LOCK_SECONDS)
+    conn.rollback()
+    conn.close()
+
+
+def run(path, checkout):
+    latencies = []
+    for i in range(CHECKOUTS):
+        if i % LOCK_EVERY == LOCK_EVERY - 1:
+            locker = threading.Thread(target=hold_write_lock, args=(path,))
+            locker.start()
+            time.sleep(0.001)  # let it take the lock
+        start = time.perf_counter()
+        checkout()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    print(f"\n{name}: p50 {pct(0.5):.3f} ms  p95 {pct(0.95):.3f} ms  "
+          f"p99 {pct(0.99):.3f} ms  max {latencies[-1]:.3f} ms")
+    lower = 0.0
+    for upper in BUCKETS_MS + [float("inf")]:
+        count = sum(1 for ms in latencies if lower <= ms < upper)
+        label = f"< {upper:g} ms" if upper != float("inf") else f">= {lower:g} ms"
+        print(f"  {label:>11} {count:>6} {'#' * (count * 50 // len(latencies))}")
+        lower = upper
+
+
+def main():
+    print(f"Checkout latency ({CHECKOUTS:,} checkouts, {PROFILE} profile, "
+          f"{LOCK_SECONDS * 1000:.0f} ms write lock every {LOCK_EVERY})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sync.db")
+        db = make_db(path)
+        report("sync save_receipt", run(path, lambda: db.save_receipt(CART, TOTAL, 500.0, 500.0 - TOTAL)))
+        db.close()
+
+        path = os.path.join(tmp, "queued.db")
+        make_db(path).close()
+        writer = ReceiptWriter(path, profile=PROFILE)
+        writer.start()
+        report("queued submit", run(path, lambda: writer.submit(CART, TOTAL, 500.0, 500.0 - TOTAL)))
+        writer.stop()
+
+
+if __name__ == "__main__":
+    main()
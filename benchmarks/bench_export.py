@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: streaming receipt export
+
+Scenario: 100,000 and 1,000,000 receipts with 3 lines each
+- full CSV export (and Parquet when pyarrow is installed)
+- incremental export after 1,000 new receipts
+- peak Python memory (tracemalloc) should not grow with the table size
+
+Usage: python benchmarks/bench_export.py [receipts ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+from database.export import available_formats, export_receipts
+
+SIZES = (100_000, 1_000_000)
+LINES = 3
+CHUNK = 50_000
+NEW_RECEIPTS = 1_000
+
+
+def add_receipts(db, first, count):
+    start = datetime(2020, 1, 1)
+    with db.write_transaction() as cursor:
+        for offset in range(first, first + count, CHUNK):
+            batch = range(offset, min(offset + CHUNK, first + count))
+            cursor.executemany("""
+                INSERT INTO receipts (id, date, total, cash_received, change, items_count)
+                VALUES (?, ?, 150.0, 150.0, 0.0, ?)
+            """, [(i + 1, (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"), LINES) for i in batch])
+            cursor.executemany("""
+                INSERT INTO receipt_items (receipt_id, product_id, product_name, price, qty, total)
+                VALUES (?, ?, ?, 50.0, 1, 50.0)
+            """, [(i + 1, line, f"Item {line}") for i in batch for line in range(1, LINES + 1)])
+
+
+def measure(fn):
+    """Time one run, then trace peak memory of a second (tracemalloc slows it down)"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+
+    print(f"{'scenario':<36} {'rows':>10} {'ms':>10} {'peak MB':>8}")
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(os.path.join(tmp, "bench.db"))
+            with db.write_transaction() as cursor:
+                cursor.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+                cursor.executemany(
+                    "INSERT INTO products (id, name, price, category_id) VALUES (?, ?, 50.0, 1)",
+                    [(i, f"Item {i}") for i in range(1, LINES + 1)]
+                )
+            add_receipts(db, 0, count)
+
+            scenarios = [(fmt, os.path.join(tmp, fmt)) for fmt in available_formats() if fmt != 'arrow']
+            for fmt, out in scenarios:
+                results, ms, peak = measure(lambda: export_receipts(db.db_path, out, fmt))
+                rows = sum(r['rows'] for r in results.values())
+                print(f"{f'{count:,} receipts, full {fmt}':<36} {rows:>10,} {ms:>10.1f} {peak:>8.2f}")
+
+            add_receipts(db, count, NEW_RECEIPTS)
+            out = scenarios[0][1]
+            results, ms, peak = measure(lambda: export_receipts(db.db_path, out, incremental=True))
+            rows = sum(r['rows'] for r in results.values())
+            print(f"{f'{count:,} receipts, incremental csv':<36} {rows:>10,} {ms:>10.1f} {peak:>8.2f}")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: category switch cost with an eager vs windowed product grid
+
+Measures controls and bytes sent to the Flet client per category switch
+on a large franchise catalog, plus the cost of scrolling one step.
+
+Usage: python benchmarks/bench_grid_window.py [products] [categories]
+"""
+import sys
+import time
+from types import SimpleNamespace
+
+from flet_harness import BenchApp, make_page, make_products
+
+from src.views_flet.pos_view import POSView
+
+
+def mount_view(products, window_size=None):
+    """Create a POS view mounted on a recording page"""
+    page, conn = make_page()
+    view = POSView(BenchApp(page, products))
+    if window_size is not None:
+        view.GRID_WINDOW_SIZE = window_size
+    page.add(view.create())
+    conn.reset()
+    return view, conn
+
+
+def switch_categories(view, conn, categories):
+    """Click through every category tab and back to All"""
+    start = time.perf_counter()
+    for category in categories + ["All"]:
+        view.filter_by_category(category)
+    elapsed = time.perf_counter() - start
+    switches = len(categories) + 1
+    return elapsed / switches, conn.controls_sent / switches, conn.bytes_sent / switches
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    category_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    products = make_products(count, categories=category_count)
+    categories = sorted({p['category'] for p in products})
+
+    print(f"Category switch ({count} products, {category_count} categories)")
+    for name, window_size in [("eager", count), ("windowed", None)]:
+        view, conn = mount_view(products, window_size)
+        seconds, controls, size = switch_categories(view, conn, categories)
+        print(f"{name:<10} {seconds * 1000:>10.1f} ms/switch "
+              f"{controls:>10.0f} controls/switch {size:>12.0f} bytes/switch")
+
+    # One scroll step near the end of the windowed grid
+    view, conn = mount_view(products)
+    event = SimpleNamespace(pixels=1000, max_scroll_extent=1200)
+    start = time.perf_counter()
+    view.on_grid_scroll(event)
+    elapsed = time.perf_counter() - start
+    print(f"scroll step {elapsed * 1000:>9.1f} ms "
+          f"{conn.controls_sent:>10} controls      {conn.bytes_sent:>12} bytes")
+
+
+if __name__ == "__main__":
+    main()
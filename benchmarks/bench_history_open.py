@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: opening the History view on a large receipt table
+
+Scenario: 2,000,000 receipts with 3 lines each
+- JOIN: old get_all_receipts (LEFT JOIN receipt_items ... GROUP BY, then LIMIT 50)
+- keyset: get_receipts_page (items_count column, idx_receipts_recent)
+- HistoryView.create() on the UI thread, until its first page is shown, and one scroll page
+
+Usage: python benchmarks/bench_history_open.py [receipts]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from flet_harness import BenchApp, make_page, make_products
+
+from database import DatabaseManager, ReceiptWriter
+from src.views_flet.history_view import HistoryView
+
+RECEIPTS = 2_000_000
+LINES = 3
+REPEAT = 5
+CHUNK = 50_000
+
+
+def make_db(path, count):
+    db = DatabaseManager(path)
+    start = datetime(2020, 1, 1)
+    with db.write_transaction() as cursor:
+        cursor.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+        cursor.executemany(
+            "INSERT INTO products (id, name, price, category_id) VALUES (?, ?, 50.0, 1)",
+            [(i, f"Item {i}") for i in range(1, LINES + 1)]
+        )
+        for offset in range(0, count, CHUNK):
+            batch = range(offset, min(offset + CHUNK, count))
+            cursor.executemany("""
+                INSERT INTO receipts (id, date, total, cash_received, change, items_count, date_ts)
+                VALUES (?1, ?2, 150.0, 150.0, 0.0, ?3, CAST(strftime('%s', ?2) AS INTEGER))
+            """, [(i + 1, (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"), LINES) for i in batch])
+            cursor.executemany("""
+                INSERT INTO receipt_items (receipt_id, product_id, product_name, price, qty, total)
+                VALUES (?, ?, ?, 50.0, 1, 50.0)
+            """, [(i + 1, line, f"Item {line}") for i in batch for line in range(1, LINES + 1)])
+    return db
+
+
+def join_receipts(db):
+    """Old get_all_receipts"""
+    return db.conn.execute("""
+        SELECT r.id, r.date, r.total, r.cash_received, r.change,
+               COUNT(ri.id) as items_count
+        FROM receipts r
+        LEFT JOIN receipt_items ri ON r.id = ri.receipt_id
+        GROUP BY r.id
+        ORDER BY r.date DESC
+        LIMIT 50
+    """).fetchall()
+
+
+def best(fn, repeat=REPEAT):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Building {count:,} receipts...")
+        make_db(path, count).close()
+
+        page, conn = make_page()
+        app = BenchApp(page, make_products(10), db=DatabaseManager(path))
+        app.receipt_writer = ReceiptWriter(path)
+        app.receipt_writer.start()
+        view = HistoryView(app)
+
+        def open_view(wait=False):
+            page.controls.clear()
+            page.add(view.create())
+            if wait:
+                view.load_thread.join()
+
+        def scroll_page():
+            view.on_receipts_scroll(SimpleNamespace(pixels=1000, max_scroll_extent=1200))
+
+        open_view(wait=True)
+        rows = [
+            ("get_all_receipts / JOIN", best(lambda: join_receipts(app.db), repeat=1)),
+            ("get_receipts_page", best(lambda: app.db.get_receipts_page())),
+            ("get_sales_summary", best(app.db.get_sales_summary)),
+            ("HistoryView.create + send", best(open_view)),
+            ("  + first page loaded", best(lambda: open_view(wait=True))),
+            ("scroll: next page + send", best(scroll_page)),
+        ]
+
+        print(f"History open ({count:,} receipts, {LINES} lines each)")
+        for name, ms in rows:
+            print(f"{name:<28} {ms:>10.2f} ms")
+
+        app.receipt_writer.stop()
+        app.db.close()
+
+
+if __name__ == "__main__":
+    main()
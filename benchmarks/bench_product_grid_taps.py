@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: add-to-cart taps per second on the POS product grid
+
+Compares the old behaviour (rebuild every card after each tap) with
+the keyed product-card registry that patches a single quantity badge.
+
+Usage: python benchmarks/bench_product_grid_taps.py [products] [taps]
+"""
+import random
+import sys
+import time
+
+from flet_harness import BenchApp, make_page, make_products
+
+from src.views_flet.pos_view import POSView
+
+
+def mount_view(products):
+    """Create a POS view mounted on a recording page"""
+    page, conn = make_page()
+    view = POSView(BenchApp(page, products))
+    page.add(view.create())
+    conn.reset()
+    return view, conn
+
+
+def full_rebuild_tap(view, product):
+    """Old behaviour: every tap rebuilt the whole grid"""
+    view.add_to_cart(product)
+    view.invalidate_product_cards()
+    view.GRID_WINDOW_SIZE = len(view.app.products)
+    view.display_products()
+
+
+def badge_patch_tap(view, product):
+    """Current behaviour: only the tapped card badge is patched"""
+    view.add_to_cart(product)
+
+
+def run(name, tap, products, taps):
+    view, conn = mount_view(products)
+    picks = random.Random(7).choices(products, k=taps)
+
+    start = time.perf_counter()
+    for product in picks:
+        tap(view, product)
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<16} {taps / elapsed:>10.1f} taps/s "
+          f"{elapsed / taps * 1000:>8.2f} ms/tap "
+          f"{conn.bytes_sent / taps:>12.0f} bytes/tap")
+    return taps / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    taps = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    products = make_products(count)
+
+    print(f"Product grid taps ({count} products, {taps} taps)")
+    before = run("full rebuild", full_rebuild_tap, products, taps)
+    after = run("badge patch", badge_patch_tap, products, taps)
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
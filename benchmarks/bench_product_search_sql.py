@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: product search with LIKE '%q%' vs the FTS5 trigram index
+
+Scenario: 100,000 synthetic products (English and Thai names) in a temp database
+- LIKE: the old search_products query, a full table scan
+- FTS: search_products_ranked (first 50 ranked results)
+
+Usage: python benchmarks/bench_product_search_sql.py
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import DatabaseManager
+
+ROWS = 100_000
+REPEAT = 10
+QUERIES = ["latte", "iced mocha", "กะเพรา", "ต้มยำ", "cake 999", "zzz"]
+WORDS = ["iced", "hot", "latte", "mocha", "green", "tea", "cake", "rice", "soup",
+         "ข้าว", "ผัด", "กะเพรา", "ต้มยำ", "น้ำ", "ชา", "เย็น", "ไก่", "หมู"]
+
+
+def make_db(path):
+    db = DatabaseManager(path)
+
+    rng = random.Random(1)
+    rows = [
+        (" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f" {i}",
+         10.0 + i % 90, f"Category {i % 40}")
+        for i in range(ROWS)
+    ]
+    db.conn.executemany("INSERT OR IGNORE INTO categories (name) VALUES (?)", [(row[2],) for row in rows])
+    db.conn.executemany(
+        "INSERT INTO products (name, price, category_id) SELECT ?, ?, id FROM categories WHERE name = ?", rows
+    )
+    db.conn.commit()
+    return db
+
+
+def like_search(db, query):
+    """Old search_products: full scan"""
+    return db.conn.execute("""
+        SELECT p.id, p.name, p.price, c.name
+        FROM products p JOIN categories c ON c.id = p.category_id
+        WHERE p.name LIKE ?
+        ORDER BY p.name
+    """, (f"%{query}%",)).fetchall()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(os.path.join(tmp, "bench.db"))
+
+        print(f"Product search ({ROWS:,} products, best of {REPEAT})")
+        print(f"{'query':<14} {'LIKE ms':>10} {'FTS ms':>10} {'matches':>9}")
+        for query in QUERIES:
+            like = min(timeit.repeat(lambda: like_search(db, query), number=1, repeat=REPEAT))
+            fts = min(timeit.repeat(lambda: db.search_products_ranked(query), number=1, repeat=REPEAT))
+            matches = len(like_search(db, query))
+            print(f"{query:<14} {like * 1000:>10.2f} {fts * 1000:>10.2f} {matches:>9,}")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
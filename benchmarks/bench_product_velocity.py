@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: product velocity counters vs GROUP BY over sales history
+
+Scenario: 300,000 receipts with 3 lines each over 30 days, 500 products
+- GROUP BY: units per product for the last 7 days from receipt_items
+- velocity: load from product_sales_hourly, record one sale, order the grid
+
+Usage: python benchmarks/bench_product_velocity.py [receipts]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager, ProductVelocity
+from database.db_manager import to_timestamp
+
+RECEIPTS = 300_000
+LINES = 3
+PRODUCTS = 500
+CHUNK = 50_000
+NOW = datetime(2024, 3, 31, 12, 0)
+REPEAT = 5
+
+
+def make_db(path, count):
+    db = DatabaseManager(path)
+    start = NOW - timedelta(days=30)
+    step = 30 * 86400 / count
+    with db.write_transaction() as cursor:
+        cursor.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+        cursor.executemany(
+            "INSERT INTO products (id, name, price, category_id) VALUES (?, ?, 10.0, 1)",
+            [(i, f"Item {i}") for i in range(1, PRODUCTS + 1)]
+        )
+        for offset in range(0, count, CHUNK):
+            batch = range(offset, min(offset + CHUNK, count))
+            cursor.executemany("""
+                INSERT INTO receipts (id, date, total, cash_received, change, items_count)
+                VALUES (?, ?, 30.0, 30.0, 0.0, ?)
+            """, [(i + 1, (start + timedelta(seconds=int(i * step))).strftime("%Y-%m-%d %H:%M:%S"), LINES)
+                  for i in batch])
+            cursor.executemany("""
+                INSERT INTO receipt_items (receipt_id, product_id, product_name, price, qty, total)
+                VALUES (?, ?, 'Item', 10.0, 1, 10.0)
+            """, [(i + 1, 1 + (i * i + line * 31) % PRODUCTS) for i in batch for line in range(LINES)])
+    return db
+
+
+def group_by_week(db):
+    """Units per product for the last 7 days from the line items"""
+    return db.conn.execute("""
+        SELECT ri.product_id, SUM(ri.qty)
+        FROM receipts r
+        JOIN receipt_items ri ON ri.receipt_id = r.id
+        WHERE r.date_ts >= ?
+        GROUP BY ri.product_id
+    """, (to_timestamp(NOW - timedelta(days=7)),)).fetchall()
+
+
+def best(fn, number=1):
+    return min(timeit.repeat(fn, number=number, repeat=REPEAT)) / number * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Building {count:,} receipts...")
+        db = make_db(os.path.join(tmp, "bench.db"), count)
+        products = [{'id': i} for i in range(1, PRODUCTS + 1)]
+        sale = [{'id': 1, 'qty': 2}, {'id': 7, 'qty': 1}, {'id': 42, 'qty': 1}]
+
+        velocity = ProductVelocity(db, now=NOW)
+        rows = [
+            ("GROUP BY last 7 days", best(lambda: group_by_week(db))),
+            ("ProductVelocity load (30d)", best(lambda: velocity.load(NOW))),
+            ("record one sale", best(lambda: velocity.record(sale, when=NOW), number=10_000)),
+            (f"order {PRODUCTS} products", best(lambda: velocity.ordered(products), number=100)),
+        ]
+
+        print(f"Product velocity ({count:,} receipts, {count * LINES:,} lines, {PRODUCTS} products)")
+        for name, ms in rows:
+            print(f"{name:<30} {ms:>10.4f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: per-line receipt inserts vs executemany and batched transactions
+
+Scenarios
+- checkout: save one 50-line cart (old per-line loop vs save_receipt)
+- replay: 10,000 queued 5-line receipts (save_receipt each vs one save_receipts)
+
+Usage: python benchmarks/bench_receipt_batches.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import DatabaseManager
+
+CART_LINES = 50
+CHECKOUTS = 200
+REPLAY = 10_000
+
+
+def make_cart(lines):
+    return [
+        {'id': i, 'name': f"Item {i}", 'price': 20.0 + i, 'qty': 1, 'total': 20.0 + i}
+        for i in range(1, lines + 1)
+    ]
+
+
+def make_db(path):
+    db = DatabaseManager(path)
+    db.conn.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+    db.conn.executemany(
+        "INSERT INTO products (id, name, price, category_id) VALUES (?, ?, ?, 1)",
+        [(item['id'], item['name'], item['price']) for item in make_cart(CART_LINES)]
+    )
+    db.conn.commit()
+    return db
+
+
+def save_receipt_per_line(db, cart, total, cash_received, change):
+    """Old save_receipt: one execute per cart line"""
+    cursor = db.conn.cursor()
+    date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    cursor.execute("""
+        INSERT INTO receipts (date, total, cash_received, change)
+        VALUES (?, ?, ?, ?)
+    """, (date_str, total, cash_received, change))
+    receipt_id = cursor.lastrowid
+    for item in cart:
+        cursor.execute("""
+            INSERT INTO receipt_items (receipt_id, product_id, product_name, price, qty, total)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (receipt_id, item['id'], item['name'], item['price'], item['qty'], item['total']))
+    db.conn.commit()
+    return receipt_id
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    cart = make_cart(CART_LINES)
+    total = sum(item['total'] for item in cart)
+    small = cart[:5]
+    small_total = sum(item['total'] for item in small)
+    queue = [
+        {'items': small, 'total': small_total, 'cash_received': 1000.0, 'change': 1000.0 - small_total}
+        for _ in range(REPLAY)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+
+        db = make_db(os.path.join(tmp, "per_line.db"))
+        t = timed(lambda: [save_receipt_per_line(db, cart, total, 5000.0, 0.0) for _ in range(CHECKOUTS)])
+        rows.append((f"{CART_LINES}-line cart / per line", t / CHECKOUTS * 1000, "ms/receipt"))
+        db.close()
+
+        db = make_db(os.path.join(tmp, "executemany.db"))
+        t = timed(lambda: [db.save_receipt(cart, total, 5000.0, 0.0) for _ in range(CHECKOUTS)])
+        rows.append((f"{CART_LINES}-line cart / executemany", t / CHECKOUTS * 1000, "ms/receipt"))
+        db.close()
+
+        db = make_db(os.path.join(tmp, "replay_each.db"))
+        t = timed(lambda: [db.save_receipt(r['items'], r['total'], r['cash_received'], r['change'])
+                           for r in queue])
+        rows.append((f"{REPLAY:,} replay / save_receipt", t * 1000, "ms total"))
+        db.close()
+
+        db = make_db(os.path.join(tmp, "replay_batch.db"))
+        t = timed(db.save_receipts, queue)
+        rows.append((f"{REPLAY:,} replay / save_receipts", t * 1000, "ms total"))
+        db.close()
+
+    print("Receipt writes (WAL, default profile)")
+    for name, value, unit in rows:
+        print(f"{name:<34} {value:>10.2f} {unit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: date range queries on TEXT dates vs integer timestamps
+
+Scenario: 5,000,000 receipts spread over ten years
+- LIKE: old style prefix filter on receipts.date ('2024-02%')
+- date_ts: sales_between / receipts_between on the covering index
+
+Usage: python benchmarks/bench_receipt_ranges.py [receipts]
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import DatabaseManager
+
+RECEIPTS = 5_000_000
+YEARS = 10
+REPEAT = 5
+CHUNK = 100_000
+
+
+def make_db(path, count):
+    db = DatabaseManager(path)
+    rng = random.Random(1)
+    start = datetime(2015, 1, 1)
+    span = YEARS * 365 * 86400
+    step = span / count
+
+    with db.write_transaction() as cursor:
+        for offset in range(0, count, CHUNK):
+            rows = []
+            for i in range(offset, min(offset + CHUNK, count)):
+                date_str = (start + timedelta(seconds=int(i * step))).strftime("%Y-%m-%d %H:%M:%S")
+                total = round(rng.uniform(40, 800), 2)
+                rows.append((date_str, total, total, 0.0))
+            cursor.executemany("""
+                INSERT INTO receipts (date, total, cash_received, change, date_ts)
+                VALUES (?1, ?2, ?3, ?4, CAST(strftime('%s', ?1) AS INTEGER))
+            """, rows)
+    return db
+
+
+def best(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT)) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Building {count:,} receipts...")
+        db = make_db(os.path.join(tmp, "bench.db"), count)
+        conn = db.conn
+
+        cases = [
+            ("day total / LIKE", lambda: conn.execute(
+                "SELECT COUNT(*), SUM(total) FROM receipts WHERE date LIKE ?", ("2020-06-15%",)).fetchone()),
+            ("day total / date_ts", lambda: db.sales_between("2020-06-15", "2020-06-16")),
+            ("month total / LIKE", lambda: conn.execute(
+                "SELECT COUNT(*), SUM(total) FROM receipts WHERE date LIKE ?", ("2020-06%",)).fetchone()),
+            ("month total / date_ts", lambda: db.sales_between("2020-06-01", "2020-07-01")),
+            ("year total / LIKE", lambda: conn.execute(
+                "SELECT COUNT(*), SUM(total) FROM receipts WHERE date LIKE ?", ("2020%",)).fetchone()),
+            ("year total / date_ts", lambda: db.sales_between("2020-01-01", "2021-01-01")),
+            ("day receipts / LIKE", lambda: conn.execute(
+                "SELECT * FROM receipts WHERE date LIKE ? ORDER BY date", ("2020-06-15%",)).fetchall()),
+            ("day receipts / date_ts", lambda: db.receipts_between("2020-06-15", "2020-06-16")),
+        ]
+
+        print(f"Date ranges ({count:,} receipts over {YEARS} years, best of {REPEAT})")
+        for name, fn in cases:
+            print(f"{name:<24} {best(fn):>10.2f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
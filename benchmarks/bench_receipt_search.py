@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: History receipt search on a large receipt table
+
+Scenario: 1,000,000 receipts over ~2 years
+- every combination of receipt id / date range / amount range filters
+- cold: first page from SQLite (idx_receipts_date_total)
+- cached: same page again from the DatabaseManager result cache
+
+Usage: python benchmarks/bench_receipt_search.py [receipts]
+"""
+import itertools
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager, ReceiptFilter
+
+RECEIPTS = 1_000_000
+REPEAT = 5
+CHUNK = 50_000
+PAGE = 25
+
+FILTERS = {
+    'receipt_id': "123456",
+    'date_from': "2021-06-01",
+    'date_to': "2021-07-01",
+    'min_total': 500,
+    'max_total': 520,
+}
+
+
+def make_db(path, count):
+    db = DatabaseManager(path)
+    start = datetime(2020, 1, 1)
+    with db.write_transaction() as cursor:
+        for offset in range(0, count, CHUNK):
+            batch = range(offset, min(offset + CHUNK, count))
+            cursor.executemany("""
+                INSERT INTO receipts (id, date, total, cash_received, change, items_count, date_ts)
+                VALUES (?1, ?2, ?3, ?3, 0.0, 1, CAST(strftime('%s', ?2) AS INTEGER))
+            """, [(i + 1, (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+                   float((i * 7919) % 1000)) for i in batch])
+    return db
+
+
+def best(fn, repeat=REPEAT):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Building {count:,} receipts...")
+        db = make_db(path, count)
+
+        def cold(filters):
+            db._receipt_cache.clear()
+            return db.search_receipts(filters, limit=PAGE)
+
+        print(f"Receipt search ({count:,} receipts, page of {PAGE}, best of {REPEAT})")
+        print(f"{'filters':<50} {'rows':>5} {'cold ms':>10} {'cached ms':>10}")
+        for n in range(len(FILTERS) + 1):
+            for fields in itertools.combinations(FILTERS, n):
+                filters = ReceiptFilter(**{field: FILTERS[field] for field in fields})
+                rows = len(cold(filters))
+                cold_ms = best(lambda: cold(filters))
+                cached_ms = best(lambda: db.search_receipts(filters, limit=PAGE))
+                name = "+".join(fields) or "(none)"
+                print(f"{name:<50} {rows:>5} {cold_ms:>10.2f} {cached_ms:>10.3f}")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: receipts written per second under each connection profile
+
+Scenario: save_receipt() of a 5-line cart, one commit per receipt
+- rollback journal: the old connect() (journal_mode=DELETE, synchronous=FULL)
+- each profile in database.connection.PROFILES
+
+Usage: python benchmarks/bench_receipt_writes.py [receipts]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import DatabaseManager
+from database.connection import PROFILES
+
+RECEIPTS = 500
+CART = [
+    {'id': i, 'name': f"Item {i}", 'price': 20.0 + i, 'qty': 2, 'total': 2 * (20.0 + i)}
+    for i in range(1, 6)
+]
+
+
+def seed_products(db):
+    db.conn.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+    db.conn.executemany(
+        "INSERT INTO products (id, name, price, category_id) VALUES (?, ?, ?, 1)",
+        [(item['id'], item['name'], item['price']) for item in CART]
+    )
+    db.conn.commit()
+
+
+def run(db, receipts):
+    seed_products(db)
+    total = sum(item['total'] for item in CART)
+    start = time.perf_counter()
+    for _ in range(receipts):
+        db.save_receipt(CART, total, 500.0, 500.0 - total)
+    return receipts / (time.perf_counter() - start)
+
+
+def main():
+    receipts = int(sys.argv[1]) if len(sys.argv) > 1 else RECEIPTS
+
+    print(f"Receipt writes ({receipts} receipts of {len(CART)} lines, one commit each)")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "rollback.db"))
+        # Undo the profile: what connect() did before
+        db.conn.close()
+        db.conn = sqlite3.connect(db.db_path)
+        db.conn.row_factory = sqlite3.Row
+        db.conn.execute("PRAGMA foreign_keys = ON")
+        rate = run(db, receipts)
+        db.close()
+        print(f"{'rollback journal':<18} {rate:>10.0f} receipts/s")
+
+        for profile in PROFILES:
+            db = DatabaseManager(os.path.join(tmp, f"{profile}.db"), profile)
+            rate = run(db, receipts)
+            db.close()
+            print(f"{profile:<18} {rate:>10.0f} receipts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: loading rows as dicts vs records
+
+Scenario: 100,000 products and 1,000,000 receipt summaries
+- dicts: sqlite3.Row copied field by field into a new dict (previous reads)
+- records: cursor.row_factory builds slotted records directly (DatabaseManager)
+- time is the best of a few plain runs, memory is the size of the loaded list
+
+Usage: python benchmarks/bench_record_loading.py [products] [receipts]
+"""
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+from database.db_manager import RECEIPT_SUMMARY_COLUMNS, to_timestamp
+
+PRODUCTS = 100_000
+RECEIPTS = 1_000_000
+REPEAT = 3
+CHUNK = 50_000
+START = datetime(2020, 1, 1)
+END = datetime(2030, 1, 1)
+
+
+def make_db(path, products, receipts):
+    db = DatabaseManager(path)
+    with db.write_transaction() as cursor:
+        cursor.executemany("INSERT INTO categories (name) VALUES (?)", [(f"Category {i}",) for i in range(40)])
+        cursor.executemany(
+            "INSERT INTO products (name, price, category_id) SELECT ?, ?, id FROM categories WHERE name = ?",
+            [(f"Product {i:06d}", float(10 + i % 500), f"Category {i % 40}") for i in range(products)]
+        )
+        for offset in range(0, receipts, CHUNK):
+            batch = range(offset, min(offset + CHUNK, receipts))
+            cursor.executemany("""
+                INSERT INTO receipts (id, date, total, cash_received, change, receipt_no, items_count, date_ts)
+                VALUES (?1, ?2, ?3, ?3, 0.0, ?4, 3, CAST(strftime('%s', ?2) AS INTEGER))
+            """, [(i + 1, (START + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+                   float((i * 7919) % 1000), f"R{i + 1:08d}") for i in batch])
+    return db
+
+
+def products_as_dicts(db):
+    cursor = db.conn.cursor()
+    cursor.execute("""
+        SELECT p.id, p.name, p.price, c.name AS category
+        FROM products p JOIN categories c ON c.id = p.category_id
+        ORDER BY c.name, p.name
+    """)
+    products = []
+    for row in cursor.fetchall():
+        products.append({
+            'id': row['id'],
+            'name': row['name'],
+            'price': row['price'],
+            'category': row['category']
+        })
+    return products
+
+
+def receipts_as_dicts(db):
+    with db.reader() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {RECEIPT_SUMMARY_COLUMNS}
+            FROM receipts
+            WHERE date_ts >= ? AND date_ts < ?
+            ORDER BY date_ts, id
+        """, (to_timestamp(START - timedelta(days=1)), to_timestamp(END)))
+        return [{
+            'id': row['id'],
+            'date': row['date'],
+            'date_ts': row['date_ts'],
+            'total': row['total'],
+            'cash_received': row['cash_received'],
+            'change': row['change'],
+            'receipt_no': row['receipt_no'],
+            'payment_method': row['payment_method'],
+            'items_count': row['items_count']
+        } for row in cursor.fetchall()]
+
+
+def measure(load):
+    seconds = min(timeit.repeat(load, number=1, repeat=REPEAT))
+    tracemalloc.start()
+    rows = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(rows), seconds * 1000, size / 2 ** 20
+
+
+def main():
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else PRODUCTS
+    receipts = int(sys.argv[2]) if len(sys.argv) > 2 else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Building {products:,} products and {receipts:,} receipts...")
+        db = make_db(os.path.join(tmp, "bench.db"), products, receipts)
+
+        cases = [
+            ("products / dicts", lambda: products_as_dicts(db)),
+            ("products / records", db.get_all_products),
+            ("receipts / dicts", lambda: receipts_as_dicts(db)),
+            ("receipts / records", lambda: db.receipts_between(START - timedelta(days=1), END)),
+        ]
+
+        print(f"Row loading (best of {REPEAT})")
+        print(f"{'case':<22} {'rows':>10} {'ms':>10} {'MiB':>10}")
+        for name, load in cases:
+            rows, ms, mib = measure(load)
+            print(f"{name:<22} {rows:>10,} {ms:>10.1f} {mib:>10.1f}")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
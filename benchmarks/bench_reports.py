@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: yearly sales report over a large receipt table
+
+Scenario: 700,000 receipts in one year with 3 lines each (2.1M line items),
+200 products in 20 categories
+- cold: every day aggregated from receipts/receipt_items
+- warm: closed days from the cache, only today recomputed
+
+Usage: python benchmarks/bench_reports.py [receipts]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager, ReportEngine
+
+RECEIPTS = 700_000
+LINES = 3
+PRODUCTS = 200
+CHUNK = 50_000
+TODAY = "2024-12-31"
+METHODS = ("Cash", "QR", "Card")
+
+
+def make_db(path, count):
+    db = DatabaseManager(path)
+    start = datetime(2024, 1, 1)
+    step = 366 * 86400 / count
+    with db.write_transaction() as cursor:
+        cursor.executemany("INSERT INTO categories (name) VALUES (?)", [(f"Category {i}",) for i in range(20)])
+        cursor.executemany(
+            "INSERT INTO products (id, name, price, category_id) SELECT ?, ?, ?, id FROM categories WHERE name = ?",
+            [(i, f"Item {i}", float(10 + i % 90), f"Category {i % 20}") for i in range(1, PRODUCTS + 1)]
+        )
+        for offset in range(0, count, CHUNK):
+            batch = range(offset, min(offset + CHUNK, count))
+            cursor.executemany("""
+                INSERT INTO receipts (id, date, total, cash_received, change, payment_method, items_count)
+                VALUES (?, ?, 150.0, 150.0, 0.0, ?, ?)
+            """, [(i + 1, (start + timedelta(seconds=int(i * step))).strftime("%Y-%m-%d %H:%M:%S"),
+                   METHODS[i % 3], LINES) for i in batch])
+            cursor.executemany("""
+                INSERT INTO receipt_items (receipt_id, product_id, product_name, price, qty, total)
+                VALUES (?, ?, ?, 50.0, 1, 50.0)
+            """, [(i + 1, pid, f"Item {pid}") for i in batch
+                  for pid in (1 + (i * 7 + line * 13) % PRODUCTS for line in range(LINES))])
+    return db
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Building {count:,} receipts...")
+        db = make_db(path, count)
+        engine = ReportEngine(db)
+
+        report, cold_ms = timed(lambda: engine.generate('yearly', today=TODAY))
+        _, warm_ms = timed(lambda: engine.generate('yearly', today=TODAY))
+        _, month_ms = timed(lambda: engine.generate('monthly', today=TODAY))
+
+        print(f"Yearly report ({report['receipts']:,} receipts, {count * LINES:,} line items)")
+        print(f"{'yearly, cold':<28} {cold_ms:>10.2f} ms")
+        print(f"{'yearly, closed days cached':<28} {warm_ms:>10.2f} ms")
+        print(f"{'monthly, cached':<28} {month_ms:>10.2f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
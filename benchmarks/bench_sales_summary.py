@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: sales summary from full receipt scans vs the daily_sales rollup
+
+Scenario: five years of receipts (300 a day, ~550k rows)
+- scan: the old get_sales_summary (SUM over receipts + date LIKE today)
+- rollup: get_sales_summary reading daily_sales
+
+Usage: python benchmarks/bench_sales_summary.py
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import DatabaseManager
+
+DAYS = 5 * 365
+PER_DAY = 300
+REPEAT = 10
+
+
+def make_db(path):
+    db = DatabaseManager(path)
+    rng = random.Random(1)
+    start = datetime.now() - timedelta(days=DAYS - 1)
+    with db.write_transaction() as cursor:
+        for d in range(DAYS):
+            day = (start + timedelta(days=d)).strftime("%Y-%m-%d")
+            cursor.executemany(
+                "INSERT INTO receipts (date, total, cash_received, change, payment_method) VALUES (?, ?, ?, 0, ?)",
+                [(f"{day} {10 + i % 12:02d}:00:00", t, t, rng.choice(("Cash", "Card", "QR")))
+                 for i, t in ((i, round(rng.uniform(40, 800), 2)) for i in range(PER_DAY))]
+            )
+    return db
+
+
+def scan_summary(db):
+    """Old get_sales_summary"""
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT COUNT(*), SUM(total) FROM receipts")
+    count, total = cursor.fetchone()
+    cursor.execute("SELECT COUNT(*), SUM(total) FROM receipts WHERE date LIKE ?",
+                   (datetime.now().strftime("%Y-%m-%d") + "%",))
+    today_count, today_total = cursor.fetchone()
+    return count, total, today_count, today_total
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(os.path.join(tmp, "bench.db"))
+        rows = db.conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0]
+
+        scan = min(timeit.repeat(lambda: scan_summary(db), number=1, repeat=REPEAT))
+        rollup = min(timeit.repeat(db.get_sales_summary, number=1, repeat=REPEAT))
+
+        summary = db.get_sales_summary()
+        count, total, _, _ = scan_summary(db)
+        assert summary['total_receipts'] == count and abs(summary['total_sales'] - total) < 0.01
+
+        print(f"Sales summary ({rows:,} receipts over {DAYS} days, best of {REPEAT})")
+        print(f"{'scan receipts':<16} {scan * 1000:>10.2f} ms")
+        print(f"{'daily_sales':<16} {rollup * 1000:>10.2f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: app startup to the first interactive frame
+
+Scenario: 5,000 products in 40 categories
+- imports: `python -X importtime`, cumulative ms per top-level package and
+  which view modules were imported before the first navigation
+- shell: ChiliPOSApp() returns with sidebar, header and splash painted
+- interactive: catalog loaded and POS view shown (app.ready)
+- loaded: background loading finished (sales counters included)
+Each run is a fresh interpreter; the best of a few runs is reported.
+
+Usage: python benchmarks/bench_startup.py [products]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+START = time.perf_counter()
+
+PRODUCTS = 5_000
+CATEGORIES = 40
+REPEAT = 5
+TARGET_MS = 500
+
+PACKAGES = ["flet", "database", "src.views_flet", "pos_flet_app"]
+
+
+def child(path):
+    """Start the app on path and print phase timings as JSON"""
+    from flet_harness import make_page
+
+    import pos_flet_app
+    from database import DatabaseManager
+
+    imported = time.perf_counter()
+    os.chdir(os.path.dirname(path))
+    pos_flet_app.DatabaseManager = lambda: DatabaseManager(path)
+    page, conn = make_page()
+
+    t0 = time.perf_counter()
+    app = pos_flet_app.ChiliPOSApp(page)
+    shell = time.perf_counter()
+    app.ready.wait()
+    interactive = time.perf_counter()
+    app.loader.join()
+    loaded = time.perf_counter()
+
+    print(json.dumps({
+        'imports': (imported - START) * 1000,
+        'shell': (shell - t0) * 1000,
+        'interactive': (interactive - t0) * 1000,
+        'loaded': (loaded - t0) * 1000,
+        'process': (interactive - START) * 1000,
+        'views': sorted(m for m in sys.modules if m.startswith("src.views_flet.")),
+    }))
+    app.receipt_writer.stop()
+    app.db.close()
+
+
+def make_db(path, products):
+    from flet_harness import make_products
+    from database import DatabaseManager
+
+    db = DatabaseManager(path)
+    rows = [(p['id'], p['name'], p['price'], p['category']) for p in make_products(products, CATEGORIES)]
+    with db.write_transaction() as cursor:
+        cursor.executemany("INSERT OR IGNORE INTO categories (name) VALUES (?)", [(row[3],) for row in rows])
+        cursor.executemany(
+            "INSERT INTO products (id, name, price, category_id) SELECT ?, ?, ?, id FROM categories WHERE name = ?",
+            rows
+        )
+    db.close()
+
+
+def run(path):
+    """One startup in a fresh interpreter: (timings, cumulative import ms per package)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", path],
+        capture_output=True, text=True, check=True
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imports.setdefault(name.strip(), int(cumulative) / 1000)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, imports
+
+
+def main():
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else PRODUCTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Building {products:,} products...")
+        make_db(path, products)
+
+        runs = [run(path) for _ in range(REPEAT)]
+        timings = {key: min(t[key] for t, _ in runs) for key in ('imports', 'shell', 'interactive', 'loaded', 'process')}
+        imports = {name: min(i.get(name, 0.0) for _, i in runs) for name in PACKAGES}
+
+        print(f"Startup ({products:,} products, best of {REPEAT} fresh processes)")
+        print("import (cumulative, -X importtime)")
+        for name in PACKAGES:
+            print(f"  {name:<26} {imports[name]:>10.1f} ms")
+        print(f"  views imported for POS     {', '.join(runs[0][0]['views']) or '(none)'}")
+        print("from ChiliPOSApp()")
+        print(f"  shell + splash painted     {timings['shell']:>10.1f} ms")
+        print(f"  POS interactive            {timings['interactive']:>10.1f} ms  (target {TARGET_MS} ms)")
+        print(f"  background load done       {timings['loaded']:>10.1f} ms")
+        print(f"process start to POS         {timings['process']:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
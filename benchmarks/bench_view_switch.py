@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: navigation latency between views
+
+Scenario: 5,000 products in 40 categories, 1,000,000 receipts
+- rebuild: view.create() on every visit (previous switch_view)
+- cached: switch_view to a visited view with no data changes (container swap)
+- changed: switch_view after a product edit / a sale (view.refresh(changes))
+Each switch starts from the POS view and includes sending the page update
+(History's summary and receipts load afterwards on a worker thread).
+
+Usage: python benchmarks/bench_view_switch.py [products] [receipts]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+from flet_harness import make_page, make_products
+
+import pos_flet_app
+from database import DatabaseManager
+
+PRODUCTS = 5_000
+RECEIPTS = 1_000_000
+CATEGORIES = 40
+REPEAT = 5
+CHUNK = 50_000
+
+VIEWS = ["history", "menu", "category", "tables", "users", "settings"]
+
+
+def make_db(path, products, receipts):
+    db = DatabaseManager(path)
+    rows = [(p['id'], p['name'], p['price'], p['category']) for p in make_products(products, CATEGORIES)]
+    with db.write_transaction() as cursor:
+        cursor.executemany("INSERT OR IGNORE INTO categories (name) VALUES (?)", [(row[3],) for row in rows])
+        cursor.executemany(
+            "INSERT INTO products (id, name, price, category_id) SELECT ?, ?, ?, id FROM categories WHERE name = ?",
+            rows
+        )
+        start = datetime(2020, 1, 1)
+        for offset in range(0, receipts, CHUNK):
+            batch = range(offset, min(offset + CHUNK, receipts))
+            cursor.executemany("""
+                INSERT INTO receipts (id, date, total, cash_received, change, items_count, date_ts)
+                VALUES (?1, ?2, 150.0, 150.0, 0.0, 3, CAST(strftime('%s', ?2) AS INTEGER))
+            """, [(i + 1, (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S")) for i in batch])
+    db.close()
+
+
+def main():
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else PRODUCTS
+    receipts = int(sys.argv[2]) if len(sys.argv) > 2 else RECEIPTS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Building {products:,} products and {receipts:,} receipts...")
+        make_db(path, products, receipts)
+
+        # Views keep their data files (tables, category emojis) under ./data
+        os.chdir(tmp)
+        pos_flet_app.DatabaseManager = lambda: DatabaseManager(path)
+        page, conn = make_page()
+        app = pos_flet_app.ChiliPOSApp(page)
+        app.loader.join()
+        for view_id in VIEWS:
+            app.switch_view(view_id)
+
+        def timed(view_id, before=None, rebuild=False):
+            """Best time and bytes sent switching from POS to view_id"""
+            times = []
+            for _ in range(REPEAT):
+                app.switch_view("pos")
+                if before is not None:
+                    before()
+                conn.reset()
+                if rebuild:
+                    seconds = timeit.timeit(lambda: rebuild_switch(view_id), number=1)
+                else:
+                    seconds = timeit.timeit(lambda: app.switch_view(view_id), number=1)
+                times.append(seconds)
+                if view_id == "history":
+                    # Summary and receipts load after the switch, off the UI thread
+                    app.view_instances[view_id].load_thread.join()
+            return min(times) * 1000, conn.bytes_sent
+
+        def rebuild_switch(view_id):
+            app.current_view = view_id
+            app.view_trees[view_id] = app.view_instances[view_id].create()
+            app.views_container.content = app.view_trees[view_id]
+            page.update()
+
+        product = app.products[0]
+
+        def edit_product():
+            app.catalog.update_product(product['id'], product['name'], product['price'] + 1, product['category'])
+
+        def sell():
+            app.receipt_writer.submit(items=[{**product, 'qty': 1, 'total': product['price']}],
+                                      total=product['price'], cash_received=product['price'], change=0.0)
+            app.notify_change('receipts')
+
+        print(f"View switch from POS ({products:,} products, {receipts:,} receipts, best of {REPEAT})")
+        print(f"{'view':<10} {'rebuild ms':>11} {'cached ms':>10} {'changed ms':>11} {'rebuild KB':>11} {'cached KB':>10}")
+        for view_id in VIEWS:
+            rebuild_ms, rebuild_bytes = timed(view_id, rebuild=True)
+            cached_ms, cached_bytes = timed(view_id)
+            changed_ms, _ = timed(view_id, before=sell if view_id == "history" else edit_product)
+            print(f"{view_id:<10} {rebuild_ms:>11.2f} {cached_ms:>10.2f} {changed_ms:>11.2f} "
+                  f"{rebuild_bytes / 1024:>11.1f} {cached_bytes / 1024:>10.1f}")
+
+        app.receipt_writer.stop()
+        app.db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Flet benchmark harness
+Runs views against a real ft.Page backed by an in-process connection
+that records every patch the page would send to the Flet client
+"""
+import asyncio
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import CommandEncoder, PageCommandsBatchResponsePayload
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import Cart, ProductCatalog, ProductSearchIndex, ProductVelocity, ReportEngine
+
+
+class RecordingConnection(Connection):
+    """Connection that assigns control ids and counts outgoing patches"""
+
+    def __init__(self):
+        super().__init__()
+        self._ids = itertools.count(1)
+        self.reset()
+
+    def reset(self):
+        """Reset patch counters"""
+        self.batches = 0
+        self.commands = 0
+        self.controls_sent = 0
+        self.bytes_sent = 0
+
+    def send_command(self, session_id, command):
+        return self.send_commands(session_id, [command])
+
+    def send_commands(self, session_id, commands):
+        results = []
+        self.batches += 1
+        for command in commands:
+            self.commands += 1
+            self.bytes_sent += len(json.dumps(command, cls=CommandEncoder, separators=(",", ":")))
+            if command.name == "add":
+                self.controls_sent += len(command.commands)
+                results.append(" ".join(f"_{next(self._ids)}" for _ in command.commands))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+
+def make_page():
+    """Create a page connected to a recording connection"""
+    conn = RecordingConnection()
+    page = ft.Page(conn, "bench", asyncio.new_event_loop())
+    return page, conn
+
+
+def make_products(count, categories=10, seed=1):
+    """Generate a synthetic product catalog"""
+    rng = random.Random(seed)
+    words = ['Coffee', 'Tea', 'Latte', 'Juice', 'Sandwich', 'Salad', 'Burger',
+             'Pizza', 'Pasta', 'Rice', 'Wings', 'Cake', 'Brownie', 'Noodle', 'Soup']
+    return [
+        {
+            'id': i,
+            'name': f"{rng.choice(words)} {rng.choice(words)} #{i}",
+            'price': round(rng.uniform(20, 400), 2),
+            'category': f"Category {i % categories}"
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+class BenchApp:
+    """Minimal stand-in for ChiliPOSApp state used by the views"""
+
+    def __init__(self, page, products, db=None):
+        self.page = page
+        self.db = db
+        self.catalog = ProductCatalog(db)
+        self.reports = ReportEngine(db)
+        self.velocity = ProductVelocity(db)
+        self.catalog.load(products)
+        self.cart = Cart()
+        self.products = self.catalog.all()
+        self.categories = self.catalog.categories()
+        self.search_index = ProductSearchIndex(self.catalog)
+        self.active_category = "All"
+        self.payment_method = "Cash"
+        self.total = 0.0
+        self.subtotal = 0.0
+        self.tax = 0.0
+
+    def notify_change(self, *changes):
+        """Views are not cached here; nothing to queue"""
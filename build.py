@@ -56,6 +56,7 @@ def build_exe(mode='onefile'):
         '--name=POS-System',
         '--windowed',  # No console window
         '--add-data=data;data',  # Include data folder
+        '--add-data=database/schema.sql;database',  # Read by the schema migrations
         '--hidden-import=ttkbootstrap',
         '--hidden-import=PIL',
         '--hidden-import=PIL._tkinter_finder',
@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures
+"""
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def make_db(tmp_path):
+    """Open a migrated database in tmp_path and add products through DatabaseManager
+
+    products are (name, price, category) tuples; ids follow their order from 1
+    and missing categories are created. Databases are closed after the test.
+    """
+    opened = []
+
+    def make(products=(), name="pos.db"):
+        db = DatabaseManager(str(tmp_path / name))
+        opened.append(db)
+        for product_name, price, category in products:
+            db.add_product(product_name, price, category)
+        return db
+
+    yield make
+    for db in opened:
+        db.close()
@@ -1,6 +1,16 @@
 """
 POS System Database Package
 """
-from .db_manager import DatabaseManager
+from .db_manager import DatabaseManager, ReceiptFilter
+from .cart import Cart
+from .catalog import ProductCatalog, CatalogChange
+from .records import CategoryRecord, ProductRecord, ReceiptItemRecord, ReceiptRecord, ReceiptSummary
+from .snapshot import load_snapshot, save_snapshot, snapshot_path
+from .search import ProductSearchIndex
+from .receipt_queue import ReceiptWriter
+from .reports import ReportEngine
+from .velocity import ProductVelocity
 
-__all__ = ['DatabaseManager']
+__all__ = ['DatabaseManager', 'ReceiptFilter', 'Cart', 'ProductCatalog', 'CatalogChange', 'CategoryRecord',
+           'ProductRecord', 'ReceiptSummary', 'ReceiptRecord', 'ReceiptItemRecord', 'ProductSearchIndex',
+           'ReceiptWriter', 'ReportEngine', 'ProductVelocity', 'load_snapshot', 'save_snapshot', 'snapshot_path']
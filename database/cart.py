@@ -0,0 +1,127 @@
+"""
+Shopping Cart Model for POS System
+Cart lines keyed by product id with running totals
+"""
+from typing import Dict, Iterator, List, Optional
+
+
+class Cart:
+    """Shopping cart keyed by product id (insertion ordered)"""
+
+    TAX_RATE = 0.07
+
+    def __init__(self):
+        """Initialize empty cart"""
+        self._lines: Dict[int, Dict] = {}
+        self._subtotal = 0.0
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate cart lines in the order they were added"""
+        return iter(self._lines.values())
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __bool__(self) -> bool:
+        return bool(self._lines)
+
+    def __contains__(self, product_id) -> bool:
+        return product_id in self._lines
+
+    # ============================================================
+    # LOOKUP
+    # ============================================================
+
+    def get(self, product_id: int) -> Optional[Dict]:
+        """Get cart line for product"""
+        return self._lines.get(product_id)
+
+    def qty(self, product_id: int) -> int:
+        """Get quantity of product in cart"""
+        line = self._lines.get(product_id)
+        return line['qty'] if line else 0
+
+    def product_ids(self) -> List[int]:
+        """Get product ids in cart order"""
+        return list(self._lines)
+
+    def to_list(self) -> List[Dict]:
+        """Get a copy of cart lines as a list of dicts"""
+        return [dict(line) for line in self._lines.values()]
+
+    # ============================================================
+    # TOTALS
+    # ============================================================
+
+    @property
+    def subtotal(self) -> float:
+        return self._subtotal
+
+    @property
+    def tax(self) -> float:
+        return self._subtotal * self.TAX_RATE
+
+    @property
+    def total(self) -> float:
+        return self._subtotal + self.tax
+
+    # ============================================================
+    # CHANGES
+    # ============================================================
+
+    def add(self, product: Dict, qty: int = 1) -> Dict:
+        """Add product to cart (increase quantity if already in cart)"""
+        line = self._lines.get(product['id'])
+        if line is not None:
+            return self.set_qty(product['id'], line['qty'] + qty)
+
+        line = {
+            'id': product['id'],
+            'name': product['name'],
+            'price': product['price'],
+            'category': product.get('category', ''),
+            'qty': qty,
+            'total': product['price'] * qty
+        }
+        self._lines[product['id']] = line
+        self._subtotal += line['total']
+        return line
+
+    def set_qty(self, product_id: int, qty: int) -> Optional[Dict]:
+        """Set quantity of a cart line (removes the line when qty <= 0)"""
+        line = self._lines.get(product_id)
+        if line is None:
+            return None
+
+        if qty <= 0:
+            self.remove(product_id)
+            return None
+
+        new_total = line['price'] * qty
+        self._subtotal += new_total - line['total']
+        line['qty'] = qty
+        line['total'] = new_total
+        return line
+
+    def increase(self, product_id: int) -> Optional[Dict]:
+        """Increase quantity by one"""
+        return self.set_qty(product_id, self.qty(product_id) + 1)
+
+    def decrease(self, product_id: int) -> Optional[Dict]:
+        """Decrease quantity by one (removes the line at zero)"""
+        return self.set_qty(product_id, self.qty(product_id) - 1)
+
+    def remove(self, product_id: int) -> Optional[Dict]:
+        """Remove product from cart"""
+        line = self._lines.pop(product_id, None)
+        if line is not None:
+            self._subtotal -= line['total']
+            if not self._lines:
+                # Drop accumulated float error once the cart is empty
+                self._subtotal = 0.0
+        return line
+
+    def clear(self):
+        """Remove all lines"""
+        self._lines.clear()
+        self._subtotal = 0.0
@@ -0,0 +1,280 @@
+"""
+Product Catalog for POS System
+In-memory products with secondary indexes and change notifications
+"""
+from bisect import bisect_left, insort
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .emoji_lookup import DEFAULT_CATEGORY_EMOJI
+from .records import CategoryRecord, ProductRecord
+from .snapshot import load_snapshot, save_snapshot
+
+
+# kind: 'added' | 'updated' | 'removed' | 'reloaded'
+# product: new record ('removed': the deleted record), previous: record before update
+CatalogChange = namedtuple('CatalogChange', ['kind', 'product', 'previous'])
+
+
+class ProductCatalog:
+    """Categories and products indexed by id, category and name prefix, kept in sync with the database"""
+
+    def __init__(self, db=None, snapshot_path: Optional[str] = None):
+        """Initialize empty catalog (call load() to fill it)
+
+        With snapshot_path, load() reads products from that snapshot file while
+        it matches the database catalog version, and changes rewrite it.
+        """
+        self.db = db
+        self.snapshot_path = snapshot_path
+        self._categories: Dict[str, CategoryRecord] = {}
+        self._by_id: Dict[int, ProductRecord] = {}
+        self._by_category: Dict[str, List[ProductRecord]] = {}
+        self._name_index: List[tuple] = []  # sorted (word, id) for prefix search
+        self._ordered: Optional[List[ProductRecord]] = None
+        self._listeners: List[Callable[[CatalogChange], None]] = []
+
+    # ============================================================
+    # LOADING
+    # ============================================================
+
+    def load(self, products: Optional[Iterable[Dict]] = None, categories: Optional[Iterable[CategoryRecord]] = None):
+        """Load categories and products (from the snapshot or the database when no products are given)"""
+        if products is None:
+            categories, products = self._read_catalog()
+
+        self._categories.clear()
+        if categories is not None:
+            self._categories.update((category.name, category) for category in categories)
+        self._by_id.clear()
+        self._by_category.clear()
+        self._name_index.clear()
+        self._ordered = None
+
+        for product in products:
+            record = product if isinstance(product, ProductRecord) else ProductRecord.from_dict(product)
+            self._by_id[record.id] = record
+            self._by_category.setdefault(record.category, []).append(record)
+            self._name_index.extend((word, record.id) for word in self._name_words(record.name))
+            if record.category not in self._categories:
+                self._categories[record.category] = CategoryRecord(None, record.category)
+
+        for records in self._by_category.values():
+            records.sort(key=self._name_key)
+        self._name_index.sort()
+
+    def reload(self):
+        """Reload everything from the database and notify listeners"""
+        self.load()
+        self._notify(CatalogChange('reloaded', None, None))
+
+    def _read_catalog(self) -> Tuple[List[CategoryRecord], List[ProductRecord]]:
+        """Categories and products from a current snapshot, else from the database (refreshing the snapshot)"""
+        if self.snapshot_path is None:
+            return self.db.get_categories(), self.db.get_all_products()
+
+        # Version first: a change made while reading only makes the snapshot stale
+        version = self.db.get_catalog_version()
+        catalog = load_snapshot(self.snapshot_path, version)
+        if catalog is None:
+            catalog = self.db.get_categories(), self.db.get_all_products()
+            self._write_snapshot(version, *catalog)
+        return catalog
+
+    def _write_snapshot(self, version: Optional[int] = None, categories: Optional[List[CategoryRecord]] = None,
+                        products: Optional[List[ProductRecord]] = None):
+        """Rewrite the snapshot (a failed write only costs a database read next time)"""
+        if self.snapshot_path is None:
+            return
+        try:
+            if version is None:
+                version = self.db.get_catalog_version()
+            save_snapshot(self.snapshot_path, version,
+                          self.category_records() if categories is None else categories,
+                          self.all() if products is None else products)
+        except (OSError, ValueError) as e:
+            print(f"Error saving catalog snapshot: {e}")
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, product_id) -> bool:
+        return product_id in self._by_id
+
+    def get(self, product_id: int) -> Optional[ProductRecord]:
+        """Get product by id"""
+        return self._by_id.get(product_id)
+
+    def all(self) -> List[ProductRecord]:
+        """All products ordered by category, name"""
+        if self._ordered is None:
+            self._ordered = [
+                record
+                for category in sorted(self._by_category)
+                for record in self._by_category[category]
+            ]
+        return self._ordered
+
+    def by_category(self, category: str) -> List[ProductRecord]:
+        """Products of a category ordered by name"""
+        return self._by_category.get(category, [])
+
+    def categories(self) -> List[str]:
+        """Category names in order (including categories without products)"""
+        return sorted(self._categories)
+
+    def category_records(self) -> List[CategoryRecord]:
+        """Categories in name order"""
+        return [self._categories[name] for name in sorted(self._categories)]
+
+    def category(self, name: str) -> Optional[CategoryRecord]:
+        """Category by name"""
+        return self._categories.get(name)
+
+    def category_emoji(self, name: str) -> str:
+        """Emoji shown for a category"""
+        category = self._categories.get(name)
+        return (category.emoji if category is not None else None) or DEFAULT_CATEGORY_EMOJI
+
+    def search_prefix(self, prefix: str) -> List[ProductRecord]:
+        """Products with a name word starting with prefix"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+
+        ids = []
+        seen = set()
+        i = bisect_left(self._name_index, (prefix,))
+        while i < len(self._name_index) and self._name_index[i][0].startswith(prefix):
+            product_id = self._name_index[i][1]
+            if product_id not in seen:
+                seen.add(product_id)
+                ids.append(product_id)
+            i += 1
+
+        return sorted((self._by_id[pid] for pid in ids), key=self._name_key)
+
+    # ============================================================
+    # CHANGES (written through to the database)
+    # ============================================================
+
+    def add_product(self, name: str, price: float, category: str) -> ProductRecord:
+        """Add product"""
+        product_id = self.db.add_product(name, price, category)
+        record = ProductRecord(product_id, name, price, category)
+        self._insert(record)
+        self._add_category(category)
+        self._write_snapshot()
+        self._notify(CatalogChange('added', record, None))
+        return record
+
+    def update_product(self, product_id: int, name: str, price: float, category: str) -> bool:
+        """Update product"""
+        if not self.db.update_product(product_id, name, price, category):
+            return False
+
+        previous = self._by_id.get(product_id)
+        if previous is not None:
+            self._remove(previous)
+        record = ProductRecord(product_id, name, price, category)
+        self._insert(record)
+        self._add_category(category)
+        self._write_snapshot()
+        self._notify(CatalogChange('updated', record, previous))
+        return True
+
+    def delete_product(self, product_id: int) -> bool:
+        """Delete product"""
+        if not self.db.delete_product(product_id):
+            return False
+
+        record = self._by_id.get(product_id)
+        if record is not None:
+            self._remove(record)
+            self._write_snapshot()
+            self._notify(CatalogChange('removed', record, None))
+        return True
+
+    def add_category(self, category_name: str, emoji: Optional[str] = None) -> bool:
+        """Add category"""
+        added = self.db.add_category(category_name, emoji)
+        if added:
+            self.reload()
+        return added
+
+    def update_category(self, old_category: str, new_category: str, emoji: Optional[str] = None) -> bool:
+        """Rename category, and set its emoji unless emoji is None ("" clears it)"""
+        updated = self.db.update_category(old_category, new_category)
+        if updated and emoji is not None:
+            self.db.set_category_emoji(new_category, emoji)
+        self.reload()
+        return updated
+
+    def delete_category(self, category_name: str, move_to_category: str = "อื่นๆ") -> bool:
+        """Delete category (products move to move_to_category)"""
+        deleted = self.db.delete_category(category_name, move_to_category)
+        self.reload()
+        return deleted
+
+    # ============================================================
+    # NOTIFICATIONS
+    # ============================================================
+
+    def subscribe(self, listener: Callable[[CatalogChange], None]):
+        """Call listener(change) after every catalog change"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[CatalogChange], None]):
+        """Stop notifying listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, change: CatalogChange):
+        for listener in list(self._listeners):
+            listener(change)
+
+    # ============================================================
+    # INDEX MAINTENANCE
+    # ============================================================
+
+    @staticmethod
+    def _name_key(record: ProductRecord):
+        return record.name
+
+    @staticmethod
+    def _name_words(name: str) -> List[str]:
+        """Lowercased name plus each word, so prefixes match any word"""
+        lowered = name.lower()
+        return [lowered] + lowered.split()[1:]
+
+    def _add_category(self, name: str):
+        """Pick up a category the database created for a product"""
+        if name not in self._categories:
+            self._categories = {category.name: category for category in self.db.get_categories()}
+
+    def _insert(self, record: ProductRecord):
+        self._by_id[record.id] = record
+        records = self._by_category.setdefault(record.category, [])
+        keys = [r.name for r in records]
+        records.insert(bisect_left(keys, record.name), record)
+        for word in self._name_words(record.name):
+            insort(self._name_index, (word, record.id))
+        self._ordered = None
+
+    def _remove(self, record: ProductRecord):
+        del self._by_id[record.id]
+        records = self._by_category.get(record.category, [])
+        if record in records:
+            records.remove(record)
+        if not records:
+            self._by_category.pop(record.category, None)
+        for word in self._name_words(record.name):
+            i = bisect_left(self._name_index, (word, record.id))
+            if i < len(self._name_index) and self._name_index[i] == (word, record.id):
+                del self._name_index[i]
+        self._ordered = None
@@ -0,0 +1,87 @@
+"""
+SQLite Connection Factory for POS System
+Opens connections with the pragmas of a deployment profile
+"""
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Deployment profile used when none is given
+PROFILE_ENV_VAR = "POS_DB_PROFILE"
+DEFAULT_PROFILE = "default"
+
+PROFILES: Dict[str, Dict] = {
+    # Single till on a local disk: WAL, fsync only at checkpoints
+    'default': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,           # KiB (16 MB)
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,           # ms
+    },
+    # Every committed receipt survives a power cut
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # Small devices
+    'low_memory': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+    # Database on a network share (WAL needs shared memory on one host)
+    'network_share': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -8000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 15000,
+    },
+}
+
+
+def get_profile(name: Optional[str] = None) -> Dict:
+    """Get pragmas of a profile (POS_DB_PROFILE or 'default' when no name is given)"""
+    if name is None:
+        name = os.environ.get(PROFILE_ENV_VAR, DEFAULT_PROFILE)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile: {name} (choose from {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def open_connection(db_path: str, profile: Optional[str] = None, readonly: bool = False,
+                    **kwargs) -> sqlite3.Connection:
+    """Open a connection with rows by name, foreign keys on and the profile's pragmas
+
+    readonly opens the file with a mode=ro URI (writes fail, the journal
+    mode is left to the writer).
+    """
+    pragmas = get_profile(profile)
+
+    if readonly:
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, timeout=pragmas['busy_timeout'] / 1000, uri=True, **kwargs)
+    else:
+        conn = sqlite3.connect(db_path, timeout=pragmas['busy_timeout'] / 1000, **kwargs)
+    conn.row_factory = sqlite3.Row  # Access columns by name
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA busy_timeout = {int(pragmas['busy_timeout'])}")
+    if db_path != ":memory:" and not readonly:
+        conn.execute(f"PRAGMA journal_mode = {pragmas['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {pragmas['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {int(pragmas['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(pragmas['mmap_size'])}")
+    conn.execute(f"PRAGMA temp_store = {pragmas['temp_store']}")
+    return conn
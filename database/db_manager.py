@@ -4,33 +4,115 @@ SQLite operations wrapper
 """
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import calendar
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import List, Dict, Iterable, Optional, Tuple, Union
+
+from .migrations import migrate
+from .pool import ConnectionPool
+from .emoji_lookup import CATEGORY_EMOJIS
+from .records import CategoryRecord, ProductRecord, ReceiptItemRecord, ReceiptRecord, ReceiptSummary
+
+
+INSERT_RECEIPT_SQL = """
+    INSERT INTO receipts (date, total, cash_received, change, receipt_no, payment_method, items_count, date_ts)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, CAST(strftime('%s', ?1) AS INTEGER))
+"""
+
+INSERT_RECEIPT_ITEM_SQL = """
+    INSERT INTO receipt_items (receipt_id, product_id, product_name, price, qty, total)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Products with their category name (the key views and the catalog use)
+PRODUCT_COLUMNS = "p.id, p.name, p.price, c.name"
+PRODUCT_TABLES = "products p JOIN categories c ON c.id = p.category_id"
+
+DateLike = Union[datetime, date, str]
+
+
+def to_timestamp(value: DateLike) -> int:
+    """Convert a datetime, date or 'YYYY-MM-DD[ HH:MM:SS]' string to receipts.date_ts"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return calendar.timegm(value.timetuple())
+
+
+# Same order as ReceiptSummary.__slots__ (rows are built positionally)
+RECEIPT_SUMMARY_COLUMNS = """
+    id, date, date_ts, total, cash_received, change, receipt_no, payment_method, items_count
+"""
+
+# History search filters (None = not filtered); date_to is exclusive, totals inclusive
+ReceiptFilter = namedtuple(
+    'ReceiptFilter',
+    ['receipt_id', 'date_from', 'date_to', 'min_total', 'max_total'],
+    defaults=(None, None, None, None, None)
+)
+
+# Receipt search pages kept until the receipts change
+RECEIPT_CACHE_SIZE = 64
+
+# Shortest query the trigram index can answer (shorter ones fall back to LIKE)
+FTS_MIN_QUERY_LENGTH = 3
 
 
 class DatabaseManager:
     """Database Manager Class"""
 
-    def __init__(self, db_path: str = None):
-        """Initialize database connection"""
+    def __init__(self, db_path: str = None, profile: str = None):
+        """Initialize database connection (profile: see database.connection.PROFILES)"""
         if db_path is None:
             db_path = os.path.join("database", "pos.db")
 
         self.db_path = db_path
+        self.profile = profile
         self.conn = None
+        self.pool = None
+        self.schema_version = 0
+        self.fts_enabled = False
+        self._receipt_cache = OrderedDict()
+        self._receipt_cache_generation = 0      # bumped whenever the cache is dropped
+        self._receipt_cache_seen = {}           # connection -> (data_version, total_changes) last checked
+        self._receipt_cache_lock = threading.Lock()
         self.connect()
 
     def connect(self):
-        """Connect to database"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row  # Access columns by name
-        # Enable foreign keys
-        self.conn.execute("PRAGMA foreign_keys = ON")
+        """Connect to database and upgrade its schema"""
+        # conn is the pool's writer; worker threads read through reader()
+        self.pool = ConnectionPool(self.db_path, self.profile)
+        self.conn = self.pool.writer_conn
+        try:
+            self.schema_version = migrate(self.conn)
+        except Exception:
+            self.pool.close()
+            raise
+        self.fts_enabled = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'"
+        ).fetchone() is not None
 
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        """Close database connections"""
+        if self.pool:
+            self.pool.close()
+
+    def reader(self):
+        """Check out a read-only connection for this thread (use with 'with')"""
+        return self.pool.reader()
+
+    def backup(self, backup_path: str):
+        """Copy the database to backup_path (consistent even while in WAL mode)"""
+        target = sqlite3.connect(backup_path)
+        try:
+            with self.pool.writer() as conn:
+                conn.backup(target)
+        finally:
+            target.close()
 
     def __enter__(self):
         """Context manager entry"""
@@ -44,311 +126,481 @@ class DatabaseManager:
     # PRODUCTS
     # ============================================================
 
-    def get_all_products(self) -> List[Dict]:
+    def get_all_products(self) -> List[ProductRecord]:
         """Get all products"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT id, name, price, category
-            FROM products
-            ORDER BY category, name
-        """)
-
-        products = []
-        for row in cursor.fetchall():
-            products.append({
-                'id': row['id'],
-                'name': row['name'],
-                'price': row['price'],
-                'category': row['category']
-            })
-
-        return products
-
-    def get_product_by_id(self, product_id: int) -> Optional[Dict]:
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = ProductRecord.from_row
+            cursor.execute(f"""
+                SELECT {PRODUCT_COLUMNS}
+                FROM {PRODUCT_TABLES}
+                ORDER BY c.name, p.name
+            """)
+
+            return cursor.fetchall()
+
+    def get_product_by_id(self, product_id: int) -> Optional[ProductRecord]:
         """Get product by ID"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT id, name, price, category
-            FROM products
-            WHERE id = ?
-        """, (product_id,))
-
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row['id'],
-                'name': row['name'],
-                'price': row['price'],
-                'category': row['category']
-            }
-        return None
-
-    def search_products(self, query: str) -> List[Dict]:
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = ProductRecord.from_row
+            cursor.execute(f"""
+                SELECT {PRODUCT_COLUMNS}
+                FROM {PRODUCT_TABLES}
+                WHERE p.id = ?
+            """, (product_id,))
+
+            return cursor.fetchone()
+
+    def search_products(self, query: str) -> List[ProductRecord]:
         """Search products by name"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT id, name, price, category
-            FROM products
-            WHERE name LIKE ?
-            ORDER BY name
-        """, (f"%{query}%",))
-
-        products = []
-        for row in cursor.fetchall():
-            products.append({
-                'id': row['id'],
-                'name': row['name'],
-                'price': row['price'],
-                'category': row['category']
-            })
-
-        return products
+        return self.search_products_ranked(query, limit=None)
+
+    def search_products_ranked(self, query: str, limit: Optional[int] = 50) -> List[ProductRecord]:
+        """Search products by name, names starting with query first, then by relevance"""
+        query = query.strip()
+        if not query:
+            return []
+
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        prefix = f"{escaped}%"
+        limit = -1 if limit is None else limit
+
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = ProductRecord.from_row
+            if self.fts_enabled and len(query) >= FTS_MIN_QUERY_LENGTH:
+                phrase = '"' + query.replace('"', '""') + '"'
+                cursor.execute(f"""
+                    SELECT {PRODUCT_COLUMNS}
+                    FROM products_fts
+                    JOIN products p ON p.id = products_fts.rowid
+                    JOIN categories c ON c.id = p.category_id
+                    WHERE products_fts MATCH ?
+                    ORDER BY p.name LIKE ? ESCAPE '\\' DESC, products_fts.rank, p.name
+                    LIMIT ?
+                """, (phrase, prefix, limit))
+            else:
+                cursor.execute(f"""
+                    SELECT {PRODUCT_COLUMNS}
+                    FROM {PRODUCT_TABLES}
+                    WHERE p.name LIKE ? ESCAPE '\\'
+                    ORDER BY p.name LIKE ? ESCAPE '\\' DESC, p.name
+                    LIMIT ?
+                """, (f"%{escaped}%", prefix, limit))
+
+            return cursor.fetchall()
+
+    def get_catalog_version(self) -> int:
+        """Catalog version (changes with every product or category insert, update and delete)"""
+        with self.reader() as conn:
+            return conn.execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()[0]
 
     def add_product(self, name: str, price: float, category: str) -> int:
-        """Add new product"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO products (name, price, category)
-            VALUES (?, ?, ?)
-        """, (name, price, category))
+        """Add new product (a new category name creates the category)"""
+        with self.write_transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO products (name, price, category_id)
+                VALUES (?, ?, ?)
+            """, (name, price, self._category_id(cursor, category)))
 
-        self.conn.commit()
-        return cursor.lastrowid
+            return cursor.lastrowid
 
     def update_product(self, product_id: int, name: str, price: float, category: str) -> bool:
-        """Update product"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE products
-            SET name = ?, price = ?, category = ?
-            WHERE id = ?
-        """, (name, price, category, product_id))
+        """Update product (a new category name creates the category)"""
+        with self.write_transaction() as cursor:
+            cursor.execute("""
+                UPDATE products
+                SET name = ?, price = ?, category_id = ?
+                WHERE id = ?
+            """, (name, price, self._category_id(cursor, category), product_id))
 
-        self.conn.commit()
-        return cursor.rowcount > 0
+            return cursor.rowcount > 0
 
     def delete_product(self, product_id: int) -> bool:
-        """Delete product"""
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM products WHERE id = ?", (product_id,))
+        """Delete product (raises sqlite3.IntegrityError once it has been sold)"""
+        with self.write_transaction() as cursor:
+            cursor.execute("DELETE FROM products WHERE id = ?", (product_id,))
+
+            return cursor.rowcount > 0
 
-        self.conn.commit()
-        return cursor.rowcount > 0
+    def product_has_sales(self, product_id: int) -> bool:
+        """Whether receipt items refer to the product (it cannot be deleted then)"""
+        with self.reader() as conn:
+            return conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM receipt_items WHERE product_id = ?)", (product_id,)
+            ).fetchone()[0] == 1
 
     # ============================================================
     # RECEIPTS
     # ============================================================
 
-    def save_receipt(self, cart: List[Dict], total: float, cash_received: float, change: float) -> int:
-        """Save receipt with items"""
-        cursor = self.conn.cursor()
+    @contextmanager
+    def write_transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT (takes the write lock up front, rolls back on error)
 
-        # Insert receipt
+        Nested inside an open transaction it uses a savepoint instead; only
+        the outermost call commits.
+        """
+        with self.pool.writer() as conn:
+            if conn.in_transaction:
+                conn.execute("SAVEPOINT write_transaction")
+                try:
+                    yield conn.cursor()
+                except BaseException:
+                    conn.execute("ROLLBACK TO write_transaction")
+                    conn.execute("RELEASE write_transaction")
+                    raise
+                conn.execute("RELEASE write_transaction")
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn.cursor()
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def save_receipt(self, cart: Iterable[Dict], total: float, cash_received: float, change: float,
+                     payment_method: str = "Cash") -> int:
+        """Save receipt with items (cart is a Cart or a list of line dicts)"""
         date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cursor.execute("""
-            INSERT INTO receipts (date, total, cash_received, change)
-            VALUES (?, ?, ?, ?)
-        """, (date_str, total, cash_received, change))
+        items = list(cart)
+        with self.write_transaction() as cursor:
+            cursor.execute(INSERT_RECEIPT_SQL, (date_str, total, cash_received, change, None, payment_method,
+                                                len(items)))
+            receipt_id = cursor.lastrowid
+            cursor.executemany(INSERT_RECEIPT_ITEM_SQL, self._receipt_item_rows(receipt_id, items))
+        return receipt_id
 
-        receipt_id = cursor.lastrowid
+    def save_receipts(self, batch: Iterable[Dict]) -> List[int]:
+        """Save many receipts in one transaction (all or none)
 
-        # Insert receipt items
-        for item in cart:
+        Each receipt is a dict with 'items', 'total', 'cash_received', 'change'
+        and optionally 'date' (defaults to now), 'receipt_no' and 'payment_method'.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        receipt_ids = []
+        item_rows = []
+
+        with self.write_transaction() as cursor:
+            for receipt in batch:
+                cursor.execute(INSERT_RECEIPT_SQL, (
+                    receipt.get('date') or now,
+                    receipt['total'],
+                    receipt['cash_received'],
+                    receipt['change'],
+                    receipt.get('receipt_no'),
+                    receipt.get('payment_method') or "Cash",
+                    len(receipt['items'])
+                ))
+                receipt_ids.append(cursor.lastrowid)
+                item_rows.extend(self._receipt_item_rows(cursor.lastrowid, receipt['items']))
+            cursor.executemany(INSERT_RECEIPT_ITEM_SQL, item_rows)
+
+        return receipt_ids
+
+    @staticmethod
+    def _receipt_item_rows(receipt_id: int, items: Iterable[Dict]) -> List[Tuple]:
+        return [
+            (receipt_id, item['id'], item['name'], item['price'], item['qty'], item['total'])
+            for item in items
+        ]
+
+    def get_receipt_by_id(self, receipt_id: int) -> Optional[ReceiptRecord]:
+        """Get receipt with items by ID"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = ReceiptRecord.from_row
+
+            # Get receipt
             cursor.execute("""
-                INSERT INTO receipt_items (receipt_id, product_id, product_name, price, qty, total)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                receipt_id,
-                item['id'],
-                item['name'],
-                item['price'],
-                item['qty'],
-                item['total']
-            ))
-
-        self.conn.commit()
-        return receipt_id
+                SELECT id, date, total, cash_received, change, receipt_no, payment_method
+                FROM receipts
+                WHERE id = ?
+            """, (receipt_id,))
+
+            receipt = cursor.fetchone()
+            if receipt is None:
+                return None
+
+            # Get receipt items
+            cursor = conn.cursor()
+            cursor.row_factory = ReceiptItemRecord.from_row
+            cursor.execute("""
+                SELECT product_id, product_name, price, qty, total
+                FROM receipt_items
+                WHERE receipt_id = ?
+            """, (receipt_id,))
+            receipt.items = cursor.fetchall()
 
-    def get_receipt_by_id(self, receipt_id: int) -> Optional[Dict]:
-        """Get receipt with items by ID"""
-        cursor = self.conn.cursor()
+            return receipt
 
-        # Get receipt
-        cursor.execute("""
-            SELECT id, date, total, cash_received, change
-            FROM receipts
-            WHERE id = ?
-        """, (receipt_id,))
-
-        row = cursor.fetchone()
-        if not row:
-            return None
-
-        receipt = {
-            'id': row['id'],
-            'date': row['date'],
-            'total': row['total'],
-            'cash_received': row['cash_received'],
-            'change': row['change'],
-            'items': []
-        }
-
-        # Get receipt items
-        cursor.execute("""
-            SELECT product_id, product_name, price, qty, total
-            FROM receipt_items
-            WHERE receipt_id = ?
-        """, (receipt_id,))
-
-        for item_row in cursor.fetchall():
-            receipt['items'].append({
-                'id': item_row['product_id'],
-                'name': item_row['product_name'],
-                'price': item_row['price'],
-                'qty': item_row['qty'],
-                'total': item_row['total']
-            })
-
-        return receipt
-
-    def get_all_receipts(self, limit: int = 100) -> List[Dict]:
-        """Get all receipts (summary only)"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT r.id, r.date, r.total, r.cash_received, r.change,
-                   COUNT(ri.id) as items_count
-            FROM receipts r
-            LEFT JOIN receipt_items ri ON r.id = ri.receipt_id
-            GROUP BY r.id
-            ORDER BY r.date DESC
-            LIMIT ?
-        """, (limit,))
-
-        receipts = []
-        for row in cursor.fetchall():
-            receipts.append({
-                'id': row['id'],
-                'date': row['date'],
-                'total': row['total'],
-                'cash_received': row['cash_received'],
-                'change': row['change'],
-                'items_count': row['items_count']
-            })
-
-        return receipts
+    def get_last_receipt_id(self) -> int:
+        """Id of the newest saved receipt (0 when there are none)"""
+        with self.reader() as conn:
+            return conn.execute("SELECT MAX(id) FROM receipts").fetchone()[0] or 0
+
+    def get_all_receipts(self, limit: int = 100) -> List[ReceiptSummary]:
+        """Get all receipts (summary only), newest first"""
+        return self.get_receipts_page(limit=limit)
+
+    def get_receipts_page(self, before: Optional[Tuple[int, int]] = None, limit: int = 50) -> List[ReceiptSummary]:
+        """Get a page of receipts (summary only), newest first
+
+        before is the (date_ts, id) of the last receipt of the previous page;
+        the page seeks there on idx_receipts_date_total instead of using OFFSET.
+        """
+        return self.search_receipts(None, before, limit)
+
+    def search_receipts(self, filters: Optional[ReceiptFilter] = None,
+                        before: Optional[Tuple[int, int]] = None, limit: int = 50) -> List[ReceiptSummary]:
+        """Get a page of receipts matching filters, newest first (cached until receipts change)"""
+        sql, params = self.build_receipt_query(filters or ReceiptFilter(), before, limit)
+        key = (sql, tuple(params))
+
+        with self.reader() as conn:
+            # data_version of the reader moves on commits by any other connection
+            # (this writer, the receipt writer); total_changes covers a shared
+            # in-memory database, where the reader is the writer itself
+            version = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+            with self._receipt_cache_lock:
+                if self._receipt_cache_seen.get(conn) != version:
+                    self._receipt_cache.clear()
+                    self._receipt_cache_generation += 1
+                    self._receipt_cache_seen[conn] = version
+                generation = self._receipt_cache_generation
+                receipts = self._receipt_cache.get(key)
+                if receipts is not None:
+                    self._receipt_cache.move_to_end(key)
+                    return list(receipts)
+
+            cursor = conn.cursor()
+            cursor.row_factory = ReceiptSummary.from_row
+            receipts = cursor.execute(sql, params).fetchall()
+
+        with self._receipt_cache_lock:
+            # Not cached if receipts changed (seen by any reader) meanwhile
+            if generation == self._receipt_cache_generation:
+                self._receipt_cache[key] = receipts
+                if len(self._receipt_cache) > RECEIPT_CACHE_SIZE:
+                    self._receipt_cache.popitem(last=False)
+
+        return list(receipts)
+
+    def build_receipt_query(self, filters: ReceiptFilter, before: Optional[Tuple[int, int]] = None,
+                            limit: int = 50) -> Tuple[str, list]:
+        """Compose SQL and parameters for a page of receipts matching filters"""
+        where = []
+        params = []
+
+        if filters.receipt_id not in (None, ""):
+            # Receipt id or the number printed at checkout
+            receipt_id = str(filters.receipt_id).strip().lstrip("#")
+            where.append("(id = ? OR receipt_no = ?)")
+            params += [int(receipt_id) if receipt_id.isdigit() else None, receipt_id]
+        if filters.date_from is not None:
+            where.append("date_ts >= ?")
+            params.append(to_timestamp(filters.date_from))
+        if filters.date_to is not None:
+            where.append("date_ts < ?")
+            params.append(to_timestamp(filters.date_to))
+        if filters.min_total is not None:
+            where.append("total >= ?")
+            params.append(float(filters.min_total))
+        if filters.max_total is not None:
+            where.append("total <= ?")
+            params.append(float(filters.max_total))
+        if before is not None:
+            where.append("(date_ts, id) < (?, ?)")
+            params += [before[0], before[1]]
+
+        sql = f"SELECT {RECEIPT_SUMMARY_COLUMNS} FROM receipts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY date_ts DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return sql, params
+
+    def receipts_between(self, start: DateLike, end: DateLike, limit: Optional[int] = None) -> List[ReceiptSummary]:
+        """Get receipts dated start <= date < end (summary only), oldest first"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = ReceiptSummary.from_row
+            cursor.execute(f"""
+                SELECT {RECEIPT_SUMMARY_COLUMNS}
+                FROM receipts
+                WHERE date_ts >= ? AND date_ts < ?
+                ORDER BY date_ts, id
+                LIMIT ?
+            """, (to_timestamp(start), to_timestamp(end), -1 if limit is None else limit))
+
+            return cursor.fetchall()
+
+    def sales_between(self, start: DateLike, end: DateLike) -> Dict:
+        """Receipt count and sales for start <= date < end (read from the covering index)"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*), SUM(total)
+                FROM receipts
+                WHERE date_ts >= ? AND date_ts < ?
+            """, (to_timestamp(start), to_timestamp(end)))
+            count, total = cursor.fetchone()
+
+            return {
+                'receipts': count or 0,
+                'sales': total or 0.0
+            }
 
     def get_sales_summary(self) -> Dict:
-        """Get sales summary statistics"""
-        cursor = self.conn.cursor()
+        """Get sales summary statistics (from the daily_sales rollup)"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
 
-        # Total sales
-        cursor.execute("SELECT COUNT(*), SUM(total) FROM receipts")
-        count, total = cursor.fetchone()
+            # Total sales (one row per day and payment method)
+            cursor.execute("SELECT SUM(receipts), SUM(gross) FROM daily_sales")
+            count, total = cursor.fetchone()
 
-        # Today's sales
-        cursor.execute("""
-            SELECT COUNT(*), SUM(total)
-            FROM receipts
-            WHERE date LIKE ?
-        """, (datetime.now().strftime("%Y-%m-%d") + "%",))
-        today_count, today_total = cursor.fetchone()
-
-        return {
-            'total_receipts': count or 0,
-            'total_sales': total or 0.0,
-            'today_receipts': today_count or 0,
-            'today_sales': today_total or 0.0
-        }
+            # Today's sales
+            cursor.execute("""
+                SELECT payment_method, receipts, gross, tax
+                FROM daily_sales
+                WHERE day = ?
+            """, (datetime.now().strftime("%Y-%m-%d"),))
+            today = cursor.fetchall()
+
+            return {
+                'total_receipts': count or 0,
+                'total_sales': total or 0.0,
+                'today_receipts': sum(row['receipts'] for row in today),
+                'today_sales': sum((row['gross'] for row in today), 0.0),
+                'today_tax': sum((row['tax'] for row in today), 0.0),
+                'today_by_payment_method': {row['payment_method']: row['gross'] for row in today if row['receipts']}
+            }
+
+    def get_top_products(self, since: DateLike, limit: int = 10) -> List[Dict]:
+        """Best sellers by units sold from since on"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT h.product_id, p.name, SUM(h.qty) as qty, SUM(h.sales) as sales
+                FROM product_sales_hourly h
+                LEFT JOIN products p ON p.id = h.product_id
+                WHERE h.hour >= ?
+                GROUP BY h.product_id
+                HAVING SUM(h.qty) > 0
+                ORDER BY qty DESC, sales DESC
+                LIMIT ?
+            """, (to_timestamp(since) // 3600, limit))
+            return [dict(row) for row in cursor.fetchall()]
 
     # ============================================================
     # CATEGORIES
     # ============================================================
 
     def get_all_categories(self) -> List[str]:
-        """Get all unique categories"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT category
-            FROM products
-            ORDER BY category
-        """)
-
-        return [row[0] for row in cursor.fetchall()]
+        """Get all category names"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM categories ORDER BY name")
 
-    def get_products_by_category(self, category: str) -> List[Dict]:
-        """Get products by category"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT id, name, price, category
-            FROM products
-            WHERE category = ?
-            ORDER BY name
-        """, (category,))
-
-        products = []
-        for row in cursor.fetchall():
-            products.append({
-                'id': row['id'],
-                'name': row['name'],
-                'price': row['price'],
-                'category': row['category']
-            })
-
-        return products
-
-    def add_category(self, category_name: str) -> bool:
-        """
-        Add new category by creating a placeholder product
-        (Categories are derived from products table)
-        """
-        cursor = self.conn.cursor()
+            return [row[0] for row in cursor.fetchall()]
 
-        # Check if category already exists
-        cursor.execute("""
-            SELECT COUNT(*) FROM products WHERE category = ?
-        """, (category_name,))
+    def get_categories(self) -> List[CategoryRecord]:
+        """Get all categories with their emojis"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = CategoryRecord.from_row
+            cursor.execute("SELECT id, name, emoji FROM categories ORDER BY name")
 
-        if cursor.fetchone()[0] > 0:
-            return False  # Category already exists
+            return cursor.fetchall()
 
-        # Add a placeholder product for this category
-        # This ensures the category appears in get_all_categories()
-        cursor.execute("""
-            INSERT INTO products (name, price, category)
-            VALUES (?, ?, ?)
-        """, (f"_placeholder_{category_name}", 0.0, category_name))
+    def get_products_by_category(self, category: str) -> List[ProductRecord]:
+        """Get products by category"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = ProductRecord.from_row
+            cursor.execute(f"""
+                SELECT {PRODUCT_COLUMNS}
+                FROM {PRODUCT_TABLES}
+                WHERE c.name = ?
+                ORDER BY p.name
+            """, (category,))
+
+            return cursor.fetchall()
+
+    def add_category(self, category_name: str, emoji: Optional[str] = None) -> bool:
+        """Add new category (False when it already exists)"""
+        with self.write_transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO categories (name, emoji)
+                VALUES (?, ?)
+                ON CONFLICT (name) DO NOTHING
+            """, (category_name, emoji or CATEGORY_EMOJIS.get(category_name)))
 
-        self.conn.commit()
-        return True
+            return cursor.rowcount > 0
 
     def update_category(self, old_category: str, new_category: str) -> bool:
         """
-        Update category name - updates all products with this category
+        Rename category (one row; products refer to it by id).
+        Renaming to an existing category merges the two.
         """
-        cursor = self.conn.cursor()
+        if new_category == old_category:
+            return self.get_category_id(old_category) is not None
 
-        # Update all products with old category to new category
-        cursor.execute("""
-            UPDATE products
-            SET category = ?
-            WHERE category = ?
-        """, (new_category, old_category))
+        with self.write_transaction() as cursor:
+            target = cursor.execute("SELECT id FROM categories WHERE name = ?", (new_category,)).fetchone()
+            if target is None:
+                cursor.execute("UPDATE categories SET name = ? WHERE name = ?", (new_category, old_category))
+                return cursor.rowcount > 0
+
+            return self._merge_category(cursor, old_category, target[0])
+
+    def set_category_emoji(self, category_name: str, emoji: Optional[str]) -> bool:
+        """Set or clear (None) the emoji of a category"""
+        with self.write_transaction() as cursor:
+            cursor.execute("UPDATE categories SET emoji = ? WHERE name = ?", (emoji or None, category_name))
 
-        self.conn.commit()
-        return cursor.rowcount > 0
+            return cursor.rowcount > 0
 
     def delete_category(self, category_name: str, move_to_category: str = "อื่นๆ") -> bool:
         """
-        Delete category by moving all products to another category
+        Delete category, moving its products to move_to_category
         """
-        cursor = self.conn.cursor()
+        if category_name == move_to_category:
+            return False
+
+        with self.write_transaction() as cursor:
+            return self._merge_category(cursor, category_name, self._category_id(cursor, move_to_category))
+
+    def get_category_id(self, category_name: str) -> Optional[int]:
+        """Id of a category (None when there is none by that name)"""
+        with self.reader() as conn:
+            row = conn.execute("SELECT id FROM categories WHERE name = ?", (category_name,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _category_id(cursor: sqlite3.Cursor, category_name: str) -> int:
+        """Id of a category, created when missing (caller holds a write transaction)"""
+        row = cursor.execute("SELECT id FROM categories WHERE name = ?", (category_name,)).fetchone()
+        if row is not None:
+            return row[0]
 
-        # Move all products to move_to_category
         cursor.execute("""
-            UPDATE products
-            SET category = ?
-            WHERE category = ?
-        """, (move_to_category, category_name))
+            INSERT INTO categories (name, emoji)
+            VALUES (?, ?)
+        """, (category_name, CATEGORY_EMOJIS.get(category_name)))
+        return cursor.lastrowid
 
-        self.conn.commit()
-        return cursor.rowcount > 0
+    @staticmethod
+    def _merge_category(cursor: sqlite3.Cursor, category_name: str, target_id: int) -> bool:
+        """Move products of category_name to target_id and delete it"""
+        row = cursor.execute("SELECT id FROM categories WHERE name = ?", (category_name,)).fetchone()
+        if row is None or row[0] == target_id:
+            return False
+
+        cursor.execute("UPDATE products SET category_id = ? WHERE category_id = ?", (target_id, row[0]))
+        cursor.execute("DELETE FROM categories WHERE id = ?", (row[0],))
+        return True
@@ -0,0 +1,93 @@
+"""
+Product Emoji Lookup for POS System
+Keyword matching compiled once, results cached by product id
+"""
+import re
+from typing import Dict, Iterable, Optional
+
+
+# Keyword -> emoji (earlier keywords win when several match)
+PRODUCT_KEYWORD_EMOJIS = {
+    'coffee': '☕', 'tea': '🍵', 'latte': '☕', 'juice': '🧃',
+    'sandwich': '🥪', 'croissant': '🥐', 'salad': '🥗', 'burger': '🍔',
+    'pizza': '🍕', 'pasta': '🍝', 'rice': '🍚', 'wings': '🍗',
+    'cake': '🍰', 'ice cream': '🍦', 'brownie': '🧁'
+}
+
+
+# Category name -> emoji given to new categories (stored in categories.emoji)
+CATEGORY_EMOJIS = {
+    'Beverages': '🥤', 'Food': '🍽️', 'Desserts': '🍰',
+    'Snacks': '🍿', 'Dairy': '🥛', 'Breakfast': '🍳',
+    'Soups': '🍲', 'Pasta': '🍝', 'Burgers': '🍔',
+    'Main Course': '🍖', 'Drinks': '☕'
+}
+
+# Shown for categories without an emoji
+DEFAULT_CATEGORY_EMOJI = '🏷️'
+
+
+class EmojiLookup:
+    """Resolve product emojis with a single compiled regex and a per-product cache"""
+
+    def __init__(self, keyword_emojis: Dict[str, str],
+                 category_emojis: Optional[Dict[str, str]] = None,
+                 default: str = '🍽️'):
+        """Compile keyword matcher"""
+        self.keywords = list(keyword_emojis)
+        self.emojis = [keyword_emojis[k] for k in self.keywords]
+        self.category_emojis = category_emojis or {}
+        self.default = default
+
+        # Lookahead finds overlapping matches; alternation order is keyword
+        # priority, so each position reports its highest priority keyword
+        alternation = "|".join(re.escape(k) for k in self.keywords)
+        self._pattern = re.compile(f"(?=({alternation}))")
+        self._priority = {k: i for i, k in enumerate(self.keywords)}
+
+        # product id -> (name, category, emoji)
+        self._cache: Dict[int, tuple] = {}
+
+    def match(self, name: str, category: str = '') -> str:
+        """Resolve emoji for a product name (no caching)"""
+        best = None
+        for m in self._pattern.finditer(name.lower()):
+            priority = self._priority[m.group(1)]
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break
+
+        if best is not None:
+            return self.emojis[best]
+        return self.category_emojis.get(category.lower(), self.default)
+
+    def get(self, product: Dict) -> str:
+        """Get emoji for product (cart lines work too, they share product ids)"""
+        name = product['name']
+        category = product.get('category', '')
+
+        cached = self._cache.get(product['id'])
+        if cached is not None and cached[0] == name and cached[1] == category:
+            return cached[2]
+
+        emoji = self.match(name, category)
+        self._cache[product['id']] = (name, category, emoji)
+        return emoji
+
+    def build(self, products: Iterable[Dict]):
+        """Precompute emojis for a freshly loaded product list"""
+        self._cache.clear()
+        for product in products:
+            self.get(product)
+
+    def invalidate(self, product_id: Optional[int] = None):
+        """Forget cached emoji of one product (or all products)"""
+        if product_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(product_id, None)
+
+
+# Shared lookup used by the Flet views
+product_emojis = EmojiLookup(PRODUCT_KEYWORD_EMOJIS)
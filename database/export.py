@@ -0,0 +1,213 @@
+"""
+Receipt Export for POS System
+Streams receipts and receipt_items to CSV, Parquet or Arrow IPC files in fixed-size chunks
+
+Usage: python -m database.export [--format csv|parquet|arrow] [--incremental] [--out DIR] [--db PATH]
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from .connection import open_connection
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: CSV export only
+    pa = None
+    pq = None
+
+
+DEFAULT_EXPORT_DIR = os.path.join("data", "exports")
+
+# Rows fetched and written at a time (memory use does not grow with the table)
+EXPORT_CHUNK_SIZE = 5000
+
+# Last exported id per table, kept next to the exported files
+STATE_FILE = "export_state.json"
+
+# Exported columns and their Arrow types
+TABLES = {
+    'receipts': [
+        ('id', 'int64'), ('receipt_no', 'string'), ('date', 'string'), ('date_ts', 'int64'),
+        ('total', 'float64'), ('cash_received', 'float64'), ('change', 'float64'),
+        ('payment_method', 'string'), ('items_count', 'int64'),
+    ],
+    'receipt_items': [
+        ('id', 'int64'), ('receipt_id', 'int64'), ('product_id', 'int64'), ('product_name', 'string'),
+        ('price', 'float64'), ('qty', 'int64'), ('total', 'float64'),
+    ],
+}
+
+EXTENSIONS = {'csv': 'csv', 'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+def available_formats() -> List[str]:
+    """Export formats usable with the installed packages"""
+    return ['csv', 'parquet', 'arrow'] if pa is not None else ['csv']
+
+
+def load_state(out_dir: str) -> Dict[str, int]:
+    """Last exported id per table (empty before the first export)"""
+    path = os.path.join(out_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(out_dir: str, state: Dict[str, int]):
+    """Write last exported id per table"""
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def export_receipts(db_path: str, out_dir: str = DEFAULT_EXPORT_DIR, fmt: str = 'csv',
+                    incremental: bool = False, chunk_size: int = EXPORT_CHUNK_SIZE,
+                    profile: Optional[str] = None) -> Dict[str, Dict]:
+    """Export receipts and receipt_items, one file per table
+
+    With incremental=True only rows after the last exported id are written.
+    Returns {table: {'path', 'rows', 'last_id'}}; path is None when there
+    were no rows to export.
+    """
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(EXTENSIONS)})")
+    if fmt not in available_formats():
+        raise ValueError(f"Export format '{fmt}' needs pyarrow (pip install pyarrow)")
+
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(out_dir) if incremental else {}
+
+    # Own read-only connection, so a long export runs off the UI connection;
+    # both tables are read in one transaction and match each other
+    conn = open_connection(db_path, profile, readonly=True)
+    try:
+        conn.execute("BEGIN")
+        results = {
+            table: _export_table(conn, table, out_dir, fmt, state.get(table, 0), chunk_size)
+            for table in TABLES
+        }
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    if incremental:
+        state.update({table: result['last_id'] for table, result in results.items()})
+    else:
+        state = {table: result['last_id'] for table, result in results.items()}
+    save_state(out_dir, state)
+    return results
+
+
+def _export_table(conn: sqlite3.Connection, table: str, out_dir: str, fmt: str,
+                  after_id: int, chunk_size: int) -> Dict:
+    """Stream rows of table with id > after_id into one file"""
+    columns = [name for name, _ in TABLES[table]]
+    cursor = conn.execute(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id",
+        (after_id,)
+    )
+
+    # Written under a temporary name, renamed to <table>_<first>-<last> when done
+    part_path = os.path.join(out_dir, f"{table}.{EXTENSIONS[fmt]}.part")
+    writer = None
+    first_id = None
+    last_id = after_id
+    rows = 0
+    try:
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            if writer is None:
+                writer = _open_writer(fmt, part_path, table)
+                first_id = chunk[0][0]
+            writer.write(chunk)
+            rows += len(chunk)
+            last_id = chunk[-1][0]
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(part_path)
+        raise
+
+    if writer is None:
+        return {'path': None, 'rows': 0, 'last_id': last_id}
+
+    writer.close()
+    path = os.path.join(out_dir, f"{table}_{first_id}-{last_id}.{EXTENSIONS[fmt]}")
+    os.replace(part_path, path)
+    return {'path': path, 'rows': rows, 'last_id': last_id}
+
+
+def _open_writer(fmt: str, path: str, table: str):
+    """Chunk writer for fmt"""
+    if fmt == 'csv':
+        return _CsvWriter(path, table)
+    return _ArrowWriter(path, table, fmt)
+
+
+class _CsvWriter:
+    """Append row chunks to a CSV file with a header row"""
+
+    def __init__(self, path: str, table: str):
+        # utf-8-sig so spreadsheet programs read Thai product names correctly
+        self.file = open(path, "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in TABLES[table]])
+
+    def write(self, chunk: List[sqlite3.Row]):
+        self.writer.writerows(chunk)
+
+    def close(self):
+        self.file.close()
+
+
+class _ArrowWriter:
+    """Append row chunks as record batches to a Parquet or Arrow IPC file"""
+
+    def __init__(self, path: str, table: str, fmt: str):
+        self.schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in TABLES[table]])
+        if fmt == 'parquet':
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, chunk: List[sqlite3.Row]):
+        arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), self.schema)]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export receipts and receipt items")
+    parser.add_argument("--db", default=os.path.join("database", "pos.db"), help="database file")
+    parser.add_argument("--out", default=DEFAULT_EXPORT_DIR, help="output directory")
+    parser.add_argument("--format", default="csv", choices=list(EXTENSIONS), help="file format")
+    parser.add_argument("--incremental", action="store_true", help="only rows after the last export")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="rows per chunk")
+    args = parser.parse_args(argv)
+
+    try:
+        results = export_receipts(args.db, args.out, args.format, args.incremental, args.chunk_size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for table, result in results.items():
+        if result['path']:
+            print(f"[OK] {table}: {result['rows']} rows -> {result['path']}")
+        else:
+            print(f"[OK] {table}: nothing new to export")
+
+
+if __name__ == "__main__":
+    main()
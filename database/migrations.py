@@ -0,0 +1,341 @@
+"""
+Schema Migrations for POS System
+Upgrades existing database files in place, tracked in schema_version
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from .emoji_lookup import CATEGORY_EMOJIS
+
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+
+def execute_script(conn: sqlite3.Connection, script: str):
+    """Run SQL statements one at a time in the open transaction (executescript commits first)"""
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip().rstrip(";").strip():
+                conn.execute(statement)
+            statement = ""
+
+
+def apply_schema(conn: sqlite3.Connection):
+    """Create missing tables, indexes and triggers (schema.sql is idempotent)"""
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        execute_script(conn, f.read())
+
+
+def rebuild_product_fts(conn: sqlite3.Connection):
+    """Fill products_fts from products (databases made before full-text search)"""
+    conn.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+
+def add_receipt_no(conn: sqlite3.Connection):
+    """Unique checkout number on receipts (makes journal replay idempotent)"""
+    if not has_column(conn, 'receipts', 'receipt_no'):
+        conn.execute("ALTER TABLE receipts ADD COLUMN receipt_no TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_receipts_receipt_no ON receipts(receipt_no)")
+
+
+# Receipt totals include 7% VAT (Cart.TAX_RATE): tax = total * 7 / 107
+DAILY_SALES_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS daily_sales_insert
+AFTER INSERT ON receipts
+BEGIN
+    INSERT INTO daily_sales (day, payment_method, receipts, gross, tax)
+    VALUES (substr(NEW.date, 1, 10), NEW.payment_method, 1, NEW.total, NEW.total * 7.0 / 107.0)
+    ON CONFLICT (day, payment_method) DO UPDATE SET
+        receipts = receipts + 1,
+        gross = gross + excluded.gross,
+        tax = tax + excluded.tax;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_sales_delete
+AFTER DELETE ON receipts
+BEGIN
+    UPDATE daily_sales SET
+        receipts = receipts - 1,
+        gross = gross - OLD.total,
+        tax = tax - OLD.total * 7.0 / 107.0
+    WHERE day = substr(OLD.date, 1, 10) AND payment_method = OLD.payment_method;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_sales_update
+AFTER UPDATE OF date, total, payment_method ON receipts
+BEGIN
+    UPDATE daily_sales SET
+        receipts = receipts - 1,
+        gross = gross - OLD.total,
+        tax = tax - OLD.total * 7.0 / 107.0
+    WHERE day = substr(OLD.date, 1, 10) AND payment_method = OLD.payment_method;
+    INSERT INTO daily_sales (day, payment_method, receipts, gross, tax)
+    VALUES (substr(NEW.date, 1, 10), NEW.payment_method, 1, NEW.total, NEW.total * 7.0 / 107.0)
+    ON CONFLICT (day, payment_method) DO UPDATE SET
+        receipts = receipts + 1,
+        gross = gross + excluded.gross,
+        tax = tax + excluded.tax;
+END;
+"""
+
+
+def add_daily_sales(conn: sqlite3.Connection):
+    """Payment method on receipts and the daily_sales rollup (backfilled)"""
+    if not has_column(conn, 'receipts', 'payment_method'):
+        conn.execute("ALTER TABLE receipts ADD COLUMN payment_method TEXT NOT NULL DEFAULT 'Cash'")
+    apply_schema(conn)
+    execute_script(conn, DAILY_SALES_TRIGGERS)
+    conn.execute("DELETE FROM daily_sales")
+    conn.execute("""
+        INSERT INTO daily_sales (day, payment_method, receipts, gross, tax)
+        SELECT substr(date, 1, 10), payment_method, COUNT(*), SUM(total), SUM(total) * 7.0 / 107.0
+        FROM receipts
+        GROUP BY substr(date, 1, 10), payment_method
+    """)
+
+
+DATE_TS_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS receipts_date_ts_insert
+AFTER INSERT ON receipts
+WHEN NEW.date_ts IS NULL
+BEGIN
+    UPDATE receipts SET date_ts = CAST(strftime('%s', NEW.date) AS INTEGER) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS receipts_date_ts_update
+AFTER UPDATE OF date ON receipts
+BEGIN
+    UPDATE receipts SET date_ts = CAST(strftime('%s', NEW.date) AS INTEGER) WHERE id = NEW.id;
+END;
+"""
+
+
+def add_receipt_timestamps(conn: sqlite3.Connection):
+    """Integer receipt timestamps with a covering index for date ranges"""
+    if not has_column(conn, 'receipts', 'date_ts'):
+        conn.execute("ALTER TABLE receipts ADD COLUMN date_ts INTEGER")
+    conn.execute("UPDATE receipts SET date_ts = CAST(strftime('%s', date) AS INTEGER) WHERE date_ts IS NULL")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_receipts_date_ts
+        ON receipts(date_ts, total, payment_method)
+    """)
+    execute_script(conn, DATE_TS_TRIGGERS)
+
+
+def add_receipt_items_count(conn: sqlite3.Connection):
+    """Line count stored on receipts and an index for newest-first paging"""
+    if not has_column(conn, 'receipts', 'items_count'):
+        conn.execute("ALTER TABLE receipts ADD COLUMN items_count INTEGER NOT NULL DEFAULT 0")
+    conn.execute("""
+        UPDATE receipts SET items_count = (
+            SELECT COUNT(*) FROM receipt_items WHERE receipt_id = receipts.id
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_receipts_recent ON receipts(date_ts, id)")
+
+
+def add_receipt_search_index(conn: sqlite3.Connection):
+    """(date_ts, id, total) index: newest-first pages filtered by amount without table lookups"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_receipts_date_total ON receipts(date_ts, id, total)")
+    conn.execute("DROP INDEX IF EXISTS idx_receipts_recent")
+
+
+# Hour = date_ts / 3600; receipts without a timestamp are not counted
+PRODUCT_SALES_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS product_sales_hourly_insert
+AFTER INSERT ON receipt_items
+BEGIN
+    INSERT INTO product_sales_hourly (product_id, hour, qty, sales)
+    SELECT NEW.product_id, date_ts / 3600, NEW.qty, NEW.total
+    FROM receipts
+    WHERE id = NEW.receipt_id AND date_ts IS NOT NULL
+    ON CONFLICT (hour, product_id) DO UPDATE SET
+        qty = qty + excluded.qty,
+        sales = sales + excluded.sales;
+END;
+
+CREATE TRIGGER IF NOT EXISTS product_sales_hourly_delete
+BEFORE DELETE ON receipts
+BEGIN
+    UPDATE product_sales_hourly SET
+        qty = qty - (SELECT SUM(qty) FROM receipt_items
+                     WHERE receipt_id = OLD.id AND product_id = product_sales_hourly.product_id),
+        sales = sales - (SELECT SUM(total) FROM receipt_items
+                         WHERE receipt_id = OLD.id AND product_id = product_sales_hourly.product_id)
+    WHERE hour = OLD.date_ts / 3600
+      AND product_id IN (SELECT product_id FROM receipt_items WHERE receipt_id = OLD.id);
+END;
+"""
+
+
+def add_product_sales_hourly(conn: sqlite3.Connection):
+    """Units sold per product and hour (backfilled), read by ProductVelocity"""
+    apply_schema(conn)
+    execute_script(conn, PRODUCT_SALES_TRIGGERS)
+    conn.execute("DELETE FROM product_sales_hourly")
+    conn.execute("""
+        INSERT INTO product_sales_hourly (product_id, hour, qty, sales)
+        SELECT ri.product_id, r.date_ts / 3600, SUM(ri.qty), SUM(ri.total)
+        FROM receipt_items ri
+        JOIN receipts r ON r.id = ri.receipt_id
+        WHERE r.date_ts IS NOT NULL
+        GROUP BY 1, 2
+    """)
+
+
+def add_catalog_version(conn: sqlite3.Connection):
+    """catalog_version row and its product triggers (catalog snapshot staleness check)"""
+    apply_schema(conn)
+
+
+# Emojis the category view kept next to the app before they moved into
+# categories.emoji (relative to the working directory, like the view read it)
+LEGACY_CATEGORY_EMOJIS_PATH = os.path.join("data", "category_emojis.json")
+
+
+def add_categories(conn: sqlite3.Connection):
+    """categories table referenced by products.category_id (placeholder products dropped)"""
+    apply_schema(conn)
+
+    if has_column(conn, 'products', 'category'):
+        conn.execute("INSERT OR IGNORE INTO categories (name) SELECT DISTINCT category FROM products ORDER BY category")
+
+        # Empty categories used to be kept alive by a fake product
+        conn.execute("DELETE FROM products WHERE name = '_placeholder_' || category")
+
+        # SQLite cannot add a NOT NULL foreign key column: rebuild the table
+        # (ids kept, so receipt items and the full-text index stay valid).
+        # The step runs in one transaction; a products_new left by an
+        # interrupted run of an earlier version is dropped first
+        conn.execute("DROP TABLE IF EXISTS products_new")
+        conn.execute("""
+            CREATE TABLE products_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                price REAL NOT NULL,
+                category_id INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES categories(id)
+            )
+        """)
+        # Timestamps only exist in databases made from schema.sql
+        timestamps = [column for column in ('created_at', 'updated_at') if has_column(conn, 'products', column)]
+        conn.execute(f"""
+            INSERT INTO products_new (id, name, price, category_id{"".join(f", {c}" for c in timestamps)})
+            SELECT p.id, p.name, p.price, c.id{"".join(f", p.{c}" for c in timestamps)}
+            FROM products p
+            JOIN categories c ON c.name = p.category
+        """)
+        conn.execute("DROP TABLE products")
+        conn.execute("ALTER TABLE products_new RENAME TO products")
+        if conn.execute("PRAGMA foreign_key_check(products)").fetchone() is not None:
+            raise sqlite3.IntegrityError("products reference missing categories")
+        conn.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+
+        # Triggers were dropped with the old table
+        apply_schema(conn)
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_products_category_id ON products(category_id)")
+    import_category_emojis(conn)
+
+
+def import_category_emojis(conn: sqlite3.Connection):
+    """Fill missing category emojis from the old JSON file, then the defaults"""
+    emojis = {}
+    if os.path.exists(LEGACY_CATEGORY_EMOJIS_PATH):
+        try:
+            with open(LEGACY_CATEGORY_EMOJIS_PATH, encoding="utf-8") as f:
+                emojis = json.load(f)
+        except ValueError as e:
+            print(f"Error reading {LEGACY_CATEGORY_EMOJIS_PATH}: {e}")
+
+    for mapping in (emojis, CATEGORY_EMOJIS):
+        conn.executemany(
+            "UPDATE categories SET emoji = ? WHERE name = ? AND emoji IS NULL",
+            [(emoji, name) for name, emoji in mapping.items() if emoji]
+        )
+
+
+def has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """Check whether table has column"""
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+# (version, description, upgrade) applied in order; append new steps, never edit old ones.
+# schema.sql always describes the latest tables, so steps must tolerate objects
+# that already exist in a freshly created database. Indexes on columns added
+# to existing tables belong in the step only: schema.sql also runs on old
+# databases (step 1) before the column exists.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "Base schema", apply_schema),
+    (2, "Product full-text index", rebuild_product_fts),
+    (3, "Receipt numbers", add_receipt_no),
+    (4, "Daily sales rollup", add_daily_sales),
+    (5, "Receipt timestamps", add_receipt_timestamps),
+    (6, "Receipt item counts", add_receipt_items_count),
+    (7, "Receipt search index", add_receipt_search_index),
+    (8, "Product sales by hour", add_product_sales_hourly),
+    (9, "Catalog version", add_catalog_version),
+    (10, "Categories table", add_categories),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the highest applied migration (0 for an untracked database)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations and return the resulting schema version"""
+    version = get_schema_version(conn)
+    conn.commit()
+
+    # Steps may rebuild tables (SQLite's ALTER TABLE procedure), which
+    # needs foreign keys off; they are switched back on after the last step
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        version = apply_migrations(conn, version)
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {int(foreign_keys)}")
+
+    return version
+
+
+def apply_migrations(conn: sqlite3.Connection, version: int) -> int:
+    """Apply the steps after version in order, each in its own transaction (raises on failure)"""
+    for step, description, upgrade in MIGRATIONS:
+        if step <= version:
+            continue
+
+        try:
+            conn.execute("BEGIN")
+            upgrade(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (step, description, datetime.now().isoformat())
+            )
+            conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            conn.rollback()
+            print(f"Error applying migration {step} ({description}): {e}")
+            raise
+
+        print(f"[OK] Database migrated to version {step}: {description}")
+        version = step
+
+    return version
@@ -0,0 +1,107 @@
+"""
+Connection Pool for POS System
+One writer connection and a few read-only connections shared between threads
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from .connection import get_profile, open_connection
+
+
+# Read-only connections opened at most (checkouts beyond this wait)
+READER_CONNECTIONS = 4
+
+
+class ConnectionPool:
+    """Writer connection behind a lock plus up to N read-only (mode=ro) connections
+
+    Checkouts are per thread: a thread that already holds a connection gets
+    the same one back from nested checkouts. Readers use WAL snapshots, so
+    reports and history queries in worker threads do not block checkout
+    writes and never see half-written receipts.
+    """
+
+    def __init__(self, db_path: str, profile: Optional[str] = None, readers: int = READER_CONNECTIONS):
+        """Open the writer connection (readers are opened on first use)"""
+        self.db_path = db_path
+        self.profile = profile
+        self.size = readers
+
+        self.writer_conn = open_connection(db_path, profile, check_same_thread=False)
+        self._write_lock = threading.RLock()
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers: List[sqlite3.Connection] = []
+        self._open_lock = threading.Lock()
+        self._local = threading.local()
+        self._timeout = get_profile(profile)['busy_timeout'] / 1000
+
+        # An in-memory database exists only on the writer connection
+        self.shared = db_path == ":memory:"
+
+    # ============================================================
+    # CHECKOUT
+    # ============================================================
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Check out the writer connection (one thread at a time)"""
+        with self._write_lock:
+            yield self.writer_conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection for this thread"""
+        if self.shared:
+            with self.writer() as conn:
+                yield conn
+            return
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            # Nested checkout on this thread
+            yield conn
+            return
+
+        conn = self._checkout()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if conn.in_transaction:
+                conn.rollback()  # release the read snapshot
+            self._idle.put(conn)
+
+    def _checkout(self) -> sqlite3.Connection:
+        """Idle reader, a new one while below size, else wait for one"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._open_lock:
+            if len(self._readers) < self.size:
+                conn = open_connection(self.db_path, self.profile, readonly=True, check_same_thread=False)
+                self._readers.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No read connection free after {self._timeout:.0f} s") from None
+
+    # ============================================================
+    # LIFECYCLE
+    # ============================================================
+
+    def close(self):
+        """Close every connection"""
+        with self._open_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self.writer_conn.close()
@@ -0,0 +1,273 @@
+"""
+Background Receipt Writer for POS System
+Checkout appends to a durable journal and returns; a writer thread commits in batches
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .db_manager import DatabaseManager
+
+
+def is_transient(error: Exception) -> bool:
+    """True for errors worth retrying (another connection holds the database)"""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return "locked" in str(error) or "busy" in str(error)
+
+
+class ReceiptWriter:
+    """Write receipts to SQLite off the UI thread, journaled so none are lost on a crash"""
+
+    BATCH_SIZE = 200
+    RETRY_SECONDS = 1.0
+
+    def __init__(self, db_path: str, journal_path: Optional[str] = None,
+                 profile: Optional[str] = None, batch_size: int = BATCH_SIZE, fsync: bool = True,
+                 on_failed: Optional[Callable[[Dict, Exception], None]] = None):
+        """Create writer (call start() to replay the journal and begin writing)
+
+        on_failed(receipt, error) is called from the writer thread when a receipt
+        cannot be saved and is set aside in failed_path.
+        """
+        if journal_path is None:
+            journal_path = os.path.splitext(db_path)[0] + "_receipts.journal"
+
+        self.db_path = db_path
+        self.journal_path = journal_path
+        self.failed_path = journal_path + ".failed"   # receipts that cannot be saved
+        self.profile = profile
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.on_failed = on_failed
+
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        self._journal_lock = threading.Lock()
+        self._committed = threading.Condition(self._journal_lock)
+        self._failed_lock = threading.Lock()
+        self._journal = None
+        self._pending = 0           # journaled receipts not yet committed
+        self.failed = 0             # receipts moved to failed_path since start (or the last retry)
+        self.terminal = uuid.uuid4().hex[:6]   # tells apart numbers from other processes/terminals
+        self._seq = 0
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+
+    # ============================================================
+    # LIFECYCLE
+    # ============================================================
+
+    def start(self) -> int:
+        """Replay receipts left in the journal, then start the writer thread"""
+        replayed = self.replay()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="receipt-writer", daemon=True)
+        self._thread.start()
+        return replayed
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted receipt is written; False if the timeout ran out first"""
+        with self._committed:
+            return self._committed.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self):
+        """Commit what is queued and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._journal.close()
+        self._journal = None
+
+    # ============================================================
+    # CHECKOUT
+    # ============================================================
+
+    def submit(self, items: Iterable[Dict], total: float, cash_received: float, change: float,
+               payment_method: str = "Cash") -> str:
+        """Journal a receipt and queue it for writing; returns its receipt number"""
+        now = datetime.now()
+        with self._journal_lock:
+            self._seq += 1
+            receipt = {
+                'receipt_no': f"{now:%Y%m%d-%H%M%S}-{self.terminal}-{self._seq:04d}",
+                'date': now.strftime("%Y-%m-%d %H:%M:%S"),
+                'items': [dict(item) for item in items],
+                'total': total,
+                'cash_received': cash_received,
+                'change': change,
+                'payment_method': payment_method
+            }
+            self._append_journal(receipt)
+
+        self._queue.put(receipt)
+        return receipt['receipt_no']
+
+    def _append_journal(self, receipt: Dict):
+        """Durably journal a receipt (call with _journal_lock held)"""
+        self._journal.write(json.dumps(receipt, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self._pending += 1
+
+    # ============================================================
+    # RECOVERY
+    # ============================================================
+
+    def failed_receipts(self) -> List[Dict]:
+        """Receipts set aside in failed_path, with their 'error' (kept across restarts)"""
+        with self._failed_lock:
+            return self._read_receipts(self.failed_path)
+
+    def retry_failed(self) -> int:
+        """Queue the set-aside receipts for writing again; returns how many"""
+        with self._failed_lock:
+            receipts = self._read_receipts(self.failed_path)
+            with self._journal_lock:
+                for receipt in receipts:
+                    receipt.pop('error', None)
+                    self._append_journal(receipt)
+            # Journaled again, so failed_path can go (receipts that still
+            # fail are set aside once more)
+            if receipts:
+                os.remove(self.failed_path)
+            self.failed = 0
+
+        for receipt in receipts:
+            self._queue.put(receipt)
+        return len(receipts)
+
+    # ============================================================
+    # WRITING
+    # ============================================================
+
+    def replay(self) -> int:
+        """Save journaled receipts missing from the database, then clear the journal"""
+        receipts = self._read_receipts(self.journal_path)
+        saved = 0
+        if receipts:
+            db = DatabaseManager(self.db_path, self.profile)
+            try:
+                for i in range(0, len(receipts), self.batch_size):
+                    saved += self._write(db, receipts[i:i + self.batch_size])
+                print(f"[OK] Replayed {saved} receipts from {self.journal_path}")
+            finally:
+                db.close()
+
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        return saved
+
+    def _run(self):
+        db = DatabaseManager(self.db_path, self.profile)
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if batch[-1] is None:
+                stopping = True
+            receipts = [r for r in batch if r is not None]
+
+            if receipts:
+                self._write(db, receipts)
+
+            with self._committed:
+                self._pending -= len(receipts)
+                if self._pending == 0:
+                    # Everything journaled is committed (or set aside)
+                    self._journal.truncate(0)
+                    self._committed.notify_all()
+
+            for _ in batch:
+                self._queue.task_done()
+
+        db.close()
+
+    def _write(self, db: DatabaseManager, receipts: List[Dict]) -> int:
+        """Save receipts, setting aside the ones that fail; returns how many were saved"""
+        try:
+            return len(self._save_retrying(db, receipts))
+        except Exception as e:
+            if len(receipts) > 1:
+                # Find the bad receipt(s), save the rest
+                return sum(self._write(db, [receipt]) for receipt in receipts)
+            self._set_aside(receipts[0], e)
+            return 0
+
+    def _save_retrying(self, db: DatabaseManager, receipts: List[Dict]) -> List[int]:
+        """Save receipts, retrying while another connection holds the database"""
+        while True:
+            try:
+                ids = self._save(db, receipts)
+                self.last_error = None
+                return ids
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                # Receipts stay in the journal; try again shortly
+                self.last_error = e
+                print(f"Error saving receipts (retrying): {e}")
+                time.sleep(self.RETRY_SECONDS)
+
+    def _set_aside(self, receipt: Dict, error: Exception):
+        """Append a receipt that cannot be saved to failed_path for manual recovery"""
+        self.last_error = error
+        with self._failed_lock:
+            self.failed += 1
+            with open(self.failed_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(dict(receipt, error=str(error)), ensure_ascii=False) + "\n")
+        print(f"Error saving receipt {receipt.get('receipt_no')} ({error}), kept in {self.failed_path}")
+        if self.on_failed:
+            self.on_failed(receipt, error)
+
+    @staticmethod
+    def _save(db: DatabaseManager, receipts: List[Dict]) -> List[int]:
+        """Save receipts whose receipt_no is not in the database yet
+
+        A receipt_no already saved with another date, total or line count belongs
+        to a different sale: raise so the receipt is set aside instead of dropped.
+        """
+        numbers = [r['receipt_no'] for r in receipts]
+        placeholders = ", ".join("?" * len(numbers))
+        saved = {
+            row['receipt_no']: (row['date'], row['total'], row['items_count']) for row in db.conn.execute(
+                f"SELECT receipt_no, date, total, items_count FROM receipts WHERE receipt_no IN ({placeholders})",
+                numbers
+            )
+        }
+        for receipt in receipts:
+            existing = saved.get(receipt['receipt_no'])
+            if existing and existing != (receipt.get('date'), receipt['total'], len(receipt['items'])):
+                raise sqlite3.IntegrityError(f"receipt_no {receipt['receipt_no']} is already used by another sale")
+        return db.save_receipts(r for r in receipts if r['receipt_no'] not in saved)
+
+    @staticmethod
+    def _read_receipts(path: str) -> List[Dict]:
+        if not os.path.exists(path):
+            return []
+
+        receipts = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    receipts.append(json.loads(line))
+                except ValueError:
+                    # Torn last line from a crash mid-write (never acknowledged)
+                    print(f"Skipping damaged journal line: {line[:60]!r}")
+        return receipts
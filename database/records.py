@@ -0,0 +1,146 @@
+"""
+Record Types for POS System
+Lightweight rows with dict-style access for the existing views
+"""
+from typing import Dict, List, Optional
+
+
+class Record:
+    """Slotted row read like a dict: record['name'], record.get('category')
+
+    Subclasses list their fields in __slots__ in SELECT column order, so
+    a query can build them directly with cursor.row_factory = Cls.from_row
+    instead of copying sqlite3.Row objects into dicts.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, cursor, row: tuple) -> 'Record':
+        """sqlite3 row_factory: build record from the selected columns"""
+        return cls(*row)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Record':
+        """Create record from a dict with the record's keys"""
+        return cls(*(data[key] for key in cls.__slots__))
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self) -> tuple:
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+    def items(self):
+        return zip(self.__slots__, self.values())
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def to_dict(self) -> Dict:
+        """Copy record into a plain dict"""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if type(other) is type(self):
+            return self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.values())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class ProductRecord(Record):
+    """Product row (read like a dict: product['name'], product.get('category'))"""
+
+    __slots__ = ('id', 'name', 'price', 'category')
+
+    def __init__(self, id: int, name: str, price: float, category: str):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.category = category
+
+
+class ReceiptSummary(Record):
+    """Receipt without its items (history lists, searches and date ranges)"""
+
+    __slots__ = ('id', 'date', 'date_ts', 'total', 'cash_received', 'change',
+                 'receipt_no', 'payment_method', 'items_count')
+
+    def __init__(self, id: int, date: str, date_ts: int, total: float, cash_received: float,
+                 change: float, receipt_no: str, payment_method: str, items_count: int):
+        self.id = id
+        self.date = date
+        self.date_ts = date_ts
+        self.total = total
+        self.cash_received = cash_received
+        self.change = change
+        self.receipt_no = receipt_no
+        self.payment_method = payment_method
+        self.items_count = items_count
+
+
+class ReceiptItemRecord(Record):
+    """Receipt line (keys match cart lines: id is the product id)"""
+
+    __slots__ = ('id', 'name', 'price', 'qty', 'total')
+
+    def __init__(self, id: int, name: str, price: float, qty: int, total: float):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.qty = qty
+        self.total = total
+
+
+class ReceiptRecord(Record):
+    """Receipt with its items"""
+
+    __slots__ = ('id', 'date', 'total', 'cash_received', 'change', 'receipt_no', 'payment_method', 'items')
+
+    def __init__(self, id: int, date: str, total: float, cash_received: float, change: float,
+                 receipt_no: str, payment_method: str, items: List[ReceiptItemRecord] = None):
+        self.id = id
+        self.date = date
+        self.total = total
+        self.cash_received = cash_received
+        self.change = change
+        self.receipt_no = receipt_no
+        self.payment_method = payment_method
+        self.items = items if items is not None else []
+
+    # Items are a list
+    __hash__ = None
+
+
+class CategoryRecord(Record):
+    """Category row (products refer to it by id, views by name)"""
+
+    __slots__ = ('id', 'name', 'emoji')
+
+    def __init__(self, id: int, name: str, emoji: Optional[str] = None):
+        self.id = id
+        self.name = name
+        self.emoji = emoji
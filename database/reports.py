@@ -0,0 +1,246 @@
+"""
+Sales Reports for POS System
+Sales by period, category, product, hour of day and payment method
+"""
+import calendar
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .db_manager import DateLike, to_timestamp
+
+
+REPORT_TYPES = ('daily', 'weekly', 'monthly', 'yearly', 'custom')
+
+# Custom reports longer than this are broken down by month instead of by day
+CUSTOM_DAILY_LIMIT = 62
+
+# Category shown for sold products that no longer exist
+UNCATEGORIZED = "อื่นๆ"
+
+DAY_SECONDS = 86400
+EPOCH = date(1970, 1, 1)
+
+
+def to_date(value: DateLike) -> date:
+    """Date of a date, datetime or 'YYYY-MM-DD[ HH:MM:SS]' string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value.strip()[:10], "%Y-%m-%d").date()
+
+
+def report_range(report_type: str, today: Optional[DateLike] = None,
+                 date_from: Optional[DateLike] = None, date_to: Optional[DateLike] = None) -> Tuple[date, date]:
+    """First and last day (both inclusive) covered by a report"""
+    today = to_date(today) if today is not None else date.today()
+
+    if report_type == 'daily':
+        return today, today
+    if report_type == 'weekly':
+        start = today - timedelta(days=today.weekday())
+        return start, start + timedelta(days=6)
+    if report_type == 'monthly':
+        last = calendar.monthrange(today.year, today.month)[1]
+        return today.replace(day=1), today.replace(day=last)
+    if report_type == 'yearly':
+        return date(today.year, 1, 1), date(today.year, 12, 31)
+    if report_type == 'custom':
+        if date_from is None or date_to is None:
+            raise ValueError("Custom report needs date_from and date_to")
+        start, end = to_date(date_from), to_date(date_to)
+        if end < start:
+            raise ValueError("date_to is before date_from")
+        return start, end
+
+    raise ValueError(f"Unknown report type '{report_type}' (expected one of {', '.join(REPORT_TYPES)})")
+
+
+class ReportEngine:
+    """Build sales reports; days before today are aggregated once and cached"""
+
+    def __init__(self, db):
+        """Create engine over a DatabaseManager"""
+        self.db = db
+        self._lock = threading.Lock()
+        # Closed day -> {'key': (receipts, gross), 'products': {...}, 'hours': {...}}
+        self._days: Dict[str, Dict] = {}
+
+    # ============================================================
+    # REPORTS
+    # ============================================================
+
+    def generate(self, report_type: str = 'daily', date_from: Optional[DateLike] = None,
+                 date_to: Optional[DateLike] = None, today: Optional[DateLike] = None) -> Dict:
+        """Build a report for report_type (date_from/date_to are used by 'custom')"""
+        today = to_date(today) if today is not None else date.today()
+        start, end = report_range(report_type, today, date_from, date_to)
+        days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+        by_month = report_type == 'yearly' or (report_type == 'custom' and len(days) > CUSTOM_DAILY_LIMIT)
+
+        # One read snapshot for the whole report (safe from worker threads)
+        with self._lock, self.db.reader() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            rollup = self._rollup(conn, start, end)
+            details = self._day_details(conn, days, today, rollup)
+            categories = dict(conn.execute(
+                "SELECT p.id, c.name FROM products p JOIN categories c ON c.id = p.category_id"
+            ).fetchall())
+
+        periods: Dict[str, List] = {}
+        methods: Dict[str, List] = {}
+        products: Dict[int, List] = {}
+        hours = [[0, 0.0] for _ in range(24)]
+        receipts, sales, tax = 0, 0.0, 0.0
+
+        for day in days:
+            key = day.isoformat()
+            period = periods.setdefault(key[:7] if by_month else key, [0, 0.0, 0.0])
+            for method, (count, gross, day_tax) in rollup.get(key, {}).items():
+                period[0] += count
+                period[1] += gross
+                period[2] += day_tax
+                totals = methods.setdefault(method, [0, 0.0])
+                totals[0] += count
+                totals[1] += gross
+                receipts += count
+                sales += gross
+                tax += day_tax
+
+            detail = details[key]
+            for product_id, (name, qty, total) in detail['products'].items():
+                row = products.get(product_id)
+                if row is None:
+                    products[product_id] = [name, qty, total]
+                else:
+                    row[1] += qty
+                    row[2] += total
+            for hour, (count, total) in detail['hours'].items():
+                hours[hour][0] += count
+                hours[hour][1] += total
+
+        by_category: Dict[str, List] = {}
+        for product_id, (name, qty, total) in products.items():
+            row = by_category.setdefault(categories.get(product_id, UNCATEGORIZED), [0, 0.0])
+            row[0] += qty
+            row[1] += total
+
+        return {
+            'type': report_type,
+            'date_from': start.isoformat(),
+            'date_to': end.isoformat(),
+            'receipts': receipts,
+            'sales': sales,
+            'tax': tax,
+            'by_period': [
+                {'period': key, 'receipts': count, 'sales': gross, 'tax': period_tax}
+                for key, (count, gross, period_tax) in periods.items()
+            ],
+            'by_category': sorted((
+                {'category': category, 'qty': qty, 'sales': total}
+                for category, (qty, total) in by_category.items()
+            ), key=lambda row: -row['sales']),
+            'by_product': sorted((
+                {'product_id': product_id, 'name': name, 'category': categories.get(product_id, UNCATEGORIZED),
+                 'qty': qty, 'sales': total}
+                for product_id, (name, qty, total) in products.items()
+            ), key=lambda row: -row['sales']),
+            'by_hour': [
+                {'hour': hour, 'receipts': count, 'sales': total}
+                for hour, (count, total) in enumerate(hours)
+            ],
+            'by_payment_method': sorted((
+                {'payment_method': method, 'receipts': count, 'sales': gross}
+                for method, (count, gross) in methods.items()
+            ), key=lambda row: -row['sales']),
+        }
+
+    def invalidate(self):
+        """Drop cached days (e.g. after products or receipts were rewritten)"""
+        self._days.clear()
+
+    # ============================================================
+    # AGGREGATION
+    # ============================================================
+
+    def _rollup(self, conn, start: date, end: date) -> Dict[str, Dict[str, Tuple[int, float, float]]]:
+        """Receipts, gross and tax per day and payment method from daily_sales"""
+        rollup: Dict[str, Dict[str, Tuple[int, float, float]]] = {}
+        for row in conn.execute("""
+            SELECT day, payment_method, receipts, gross, tax
+            FROM daily_sales
+            WHERE day >= ? AND day <= ? AND receipts > 0
+        """, (start.isoformat(), end.isoformat())):
+            rollup.setdefault(row[0], {})[row[1]] = (row[2], row[3], row[4])
+        return rollup
+
+    def _day_details(self, conn, days: List[date], today: date, rollup: Dict) -> Dict[str, Dict]:
+        """Product and hour totals for each day, recomputing only open or changed days"""
+        details: Dict[str, Dict] = {}
+        stale: List[date] = []
+
+        for day in days:
+            key = day.isoformat()
+            methods = rollup.get(key, {})
+            # daily_sales moves with every receipt insert/update/delete, so a
+            # cached day is reused only while its rollup still matches
+            fingerprint = (sum(m[0] for m in methods.values()), round(sum(m[1] for m in methods.values()), 2))
+            cached = self._days.get(key)
+            if day < today and cached is not None and cached['key'] == fingerprint:
+                details[key] = cached
+            else:
+                details[key] = {'key': fingerprint, 'products': {}, 'hours': {}}
+                stale.append(day)
+
+        for start, end in self._runs(stale):
+            self._aggregate(conn, start, end, details)
+
+        for day in stale:
+            if day < today:
+                key = day.isoformat()
+                self._days[key] = details[key]
+        return details
+
+    @staticmethod
+    def _runs(days: Iterable[date]) -> List[Tuple[date, date]]:
+        """Group sorted days into consecutive (first, last) runs"""
+        runs: List[List[date]] = []
+        for day in days:
+            if runs and day - runs[-1][1] == timedelta(days=1):
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return [(first, last) for first, last in runs]
+
+    def _aggregate(self, conn, start: date, end: date, details: Dict[str, Dict]):
+        """Fill product and hour totals for days start..end (inclusive)"""
+        day = start
+        while day <= end:
+            # One query per day keeps each GROUP BY sort small (a year in one
+            # query spends most of its time sorting millions of line items)
+            products = details[day.isoformat()]['products']
+            for product_id, name, qty, total in conn.execute("""
+                SELECT ri.product_id, MAX(ri.product_name), SUM(ri.qty), SUM(ri.total)
+                FROM receipts r
+                JOIN receipt_items ri ON ri.receipt_id = r.id
+                WHERE r.date_ts >= ? AND r.date_ts < ?
+                GROUP BY ri.product_id
+            """, (to_timestamp(day), to_timestamp(day) + DAY_SECONDS)):
+                products[product_id] = (name, qty, total)
+            day += timedelta(days=1)
+
+        for day_no, hour, count, total in conn.execute("""
+            SELECT date_ts / 86400, date_ts % 86400 / 3600, COUNT(*), SUM(total)
+            FROM receipts
+            WHERE date_ts >= ? AND date_ts < ?
+            GROUP BY 1, 2
+        """, (to_timestamp(start), to_timestamp(end + timedelta(days=1)))):
+            details[self._day_key(day_no)]['hours'][hour] = (count, total)
+
+    @staticmethod
+    def _day_key(day_no: int) -> str:
+        """'YYYY-MM-DD' of a date_ts day number"""
+        return (EPOCH + timedelta(days=day_no)).isoformat()
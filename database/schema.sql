@@ -1,14 +1,23 @@
 -- POS System Database Schema
 -- SQLite Database
 
+-- Categories Table (products refer to it by id, so a rename is one row)
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    emoji TEXT,  -- shown on category tabs and cards (NULL: default 🏷️)
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Products Table
 CREATE TABLE IF NOT EXISTS products (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL,
     price REAL NOT NULL,
-    category TEXT NOT NULL,
+    category_id INTEGER NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (category_id) REFERENCES categories(id)
 );
 
 -- Receipts/Transactions Table
@@ -18,6 +27,10 @@ CREATE TABLE IF NOT EXISTS receipts (
     total REAL NOT NULL,
     cash_received REAL NOT NULL,
     change REAL NOT NULL,
+    receipt_no TEXT,  -- number shown at checkout (unique, see migrations.py)
+    payment_method TEXT NOT NULL DEFAULT 'Cash',
+    date_ts INTEGER,  -- 'date' as seconds since 1970-01-01 (wall clock, no time zone)
+    items_count INTEGER NOT NULL DEFAULT 0,  -- number of receipt_items, set when saved
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -34,8 +47,36 @@ CREATE TABLE IF NOT EXISTS receipt_items (
     FOREIGN KEY (product_id) REFERENCES products(id)
 );
 
--- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_products_category ON products(category);
+-- Daily Sales Rollup (one row per day and payment method, kept up to date
+-- by triggers on receipts, see migrations.py)
+CREATE TABLE IF NOT EXISTS daily_sales (
+    day TEXT NOT NULL,              -- YYYY-MM-DD
+    payment_method TEXT NOT NULL,
+    receipts INTEGER NOT NULL DEFAULT 0,
+    gross REAL NOT NULL DEFAULT 0,
+    tax REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, payment_method)
+);
+
+-- Units sold per product and hour (hour = date_ts / 3600), kept up to date
+-- by triggers on receipt_items (see migrations.py)
+CREATE TABLE IF NOT EXISTS product_sales_hourly (
+    product_id INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    qty INTEGER NOT NULL DEFAULT 0,
+    sales REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, product_id)
+) WITHOUT ROWID;
+
+-- Catalog version (single row), bumped by triggers on every product and category change;
+-- a catalog snapshot file is only used while its version matches (see snapshot.py)
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0);
+
+-- Create indexes for better performance (idx_products_category_id: see migrations.py)
 CREATE INDEX IF NOT EXISTS idx_receipts_date ON receipts(date);
 CREATE INDEX IF NOT EXISTS idx_receipt_items_receipt_id ON receipt_items(receipt_id);
 CREATE INDEX IF NOT EXISTS idx_receipt_items_product_id ON receipt_items(product_id);
@@ -47,3 +88,69 @@ FOR EACH ROW
 BEGIN
     UPDATE products SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
 END;
+
+-- Full-text search over product names (trigram tokens match any substring,
+-- which also works for Thai names that have no spaces between words)
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    name,
+    content='products',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+-- Triggers to keep 'products_fts' in sync with products
+CREATE TRIGGER IF NOT EXISTS products_fts_insert
+AFTER INSERT ON products
+BEGIN
+    INSERT INTO products_fts(rowid, name) VALUES (NEW.id, NEW.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_fts_delete
+AFTER DELETE ON products
+BEGIN
+    INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_fts_update
+AFTER UPDATE OF name ON products
+BEGIN
+    INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+    INSERT INTO products_fts(rowid, name) VALUES (NEW.id, NEW.name);
+END;
+
+-- Triggers to bump 'catalog_version' on product and category changes
+CREATE TRIGGER IF NOT EXISTS catalog_version_insert
+AFTER INSERT ON products
+BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_version_delete
+AFTER DELETE ON products
+BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_version_update
+AFTER UPDATE OF id, name, price, category_id ON products
+BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_version_category_insert
+AFTER INSERT ON categories
+BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_version_category_delete
+AFTER DELETE ON categories
+BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_version_category_update
+AFTER UPDATE OF id, name, emoji ON categories
+BEGIN
+    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+END;
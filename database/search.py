@@ -0,0 +1,146 @@
+"""
+Product Search Index for POS System
+N-gram index over normalized product names, kept in sync with the catalog
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+from .records import ProductRecord
+
+
+# Thai tone marks, mai taikhu and thanthakhat
+_THAI_MARKS = re.compile("[\u0e47-\u0e4c]")
+
+# Longest n-gram stored in the index
+GRAM_SIZE = 3
+
+
+def normalize(text: str) -> str:
+    """Case-fold, drop Latin accents and Thai tone marks"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch) or "\u0e00" <= ch <= "\u0e7f")
+    return _THAI_MARKS.sub("", text)
+
+
+class ProductSearchIndex:
+    """Substring search over product names using 1..3-gram posting sets"""
+
+    def __init__(self, catalog=None):
+        """Build index from catalog (and follow its changes)"""
+        self._names: Dict[int, str] = {}            # product id -> normalized name
+        self._products: Dict[int, ProductRecord] = {}
+        self._rank: Dict[int, int] = {}             # product id -> catalog position
+        self._grams: Dict[str, Set[int]] = {}
+        self._last_query: Optional[str] = None
+        self._last_ids: List[int] = []
+
+        self.catalog = catalog
+        if catalog is not None:
+            self.build(catalog.all())
+            catalog.subscribe(self.on_catalog_change)
+
+    # ============================================================
+    # BUILDING
+    # ============================================================
+
+    def build(self, products):
+        """Index products (replaces current contents)"""
+        self._names.clear()
+        self._products.clear()
+        self._grams.clear()
+        for product in products:
+            self._add(product)
+        self._rerank(products)
+
+    def on_catalog_change(self, change):
+        """Keep the index coherent with catalog changes"""
+        if change.kind == 'reloaded':
+            self.build(self.catalog.all())
+            return
+
+        self._remove(change.product['id'])
+        if change.kind != 'removed':
+            self._add(change.product)
+        self._rerank(self.catalog.all())
+
+    def _add(self, product):
+        product_id = product['id']
+        name = normalize(product['name'])
+        self._names[product_id] = name
+        self._products[product_id] = product
+        for gram in self._grams_of(name):
+            self._grams.setdefault(gram, set()).add(product_id)
+
+    def _remove(self, product_id: int):
+        name = self._names.pop(product_id, None)
+        self._products.pop(product_id, None)
+        if name is None:
+            return
+        for gram in self._grams_of(name):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                ids.discard(product_id)
+                if not ids:
+                    del self._grams[gram]
+
+    def _rerank(self, products):
+        self._rank = {product['id']: i for i, product in enumerate(products)}
+        self._last_query = None
+        self._last_ids = []
+
+    @staticmethod
+    def _grams_of(name: str) -> Set[str]:
+        grams = set()
+        for n in range(1, GRAM_SIZE + 1):
+            for i in range(len(name) - n + 1):
+                grams.add(name[i:i + n])
+        return grams
+
+    # ============================================================
+    # SEARCH
+    # ============================================================
+
+    def search(self, query: str) -> List[ProductRecord]:
+        """Products whose name contains query, in catalog order"""
+        q = normalize(query.strip())
+        if not q:
+            return []
+
+        if self._last_query is not None and q.startswith(self._last_query):
+            # Typing forward only narrows the previous result
+            candidates = self._last_ids
+        else:
+            candidates = self._candidates(q)
+
+        names = self._names
+        if len(q) <= GRAM_SIZE and candidates is not self._last_ids:
+            # Posting set of the whole query is already exact
+            ids = candidates
+        else:
+            ids = [pid for pid in candidates if q in names[pid]]
+
+        ids = sorted(ids, key=self._rank.__getitem__)
+        self._last_query = q
+        self._last_ids = ids
+        return [self._products[pid] for pid in ids]
+
+    def _candidates(self, q: str):
+        """Intersect posting sets of the query's n-grams"""
+        if len(q) <= GRAM_SIZE:
+            return self._grams.get(q, set())
+
+        postings = []
+        for i in range(len(q) - GRAM_SIZE + 1):
+            ids = self._grams.get(q[i:i + GRAM_SIZE])
+            if not ids:
+                return set()
+            postings.append(ids)
+
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
@@ -11,6 +11,8 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from database.migrations import import_category_emojis, migrate
+
 DB_PATH = os.path.join("database", "pos.db")
 PRODUCTS_JSON = os.path.join("data", "products.json")
 RECEIPTS_JSON = os.path.join("data", "receipts.json")
@@ -28,17 +30,11 @@ def create_database():
 
     # Connect to database (creates file if doesn't exist)
     conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # Read and execute schema
-    print(f"\n[OK] Reading schema from: {SCHEMA_SQL}")
-    with open(SCHEMA_SQL, 'r', encoding='utf-8') as f:
-        schema = f.read()
 
-    # Execute schema using executescript (handles triggers and multiple statements)
-    cursor.executescript(schema)
-
-    conn.commit()
+    # Create or upgrade schema (applies schema.sql, records the version)
+    print(f"\n[OK] Applying schema from: {SCHEMA_SQL}")
+    version = migrate(conn)
+    print(f"[OK] Schema version: {version}")
     print("[OK] Database schema created successfully")
 
     return conn
@@ -66,12 +62,18 @@ def seed_products(conn):
     cursor.execute("DELETE FROM products")
     print("[OK] Cleared existing products")
 
-    # Insert products
+    # Insert categories, then products referring to them
+    cursor.executemany(
+        "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+        [(product['category'],) for product in products]
+    )
+    import_category_emojis(conn)
+
     inserted = 0
     for product in products:
         cursor.execute("""
-            INSERT INTO products (name, price, category)
-            VALUES (?, ?, ?)
+            INSERT INTO products (name, price, category_id)
+            SELECT ?, ?, id FROM categories WHERE name = ?
         """, (product['name'], product['price'], product['category']))
         inserted += 1
 
@@ -118,13 +120,14 @@ def seed_receipts(conn):
     for receipt in receipts:
         # Insert receipt
         cursor.execute("""
-            INSERT INTO receipts (date, total, cash_received, change)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO receipts (date, total, cash_received, change, items_count)
+            VALUES (?, ?, ?, ?, ?)
         """, (
             receipt['date'],
             receipt['total'],
             receipt.get('cash_received', receipt['total']),
-            receipt.get('change', 0)
+            receipt.get('change', 0),
+            len(receipt['items'])
         ))
 
         receipt_id = cursor.lastrowid
@@ -185,9 +188,10 @@ def show_statistics(conn):
 
     # Products by category
     cursor.execute("""
-        SELECT category, COUNT(*) as count
-        FROM products
-        GROUP BY category
+        SELECT c.name, COUNT(p.id) as count
+        FROM categories c
+        LEFT JOIN products p ON p.category_id = c.id
+        GROUP BY c.id
         ORDER BY count DESC
     """)
     categories = cursor.fetchall()
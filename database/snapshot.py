@@ -0,0 +1,85 @@
+"""
+Catalog Snapshot for POS System
+Products in a compact binary file, read at startup instead of querying SQLite
+
+Layout (little endian):
+    header    magic, catalog version, product count, category count, string bytes
+    columns   category ids, product ids, prices, category indexes (one array each)
+    strings   category names, category emojis ("" for none), then product names
+              (UTF-8, each ending in NUL)
+"""
+import mmap
+import os
+import struct
+from typing import List, Optional, Tuple
+
+from .records import CategoryRecord, ProductRecord
+
+
+MAGIC = b"POSCAT03"
+HEADER = struct.Struct("<8sqIII")
+TERMINATOR = "\0"
+
+
+def snapshot_path(db_path: str) -> str:
+    """Snapshot file kept next to the database"""
+    return os.path.splitext(db_path)[0] + "_catalog.snap"
+
+
+def save_snapshot(path: str, version: int, categories: List[CategoryRecord], products: List[ProductRecord]):
+    """Write categories and products as the snapshot of catalog version"""
+    category_index = {category['name']: i for i, category in enumerate(categories)}
+    texts = ([category['name'] for category in categories] +
+             [category['emoji'] or "" for category in categories] +
+             [product['name'] for product in products])
+    if any(TERMINATOR in text for text in texts):
+        raise ValueError("product or category name contains NUL")
+    strings = "".join(text + TERMINATOR for text in texts).encode("utf-8")
+
+    count = len(products)
+    data = b"".join([
+        HEADER.pack(MAGIC, version, count, len(categories), len(strings)),
+        struct.pack(f"<{len(categories)}q", *(category['id'] for category in categories)),
+        struct.pack(f"<{count}q", *(product['id'] for product in products)),
+        struct.pack(f"<{count}d", *(product['price'] for product in products)),
+        struct.pack(f"<{count}H", *(category_index[product['category']] for product in products)),
+        strings,
+    ])
+
+    # Written under a temporary name so a crash never leaves half a snapshot
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def load_snapshot(path: str, version: int) -> Optional[Tuple[List[CategoryRecord], List[ProductRecord]]]:
+    """(categories, products) of the snapshot, None when it is missing, damaged or not of version"""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            magic, snapshot_version, count, category_count, size = HEADER.unpack_from(buf, 0)
+            if magic != MAGIC or snapshot_version != version:
+                return None
+
+            offset = HEADER.size
+            category_ids = struct.unpack_from(f"<{category_count}q", buf, offset)
+            offset += 8 * category_count
+            ids = struct.unpack_from(f"<{count}q", buf, offset)
+            offset += 8 * count
+            prices = struct.unpack_from(f"<{count}d", buf, offset)
+            offset += 8 * count
+            indexes = struct.unpack_from(f"<{count}H", buf, offset)
+            offset += 2 * count
+            if len(buf) != offset + size:
+                return None
+            strings = buf[offset:].decode("utf-8").split(TERMINATOR)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        return None
+
+    # Category names and emojis first, then one name per product (and "" after the last NUL)
+    if len(strings) != 2 * category_count + count + 1 or (indexes and max(indexes) >= category_count):
+        return None
+    names = strings[:category_count]
+    emojis = [emoji or None for emoji in strings[category_count:2 * category_count]]
+    categories = list(map(CategoryRecord, category_ids, names, emojis))
+    products = list(map(ProductRecord, ids, strings[2 * category_count:-1], prices, map(names.__getitem__, indexes)))
+    return categories, products
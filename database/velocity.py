@@ -0,0 +1,191 @@
+"""
+Product Velocity for POS System
+Rolling units-sold counters per product (last hour, today, 7 and 30 days)
+"""
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from .db_manager import DateLike, to_timestamp
+
+
+# Window name -> length in hours ('today' starts at midnight instead)
+WINDOWS = {'hour': 1, 'today': 24, '7d': 7 * 24, '30d': 30 * 24}
+
+
+class ProductVelocity:
+    """Units sold per product in rolling windows, updated in O(1) per sold line
+
+    Sales are kept in hour buckets. Each window keeps running totals and
+    the first hour it still counts; when the clock moves on, buckets that
+    fall out of a window are subtracted once, so reading and recording
+    never scan history.
+    """
+
+    def __init__(self, db=None, now: Optional[DateLike] = None, up_to_receipt: Optional[int] = None):
+        """Create counters (loaded from db's hourly product sales when given)"""
+        self.db = db
+        self._lock = threading.Lock()                  # record() vs merge() from another thread
+        self._buckets: Dict[int, Dict[int, int]] = {}  # hour -> product id -> qty
+        self._totals: Dict[str, Dict[int, int]] = {window: {} for window in WINDOWS}
+        self._edges: Dict[str, int] = {}               # window -> first hour counted
+        self._hour = 0
+
+        if db is not None:
+            self.load(now, up_to_receipt)
+        else:
+            self._reset(self._to_hour(now))
+
+    # ============================================================
+    # LOADING
+    # ============================================================
+
+    def load(self, now: Optional[DateLike] = None, up_to_receipt: Optional[int] = None):
+        """Rebuild counters from the last 30 days of product_sales_hourly
+
+        With up_to_receipt, sales of later receipts are left out (they were
+        recorded in memory while loading and are added with merge()).
+        """
+        hour = self._to_hour(now)
+        self._reset(hour)
+        sql = """
+            SELECT hour, product_id, qty
+            FROM product_sales_hourly
+            WHERE hour >= ?1 AND hour <= ?2 AND qty > 0
+        """
+        if up_to_receipt is not None:
+            # Same statement, so both parts read the same snapshot
+            sql += """
+                UNION ALL
+                SELECT r.date_ts / 3600, ri.product_id, -ri.qty
+                FROM receipts r
+                JOIN receipt_items ri ON ri.receipt_id = r.id
+                WHERE r.id > ?3 AND r.date_ts / 3600 >= ?1 AND r.date_ts / 3600 <= ?2
+            """
+        with self.db.reader() as conn:
+            params = (self._edges['30d'], hour) if up_to_receipt is None else (self._edges['30d'], hour, up_to_receipt)
+            for bucket_hour, product_id, qty in conn.execute(sql, params):
+                bucket = self._buckets.setdefault(bucket_hour, {})
+                bucket[product_id] = bucket.get(product_id, 0) + qty
+        for bucket in self._buckets.values():
+            for product_id in [p for p, qty in bucket.items() if qty <= 0]:
+                del bucket[product_id]
+
+        # Window totals from the buckets they cover
+        for window, totals in self._totals.items():
+            edge = self._edges[window]
+            for bucket_hour, bucket in self._buckets.items():
+                if bucket_hour >= edge:
+                    for product_id, qty in bucket.items():
+                        totals[product_id] = totals.get(product_id, 0) + qty
+
+    # ============================================================
+    # UPDATES
+    # ============================================================
+
+    def record(self, items: Iterable[Dict], when: Optional[DateLike] = None):
+        """Count sold items (dicts with 'id' and 'qty', e.g. the cart)"""
+        hour = self._to_hour(when)
+        with self._lock:
+            self._advance(hour)
+            for item in items:
+                self._add(hour, item['id'], item['qty'])
+
+    def advance(self, now: Optional[DateLike] = None):
+        """Move the clock to now, dropping sales that left each window"""
+        with self._lock:
+            self._advance(self._to_hour(now))
+
+    def merge(self, other: "ProductVelocity"):
+        """Add the sales counted by other (e.g. history loaded after checkout started)"""
+        with self._lock:
+            hour = max(self._hour, other._hour)
+            self._advance(hour)
+            other._advance(hour)
+            for bucket_hour, bucket in other._buckets.items():
+                for product_id, qty in bucket.items():
+                    self._add(bucket_hour, product_id, qty)
+
+    def _advance(self, hour: int):
+        """Move the clock to hour"""
+        if hour <= self._hour:
+            return
+        self._hour = hour
+
+        for window in WINDOWS:
+            edge = self._edge(window, hour)
+            old_edge = self._edges[window]
+            if edge <= old_edge:
+                continue
+
+            # Long idle gaps: visit stored buckets rather than every hour
+            if edge - old_edge > len(self._buckets):
+                expired = [h for h in self._buckets if old_edge <= h < edge]
+            else:
+                expired = range(old_edge, edge)
+            totals = self._totals[window]
+            for expired_hour in expired:
+                for product_id, qty in self._buckets.get(expired_hour, {}).items():
+                    left = totals.get(product_id, 0) - qty
+                    if left > 0:
+                        totals[product_id] = left
+                    else:
+                        totals.pop(product_id, None)
+            self._edges[window] = edge
+
+        for old_hour in [h for h in self._buckets if h < self._edges['30d']]:
+            del self._buckets[old_hour]
+
+    # ============================================================
+    # QUERIES (as of the last advance() / record())
+    # ============================================================
+
+    def get(self, product_id: int, window: str = '7d') -> int:
+        """Units of product_id sold in window"""
+        return self._totals[window].get(product_id, 0)
+
+    def counts(self, product_id: int) -> Dict[str, int]:
+        """Units of product_id sold in every window"""
+        return {window: totals.get(product_id, 0) for window, totals in self._totals.items()}
+
+    def top(self, window: str = '7d', limit: int = 10) -> List[int]:
+        """Ids of the best sellers in window"""
+        totals = self._totals[window]
+        return sorted(totals, key=totals.get, reverse=True)[:limit]
+
+    def ordered(self, products: Iterable[Dict], window: str = '7d') -> List[Dict]:
+        """Products ordered by units sold in window (ties keep their order)"""
+        totals = self._totals[window]
+        return sorted(products, key=lambda product: -totals.get(product['id'], 0))
+
+    # ============================================================
+    # HELPERS
+    # ============================================================
+
+    def _reset(self, hour: int):
+        """Empty counters with the clock at hour"""
+        self._buckets.clear()
+        for totals in self._totals.values():
+            totals.clear()
+        self._hour = hour
+        self._edges = {window: self._edge(window, hour) for window in WINDOWS}
+
+    def _add(self, hour: int, product_id: int, qty: int):
+        """Add qty to the hour bucket and every window still counting that hour"""
+        bucket = self._buckets.setdefault(hour, {})
+        bucket[product_id] = bucket.get(product_id, 0) + qty
+        for window, totals in self._totals.items():
+            if hour >= self._edges[window]:
+                totals[product_id] = totals.get(product_id, 0) + qty
+
+    @staticmethod
+    def _edge(window: str, hour: int) -> int:
+        """First hour counted by window at hour"""
+        if window == 'today':
+            return hour - hour % 24
+        return hour - WINDOWS[window] + 1
+
+    @staticmethod
+    def _to_hour(value: Optional[DateLike]) -> int:
+        """Hour number (date_ts / 3600) of value, now when None"""
+        return to_timestamp(value if value is not None else datetime.now()) // 3600
@@ -8,6 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from database import DatabaseManager
+from database.emoji_lookup import product_emojis
 
 
 class POSFletApp:
@@ -66,21 +67,7 @@ class POSFletApp:
 
     def get_product_emoji(self, product):
         """Get emoji for product"""
-        name = product['name'].lower()
-        category = product.get('category', '').lower()
-
-        emoji_map = {
-            'coffee': '☕', 'tea': '🍵', 'latte': '☕', 'juice': '🧃',
-            'sandwich': '🥪', 'croissant': '🥐', 'salad': '🥗', 'burger': '🍔',
-            'pizza': '🍕', 'pasta': '🍝', 'rice': '🍚', 'wings': '🍗',
-            'cake': '🍰', 'ice cream': '🍦', 'brownie': '🧁'
-        }
-
-        for keyword, emoji in emoji_map.items():
-            if keyword in name:
-                return emoji
-
-        return '🍽️'
+        return product_emojis.get(product)
 
     def build_ui(self):
         """Build the main UI"""
@@ -6,21 +6,16 @@ Main application file using modular views
 import flet as ft
 from datetime import datetime
 import sys
+import threading
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from database import DatabaseManager
-from src.views_flet import (
-    POSView,
-    HistoryView,
-    MenuView,
-    CategoryView,
-    UsersView,
-    SettingsView,
-    TablesView
-)
+from database import (DatabaseManager, Cart, ProductCatalog, ProductSearchIndex, ReceiptWriter, ReportEngine,
+                      ProductVelocity, snapshot_path)
+from database.emoji_lookup import product_emojis
+from src.views_flet import VIEW_REGISTRY, load_view
 
 
 class ChiliPOSApp:
@@ -39,13 +34,19 @@ class ChiliPOSApp:
             use_material3=True
         )
 
-        # Initialize database
-        self.db = DatabaseManager()
+        # Database, catalog and counters are loaded in the background
+        # (load_data) while the shell and a splash are already on screen
+        self.db = None
+        self.receipt_writer = None
+        self.reports = None
+        self.velocity = None
+        self.catalog = None
+        self.search_index = None
 
         # App state
-        self.cart = []
-        self.products = self.load_products()
-        self.categories = self.load_categories()
+        self.cart = Cart()
+        self.products = []
+        self.categories = []
         self.active_category = "All"
         self.payment_method = "Cash"
         self.total = 0.0
@@ -55,33 +56,135 @@ class ChiliPOSApp:
         # Current view
         self.current_view = "pos"
 
-        # Views container
-        self.views_container = ft.Container(expand=True)
+        # Views container (splash until the data is loaded)
+        self.splash_text = ft.Text("กำลังโหลดเมนู...", size=16, color=ft.Colors.GREY_600)
+        self.views_container = ft.Container(
+            content=ft.Column(
+                [ft.ProgressRing(color=ft.Colors.GREEN_700), self.splash_text],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=20
+            ),
+            alignment=ft.alignment.center,
+            expand=True
+        )
 
         # Navigation buttons references
         self.nav_buttons = {}
 
-        # Cache view instances
+        # Cache view instances and their built control trees
         self.view_instances = {}
+        self.view_trees = {}
+        self.view_lock = threading.RLock()
+
+        # Data changes ('products', 'categories', 'receipts') each hidden view has not seen yet
+        self.pending_changes = {}
+
+        # Set once the data is loaded and the POS view can be used
+        self.loading = True
+        self.ready = threading.Event()
 
         # Build UI
         self.build_ui()
 
+        self.loader = threading.Thread(target=self.load_data, daemon=True)
+        self.loader.start()
+
+    def load_data(self):
+        """Open the database and load the catalog, then show the current view"""
+        try:
+            # Initialize database
+            self.db = DatabaseManager()
+
+            # Receipts are written in the background (journal replayed on startup)
+            self.receipt_writer = ReceiptWriter(self.db.db_path, profile=self.db.profile,
+                                                on_failed=self.on_receipt_failed)
+            self.receipt_writer.start()
+
+            # Sales reports (closed days cached in memory)
+            self.reports = ReportEngine(self.db)
+
+            # Units sold per product: checkout records into it from the start,
+            # the sales history up to this receipt is merged in below
+            self.velocity = ProductVelocity()
+            last_receipt = self.db.get_last_receipt_id()
+
+            # Product catalog (indexed in memory, shared by all views), read from
+            # its binary snapshot unless products changed since it was written
+            self.catalog = ProductCatalog(self.db, snapshot_path=snapshot_path(self.db.db_path))
+            self.products = self.load_products()
+            self.categories = self.load_categories()
+            self.catalog.subscribe(self.on_catalog_change)
+            self.search_index = ProductSearchIndex(self.catalog)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            self.splash_text.value = f"❌ โหลดข้อมูลไม่สำเร็จ: {e}"
+            self.page.update()
+            return
+
+        with self.view_lock:
+            self.loading = False
+            self.switch_view(self.current_view)
+        self.ready.set()
+
+        # Units sold per product (last hour/today/7d/30d), orders the POS grid;
+        # read after the first frame since a busy month of sales takes a while
+        self.velocity.merge(ProductVelocity(self.db, up_to_receipt=last_receipt))
+
     def load_products(self):
         """Load products from database"""
         try:
-            return self.db.get_all_products()
+            self.catalog.load()
+            products = self.catalog.all()
+            # Resolve product emojis once instead of on every render
+            product_emojis.build(products)
+            return products
         except Exception as e:
             print(f"Error loading products: {e}")
             return []
 
     def load_categories(self):
-        """Load categories from database"""
-        try:
-            return self.db.get_all_categories()
-        except Exception as e:
-            print(f"Error loading categories: {e}")
-            return []
+        """Load categories from catalog"""
+        return self.catalog.categories()
+
+    def on_catalog_change(self, change):
+        """Keep products, categories and emojis in sync with the catalog"""
+        categories = self.categories
+        self.products = self.catalog.all()
+        self.categories = self.catalog.categories()
+
+        if change.kind == 'reloaded':
+            product_emojis.build(self.products)
+        else:
+            product_emojis.invalidate(change.product.id)
+
+        if change.kind == 'reloaded' or self.categories != categories:
+            self.notify_change('products', 'categories')
+        else:
+            self.notify_change('products')
+
+    def on_receipt_failed(self, receipt, error):
+        """Warn that a paid receipt could not be saved (called from the writer thread)"""
+        self.notify_change('receipts')
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Text(
+                f"⚠️ บันทึกใบเสร็จ #{receipt['receipt_no']} ไม่สำเร็จ: {error} "
+                f"(ค้างอยู่ {self.receipt_writer.failed} ใบ ดูได้ที่หน้าประวัติการขาย)"
+            ),
+            bgcolor=ft.Colors.RED_700,
+            duration=10000
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
+
+    def notify_change(self, *changes):
+        """Queue data changes for the hidden views (refreshed when shown next)
+
+        The visible view updates itself after its own edits.
+        """
+        for view_id, pending in self.pending_changes.items():
+            if view_id != self.current_view:
+                pending.update(changes)
 
     def build_ui(self):
         """Build the main UI"""
@@ -110,8 +213,7 @@ class ChiliPOSApp:
             )
         )
 
-        # Load initial view (POS)
-        self.switch_view("pos")
+        # POS view is shown once the catalog is loaded (load_data)
 
     def build_sidebar(self):
         """Build sidebar navigation"""
@@ -217,6 +319,11 @@ class ChiliPOSApp:
 
     def switch_view(self, view_id):
         """Switch between views"""
+        with self.view_lock:
+            self._switch_view(view_id)
+
+    def _switch_view(self, view_id):
+        """Switch between views (caller holds view_lock)"""
         self.current_view = view_id
 
         # Update navigation button styles
@@ -240,26 +347,25 @@ class ChiliPOSApp:
             else:
                 btn.bgcolor = ft.Colors.TRANSPARENT
 
+        if self.loading:
+            # Keep the splash; load_data shows the current view when done
+            self.page.update()
+            return
+
         # Load view
-        view_map = {
-            "pos": POSView,
-            "history": HistoryView,
-            "menu": MenuView,
-            "category": CategoryView,
-            "tables": TablesView,
-            "users": UsersView,
-            "settings": SettingsView
-        }
-
-        if view_id in view_map:
-            # Check if view instance already exists in cache
-            if view_id not in self.view_instances:
-                view_class = view_map[view_id]
-                self.view_instances[view_id] = view_class(self)
-
-            # Get cached view instance
-            view_instance = self.view_instances[view_id]
-            self.views_container.content = view_instance.create()
+        if view_id in VIEW_REGISTRY:
+            view_instance = self.view_instances.get(view_id)
+            if view_instance is None:
+                # First visit: import the view module and build the control tree once
+                view_instance = self.view_instances[view_id] = load_view(view_id)(self)
+                self.view_trees[view_id] = view_instance.create()
+                self.pending_changes[view_id] = set()
+            elif self.pending_changes[view_id]:
+                # Apply only what changed while the view was hidden
+                changes, self.pending_changes[view_id] = self.pending_changes[view_id], set()
+                view_instance.refresh(changes)
+
+            self.views_container.content = self.view_trees[view_id]
             self.page.update()
 
 
@@ -11,7 +11,7 @@ from pathlib import Path
 # Add parent directory to path for database import
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import DatabaseManager
+from database import DatabaseManager, Cart
 from views import POSView, HistoryView, MenuView, CategoryView, UsersView, SettingsView
 
 class POSApp:
@@ -24,7 +24,7 @@ class POSApp:
         self.db = DatabaseManager()
 
         # Data storage
-        self.cart = []
+        self.cart = Cart()
         self.products = self.load_products()
         self.categories = self.load_categories()
         self.total = 0.0
@@ -5,6 +5,37 @@ from ttkbootstrap.dialogs import Messagebox
 from datetime import datetime
 import os
 
+from database.emoji_lookup import EmojiLookup
+
+# Specific product emojis (checked against the product name)
+PRODUCT_EMOJIS = {
+    'coffee': '☕', 'tea': '🍵', 'latte': '☕', 'cappuccino': '☕',
+    'espresso': '☕', 'juice': '🧃', 'smoothie': '🥤', 'chocolate': '🍫',
+    'water': '💧', 'soda': '🥤', 'lemonade': '🍋', 'energy': '⚡',
+    'sandwich': '🥪', 'croissant': '🥐', 'salad': '🥗', 'burger': '🍔',
+    'pizza': '🍕', 'pasta': '🍝', 'spaghetti': '🍝', 'rice': '🍚',
+    'thai': '🍜', 'wings': '🍗', 'chicken': '🍗', 'fries': '🍟',
+    'onion': '🧅', 'steak': '🥩', 'fish': '🐟', 'taco': '🌮',
+    'burrito': '🌯', 'quesadilla': '🫔', 'cake': '🍰', 'cheesecake': '🍰',
+    'ice cream': '🍦', 'brownie': '🧁', 'tiramisu': '🍰', 'pie': '🥧',
+    'donut': '🍩', 'muffin': '🧁', 'chips': '🍟', 'cookie': '🍪',
+    'pretzels': '🥨', 'popcorn': '🍿', 'nachos': '🌮', 'granola': '🥜',
+    'candy': '🍬', 'trail': '🥜', 'protein': '🍫', 'yogurt': '🥛',
+    'milk': '🥛', 'cheese': '🧀', 'butter': '🧈'
+}
+
+# Category-based fallback
+CATEGORY_EMOJIS = {
+    'beverages': '🥤',
+    'food': '🍽️',
+    'desserts': '🍰',
+    'snacks': '🍿',
+    'dairy': '🥛'
+}
+
+product_emojis = EmojiLookup(PRODUCT_EMOJIS, CATEGORY_EMOJIS, default='🛒')
+
+
 class POSView:
     def __init__(self, parent, app):
         self.parent = parent
@@ -393,41 +424,7 @@ class POSView:
 
     def get_product_emoji(self, product):
         """Get emoji icon for product based on name or category"""
-        name = product['name'].lower()
-        category = product['category'].lower()
-
-        # Specific product emojis
-        emoji_map = {
-            'coffee': '☕', 'tea': '🍵', 'latte': '☕', 'cappuccino': '☕',
-            'espresso': '☕', 'juice': '🧃', 'smoothie': '🥤', 'chocolate': '🍫',
-            'water': '💧', 'soda': '🥤', 'lemonade': '🍋', 'energy': '⚡',
-            'sandwich': '🥪', 'croissant': '🥐', 'salad': '🥗', 'burger': '🍔',
-            'pizza': '🍕', 'pasta': '🍝', 'spaghetti': '🍝', 'rice': '🍚',
-            'thai': '🍜', 'wings': '🍗', 'chicken': '🍗', 'fries': '🍟',
-            'onion': '🧅', 'steak': '🥩', 'fish': '🐟', 'taco': '🌮',
-            'burrito': '🌯', 'quesadilla': '🫔', 'cake': '🍰', 'cheesecake': '🍰',
-            'ice cream': '🍦', 'brownie': '🧁', 'tiramisu': '🍰', 'pie': '🥧',
-            'donut': '🍩', 'muffin': '🧁', 'chips': '🍟', 'cookie': '🍪',
-            'pretzels': '🥨', 'popcorn': '🍿', 'nachos': '🌮', 'granola': '🥜',
-            'candy': '🍬', 'trail': '🥜', 'protein': '🍫', 'yogurt': '🥛',
-            'milk': '🥛', 'cheese': '🧀', 'butter': '🧈'
-        }
-
-        # Check for specific keywords in product name
-        for keyword, emoji in emoji_map.items():
-            if keyword in name:
-                return emoji
-
-        # Category-based fallback
-        category_emoji = {
-            'beverages': '🥤',
-            'food': '🍽️',
-            'desserts': '🍰',
-            'snacks': '🍿',
-            'dairy': '🥛'
-        }
-
-        return category_emoji.get(category, '🛒')
+        return product_emojis.get(product)
 
     def display_products(self, products=None):
         """Display products in responsive grid layout"""
@@ -581,38 +578,17 @@ class POSView:
 
     def add_to_cart(self, product):
         """Add product to cart"""
-        # Check if item already in cart
-        for item in self.app.cart:
-            if item["id"] == product["id"]:
-                item["qty"] += 1
-                item["total"] = item["qty"] * item["price"]
-                self.update_cart_display()
-                return
-
-        # Add new item to cart (store full product info for emoji)
-        cart_item = {
-            "id": product["id"],
-            "name": product["name"],
-            "price": product["price"],
-            "category": product["category"],
-            "qty": 1,
-            "total": product["price"]
-        }
-        self.app.cart.append(cart_item)
+        self.app.cart.add(product)
         self.update_cart_display()
 
     def remove_from_cart(self):
         """Remove selected item from cart"""
         selection = self.cart_tree.selection()
         if selection:
-            # Get the index of selected item in treeview
-            tree_item_id = selection[0]
-            item_index = self.cart_tree.index(tree_item_id)
-
-            # Remove from cart by index
-            if 0 <= item_index < len(self.app.cart):
-                self.app.cart.pop(item_index)
-                self.update_cart_display()
+            # Treeview rows are keyed by product id
+            product_id = int(selection[0])
+            self.app.cart.remove(product_id)
+            self.update_cart_display()
 
     def update_cart_display(self):
         """Update cart treeview and total with tax calculation (Chili Pos style)"""
@@ -620,26 +596,24 @@ class POSView:
         for item in self.cart_tree.get_children():
             self.cart_tree.delete(item)
 
-        # Calculate subtotal
-        subtotal = 0
         for item in self.app.cart:
             # Get emoji for the product
             emoji = self.get_product_emoji(item)
             item_name_with_emoji = f"{emoji} {item['name']}"
 
-            self.cart_tree.insert("", END, values=(
+            self.cart_tree.insert("", END, iid=str(item["id"]), values=(
                 item_name_with_emoji,
                 f"฿{item['price']:.2f}",
                 item["qty"],
                 f"฿{item['total']:.2f}"
             ))
-            subtotal += item["total"]
 
-        # Calculate tax (7% like in Chili Pos example)
-        tax = subtotal * 0.07
+        # Subtotal and tax (7% like in Chili Pos example) are kept by the cart
+        subtotal = self.app.cart.subtotal
+        tax = self.app.cart.tax
 
         # Calculate total
-        self.app.total = subtotal + tax
+        self.app.total = self.app.cart.total
 
         # Update labels
         self.subtotal_label.config(text=f"฿{subtotal:.2f}")
@@ -655,7 +629,7 @@ class POSView:
                 parent=self.app.root
             )
             if result == "Yes":
-                self.app.cart = []
+                self.app.cart.clear()
                 self.update_cart_display()
 
     def checkout(self):
@@ -958,10 +932,11 @@ class POSView:
             # Create receipt
             receipt = {
                 "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "items": self.app.cart.copy(),
+                "items": self.app.cart.to_list(),
                 "total": self.app.total,
                 "cash_received": total_received,
-                "change": change
+                "change": change,
+                "payment_method": self.payment_method.get()
             }
 
             # Save receipt
@@ -974,7 +949,7 @@ class POSView:
             self.show_receipt_dialog(receipt)
 
             # Clear cart
-            self.app.cart = []
+            self.app.cart.clear()
             self.update_cart_display()
 
         # Configure save payment button command now that confirm_payment is defined
@@ -1266,7 +1241,8 @@ class POSView:
                 cart=receipt['items'],
                 total=receipt['total'],
                 cash_received=receipt['cash_received'],
-                change=receipt['change']
+                change=receipt['change'],
+                payment_method=receipt['payment_method']
             )
             print(f"Receipt saved successfully with ID: {receipt_id}")
         except Exception as e:
@@ -3,7 +3,6 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
 import os
-import shutil
 from datetime import datetime
 import subprocess
 
@@ -148,8 +147,8 @@ class SettingsView:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_file = os.path.join(backup_dir, f"pos_backup_{timestamp}.db")
 
-            # Copy database file
-            shutil.copy2("database/pos.db", backup_file)
+            # Copy database (including changes still in the WAL file)
+            self.app.db.backup(backup_file)
 
             # Get file size
             size = os.path.getsize(backup_file) / 1024  # KB
@@ -213,7 +212,7 @@ class SettingsView:
                             self.app.menu_view.refresh_products_tree()
 
                         # Clear cart
-                        self.app.cart = []
+                        self.app.cart.clear()
                         if hasattr(self.app, 'pos_view'):
                             self.app.pos_view.update_cart_display()
 
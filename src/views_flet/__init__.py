@@ -1,11 +1,32 @@
 # Flet Views Package
-from .pos_view import POSView
-from .history_view import HistoryView
-from .menu_view import MenuView
-from .category_view import CategoryView
-from .users_view import UsersView
-from .settings_view import SettingsView
-from .tables_view import TablesView
+# View modules are imported on first navigation (load_view), not at startup
+import importlib
+
+# View id -> (module, class)
+VIEW_REGISTRY = {
+    'pos': ('pos_view', 'POSView'),
+    'history': ('history_view', 'HistoryView'),
+    'menu': ('menu_view', 'MenuView'),
+    'category': ('category_view', 'CategoryView'),
+    'tables': ('tables_view', 'TablesView'),
+    'users': ('users_view', 'UsersView'),
+    'settings': ('settings_view', 'SettingsView'),
+}
+
+
+def load_view(view_id):
+    """Import the module of view_id and return its view class"""
+    module_name, class_name = VIEW_REGISTRY[view_id]
+    return getattr(importlib.import_module(f".{module_name}", __name__), class_name)
+
+
+def __getattr__(name):
+    """Keep `from src.views_flet import POSView` working (imports on access)"""
+    for view_id, (_, class_name) in VIEW_REGISTRY.items():
+        if class_name == name:
+            return load_view(view_id)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'POSView',
@@ -4,8 +4,6 @@ Category View - Flet Version
 Manage product categories
 """
 import flet as ft
-import json
-import os
 
 
 class CategoryView:
@@ -15,45 +13,22 @@ class CategoryView:
         self.page = app.page
         self.db = app.db
 
-        # Category emojis mapping
-        self.category_emojis = {}
-        self.load_category_emojis()
-
         # Reference to main content for refreshing
         self.main_content = None
-
-    def load_category_emojis(self):
-        """Load category emojis from file"""
-        try:
-            if os.path.exists("data/category_emojis.json"):
-                with open("data/category_emojis.json", "r", encoding="utf-8") as f:
-                    self.category_emojis = json.load(f)
-            else:
-                # Default emojis
-                self.category_emojis = {
-                    'Beverages': '🥤', 'Food': '🍽️', 'Desserts': '🍰',
-                    'Snacks': '🍿', 'Dairy': '🥛', 'Breakfast': '🍳',
-                    'Soups': '🍲', 'Pasta': '🍝', 'Burgers': '🍔',
-                    'Main Course': '🍖', 'Drinks': '☕'
-                }
-                self.save_category_emojis()
-        except Exception as e:
-            print(f"Error loading category emojis: {e}")
-            self.category_emojis = {}
-
-    def save_category_emojis(self):
-        """Save category emojis to file"""
-        try:
-            os.makedirs("data", exist_ok=True)
-            with open("data/category_emojis.json", "w", encoding="utf-8") as f:
-                json.dump(self.category_emojis, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error saving category emojis: {e}")
+        self.category_count_text = None
+        self.categories_container = None
 
     def create(self):
         """Create Category view layout"""
         categories = self.app.categories
 
+        self.category_count_text = ft.Text(str(len(categories)), size=48, weight=ft.FontWeight.BOLD,
+                                           color=ft.Colors.WHITE)
+        self.categories_container = ft.Container(
+            content=self.build_categories_grid(categories),
+            expand=True
+        )
+
         self.main_content = ft.Column(
             [
                 # Header
@@ -86,7 +61,7 @@ class CategoryView:
                         content=ft.Column(
                             [
                                 ft.Text("หมวดหมู่ทั้งหมด", size=14, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD),
-                                ft.Text(str(len(categories)), size=48, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE)
+                                self.category_count_text
                             ],
                             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                             spacing=5
@@ -99,10 +74,7 @@ class CategoryView:
                 ),
 
                 # Categories Grid
-                ft.Container(
-                    content=self.build_categories_grid(categories, self.category_emojis),
-                    expand=True
-                )
+                self.categories_container
             ],
             spacing=20,
             scroll=ft.ScrollMode.AUTO
@@ -116,22 +88,33 @@ class CategoryView:
 
     def refresh_view(self):
         """Refresh the entire view"""
-        # Reload data from database
+        # Reload data from catalog (emojis included)
         self.app.categories = self.app.load_categories()
-        self.load_category_emojis()
+        self.refresh({'categories'})
+
+    def refresh(self, changes):
+        """Rebuild the count and grid when products or categories changed"""
+        if not changes & {'products', 'categories'}:
+            return
 
-        # Rebuild the view
         categories = self.app.categories
 
         # Update total count
-        self.main_content.controls[1].content.content.controls[1].value = str(len(categories))
+        self.category_count_text.value = str(len(categories))
 
         # Rebuild grid
-        self.main_content.controls[2].content = self.build_categories_grid(categories, self.category_emojis)
+        self.categories_container.content = self.build_categories_grid(categories)
 
-        self.page.update()
+        self.update_controls(self.category_count_text, self.categories_container)
 
-    def build_categories_grid(self, categories, emojis):
+    def update_controls(self, *controls):
+        """Send a targeted update for controls that are mounted on the page"""
+        # Controls of a hidden (cached) view keep their page but are not in its index
+        mounted = [c for c in controls if c.page is not None and self.page.get_control(c.uid) is c]
+        if mounted:
+            self.page.update(*mounted)
+
+    def build_categories_grid(self, categories):
         """Build categories grid"""
         if not categories:
             return ft.Container(
@@ -148,7 +131,7 @@ class CategoryView:
 
         cards = []
         for category in categories:
-            emoji = emojis.get(category, '🏷️')
+            emoji = self.app.catalog.category_emoji(category)
             count = category_counts.get(category, 0)
 
             cards.append(
@@ -246,13 +229,8 @@ class CategoryView:
                 return
 
             try:
-                # Add category to database
-                self.db.add_category(category_name)
-
-                # Save emoji if provided
-                if emoji_field.value and emoji_field.value.strip():
-                    self.category_emojis[category_name] = emoji_field.value.strip()
-                    self.save_category_emojis()
+                # Add category (and its emoji, if provided) to database
+                self.app.catalog.add_category(category_name, (emoji_field.value or "").strip() or None)
 
                 # Close dialog
                 add_dlg.open = False
@@ -294,7 +272,7 @@ class CategoryView:
         name_field = ft.TextField(label="ชื่อหมวดหมู่", value=category, width=300)
         emoji_field = ft.TextField(
             label="Emoji (ไม่บังคับ)",
-            value=self.category_emojis.get(category, ""),
+            value=(self.app.catalog.category(category) or {}).get('emoji') or "",
             width=300,
             hint_text="🍕"
         )
@@ -316,17 +294,8 @@ class CategoryView:
                 return
 
             try:
-                # Update category in database (update all products with this category)
-                self.db.update_category(category, new_category_name)
-
-                # Update emoji
-                if category in self.category_emojis:
-                    del self.category_emojis[category]
-
-                if emoji_field.value and emoji_field.value.strip():
-                    self.category_emojis[new_category_name] = emoji_field.value.strip()
-
-                self.save_category_emojis()
+                # Rename category and set its emoji (empty clears it) in database
+                self.app.catalog.update_category(category, new_category_name, (emoji_field.value or "").strip())
 
                 # Close dialog
                 edit_dlg.open = False
@@ -374,14 +343,9 @@ class CategoryView:
 
         def confirm_delete(e):
             try:
-                # Delete category from database
-                # This should move products to 'อื่นๆ' or 'Uncategorized'
-                self.db.delete_category(category)
-
-                # Remove emoji
-                if category in self.category_emojis:
-                    del self.category_emojis[category]
-                    self.save_category_emojis()
+                # Delete category (and its emoji) from database
+                # This moves its products to 'อื่นๆ'
+                self.app.catalog.delete_category(category)
 
                 # Close dialog
                 delete_dlg.open = False
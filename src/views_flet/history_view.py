@@ -4,39 +4,82 @@ History View - Flet Version
 Show transaction history and sales summary
 """
 import flet as ft
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+
+from database import ReceiptFilter
+from database.export import DEFAULT_EXPORT_DIR, available_formats, export_receipts
 
 
 class HistoryView:
+    RECEIPTS_PAGE_SIZE = 25
+    RECEIPTS_SCROLL_OVERSCAN = 600
+    # Seconds to wait for queued receipts (always off the UI thread)
+    BACKGROUND_FLUSH_SECONDS = 10.0
+
     def __init__(self, app):
         """Initialize History view"""
         self.app = app
         self.page = app.page
         self.db = app.db
         self.receipts_list = None
+        self.receipts_container = None
+        self.receipt_filter = None  # ReceiptFilter of the current search
+        self.today_sales_text = None
+        self.today_receipts_text = None
+        self.total_sales_text = None
+        self.total_receipts_text = None
+        self.failed_banner = None   # receipts the writer set aside (not in the sales yet)
+        self.failed_text = None
+
+        # Keyset of the newest shown receipt (newer ones are prepended on refresh)
+        self.receipts_top = None
+
+        # Keyset of the last loaded receipt, None once all are loaded
+        self.receipts_cursor = None
+        self.receipts_loading = threading.Lock()
+        self.load_thread = None     # latest reload_receipts run
 
     def create(self):
-        """Create History view layout"""
-        # Get sales summary
-        try:
-            summary = self.db.get_sales_summary()
-        except:
-            summary = {
-                'today_sales': 0,
-                'today_receipts': 0,
-                'total_sales': 0,
-                'total_receipts': 0
-            }
-
-        # Get receipts
-        try:
-            receipts = self.db.get_all_receipts(limit=50)
-        except:
-            receipts = []
+        """Create History view layout (summary and receipts are loaded off the UI thread)"""
+        self.today_sales_text = ft.Text(
+            "฿...",
+            size=32,
+            weight=ft.FontWeight.BOLD,
+            color=ft.Colors.WHITE
+        )
+        self.today_receipts_text = ft.Text(
+            "... ใบเสร็จ",
+            size=12,
+            color=ft.Colors.WHITE70
+        )
+        self.total_sales_text = ft.Text(
+            "฿...",
+            size=32,
+            weight=ft.FontWeight.BOLD,
+            color=ft.Colors.WHITE
+        )
+        self.total_receipts_text = ft.Text(
+            "... ใบเสร็จ",
+            size=12,
+            color=ft.Colors.WHITE70
+        )
 
-        self.receipts_list = ft.Column(spacing=10, scroll=ft.ScrollMode.AUTO)
+        # First page of receipts is loaded in the background (more while scrolling)
+        self.receipt_filter = None
+        self.receipts_list = None
+        self.receipts_top = None
+        self.receipts_cursor = None
+        self.receipts_container = ft.Container(
+            content=ft.Container(
+                content=ft.ProgressRing(color=ft.Colors.BLUE_700),
+                alignment=ft.alignment.center,
+                padding=40
+            ),
+            expand=True
+        )
 
-        return ft.Container(
+        view = ft.Container(
             content=ft.Column(
                 [
                     # Header
@@ -52,6 +95,9 @@ class HistoryView:
                         border_radius=10
                     ),
 
+                    # Receipts that could not be saved
+                    self.build_failed_banner(),
+
                     # Summary Cards
                     ft.Row(
                         [
@@ -66,17 +112,8 @@ class HistoryView:
                                                 color=ft.Colors.WHITE,
                                                 weight=ft.FontWeight.BOLD
                                             ),
-                                            ft.Text(
-                                                f"฿{summary['today_sales']:,.2f}",
-                                                size=32,
-                                                weight=ft.FontWeight.BOLD,
-                                                color=ft.Colors.WHITE
-                                            ),
-                                            ft.Text(
-                                                f"{summary['today_receipts']} ใบเสร็จ",
-                                                size=12,
-                                                color=ft.Colors.WHITE70
-                                            )
+                                            self.today_sales_text,
+                                            self.today_receipts_text
                                         ],
                                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                                         spacing=5
@@ -99,17 +136,8 @@ class HistoryView:
                                                 color=ft.Colors.WHITE,
                                                 weight=ft.FontWeight.BOLD
                                             ),
-                                            ft.Text(
-                                                f"฿{summary['total_sales']:,.2f}",
-                                                size=32,
-                                                weight=ft.FontWeight.BOLD,
-                                                color=ft.Colors.WHITE
-                                            ),
-                                            ft.Text(
-                                                f"{summary['total_receipts']} ใบเสร็จ",
-                                                size=12,
-                                                color=ft.Colors.WHITE70
-                                            )
+                                            self.total_sales_text,
+                                            self.total_receipts_text
                                         ],
                                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                                         spacing=5
@@ -142,6 +170,12 @@ class HistoryView:
                                     bgcolor=ft.Colors.ORANGE_700,
                                     color=ft.Colors.WHITE
                                 ),
+                                ft.ElevatedButton(
+                                    "📤 ส่งออก",
+                                    on_click=lambda e: self.show_export_dialog(),
+                                    bgcolor=ft.Colors.TEAL_700,
+                                    color=ft.Colors.WHITE
+                                ),
                                 ft.ElevatedButton(
                                     "🔄 รีเฟรช",
                                     on_click=lambda e: self.refresh_data(),
@@ -155,20 +189,140 @@ class HistoryView:
                     ),
 
                     # Receipts List
-                    ft.Container(
-                        content=self.build_receipts_list(receipts),
-                        expand=True
-                    )
+                    self.receipts_container
                 ],
                 spacing=20,
-                scroll=ft.ScrollMode.AUTO
+                expand=True
             ),
             padding=20,
             expand=True
         )
 
+        self.start_reload()
+        return view
+
+    def load_summary(self):
+        """Sales summary (zeros when it cannot be read)"""
+        try:
+            return self.db.get_sales_summary()
+        except:
+            return {
+                'today_sales': 0,
+                'today_receipts': 0,
+                'total_sales': 0,
+                'total_receipts': 0
+            }
+
+    def refresh(self, changes):
+        """Update the summary and prepend receipts saved while the view was hidden"""
+        if 'receipts' in changes:
+            self.start_reload()
+
+    def start_reload(self):
+        """Run reload_receipts on a worker thread"""
+        self.load_thread = threading.Thread(target=self.reload_receipts, daemon=True)
+        self.load_thread.start()
+
+    def reload_receipts(self):
+        """Wait for queued receipts, then update the summary and receipts list (runs off the UI thread)"""
+        with self.receipts_loading:
+            self.app.receipt_writer.flush(self.BACKGROUND_FLUSH_SECONDS)
+            self.update_controls(*self.load_receipts())
+
+    def load_receipts(self):
+        """Read the summary and newest receipts into the controls; returns the changed controls"""
+        summary = self.load_summary()
+        self.today_sales_text.value = f"฿{summary['today_sales']:,.2f}"
+        self.today_receipts_text.value = f"{summary['today_receipts']} ใบเสร็จ"
+        self.total_sales_text.value = f"฿{summary['total_sales']:,.2f}"
+        self.total_receipts_text.value = f"{summary['total_receipts']} ใบเสร็จ"
+        changed = [self.today_sales_text, self.today_receipts_text, self.total_sales_text, self.total_receipts_text]
+        self.update_failed_banner()
+        changed.append(self.failed_banner)
+
+        try:
+            receipts = self.db.search_receipts(self.receipt_filter, limit=self.RECEIPTS_PAGE_SIZE)
+        except Exception as e:
+            print(f"Error loading receipts: {e}")
+            receipts = []
+
+        new = [r for r in receipts if self.receipts_top is None or (r['date_ts'], r['id']) > self.receipts_top]
+        if self.receipts_list is None or len(new) == len(receipts):
+            # Nothing shown yet, or more new receipts than a page: start over
+            self.receipts_container.content = self.build_receipts_list(receipts)
+            changed.append(self.receipts_container)
+        elif new:
+            self.receipts_list.controls[0:0] = [self.create_receipt_card(receipt) for receipt in new]
+            self.receipts_top = (new[0]['date_ts'], new[0]['id'])
+            changed.append(self.receipts_list)
+
+        return changed
+
+    def build_failed_banner(self):
+        """Build the warning shown while receipts are set aside by the writer"""
+        self.failed_text = ft.Text("", size=13, color=ft.Colors.RED_900, expand=True)
+        self.failed_banner = ft.Container(
+            content=ft.Row(
+                [
+                    ft.Icon(ft.Icons.WARNING_AMBER, color=ft.Colors.RED_700),
+                    self.failed_text,
+                    ft.ElevatedButton(
+                        "🔁 บันทึกอีกครั้ง",
+                        on_click=lambda e: self.retry_failed_receipts(),
+                        bgcolor=ft.Colors.RED_700,
+                        color=ft.Colors.WHITE
+                    )
+                ],
+                spacing=10
+            ),
+            bgcolor=ft.Colors.RED_50,
+            padding=15,
+            border_radius=10,
+            visible=False
+        )
+        return self.failed_banner
+
+    def update_failed_banner(self):
+        """Show the paid receipts that are missing from the sales (kept in the writer's .failed file)"""
+        writer = self.app.receipt_writer
+        failed = writer.failed_receipts()
+        self.failed_banner.visible = bool(failed)
+        if not failed:
+            return
+
+        numbers = ", ".join(f"#{r['receipt_no']}" for r in failed[:5]) + (" ..." if len(failed) > 5 else "")
+        self.failed_text.value = (
+            f"ใบเสร็จ {len(failed)} ใบ (รวม ฿{sum(r['total'] for r in failed):,.2f}) บันทึกไม่สำเร็จ "
+            f"และยังไม่รวมในยอดขาย: {numbers}\n"
+            f"สาเหตุล่าสุด: {failed[-1].get('error')} (เก็บไว้ที่ {writer.failed_path})"
+        )
+
+    def retry_failed_receipts(self):
+        """Queue the set-aside receipts again off the UI thread, then show the result"""
+        def retry():
+            writer = self.app.receipt_writer
+            count = writer.retry_failed()
+            self.reload_receipts()
+            left = len(writer.failed_receipts())
+            if left:
+                self.show_message(f"⚠️ บันทึกได้ {count - left} จาก {count} ใบ", ft.Colors.RED_700)
+            else:
+                self.show_message(f"✅ บันทึกใบเสร็จที่ค้างอยู่ {count} ใบแล้ว", ft.Colors.GREEN_700)
+
+        threading.Thread(target=retry, daemon=True).start()
+
+    def update_controls(self, *controls):
+        """Send a targeted update for controls that are mounted on the page"""
+        # Controls of a hidden (cached) view keep their page but are not in its index
+        mounted = [c for c in controls if c.page is not None and self.page.get_control(c.uid) is c]
+        if mounted:
+            self.page.update(*mounted)
+
     def build_receipts_list(self, receipts):
         """Build receipts list"""
+        self.receipts_cursor = None
+        self.receipts_list = None
+        self.receipts_top = (receipts[0]['date_ts'], receipts[0]['id']) if receipts else None
         if not receipts:
             return ft.Container(
                 content=ft.Text(
@@ -180,85 +334,120 @@ class HistoryView:
                 padding=40
             )
 
-        receipt_cards = []
-        for receipt in receipts:
-            receipt_cards.append(
-                ft.Card(
-                    content=ft.Container(
-                        content=ft.Row(
+        self.receipts_list = ft.Column(
+            [self.create_receipt_card(receipt) for receipt in receipts],
+            spacing=10,
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+            on_scroll=self.on_receipts_scroll
+        )
+        self.set_receipts_cursor(receipts)
+        return self.receipts_list
+
+    def set_receipts_cursor(self, page):
+        """Remember where the next page starts"""
+        if len(page) < self.RECEIPTS_PAGE_SIZE:
+            self.receipts_cursor = None
+        else:
+            self.receipts_cursor = (page[-1]['date_ts'], page[-1]['id'])
+
+    def on_receipts_scroll(self, e):
+        """Load the next page as the list is scrolled near its end"""
+        if self.receipts_cursor is None:
+            return
+        if e.max_scroll_extent - e.pixels > self.RECEIPTS_SCROLL_OVERSCAN:
+            return
+        self.load_more_receipts()
+
+    def load_more_receipts(self):
+        """Append the next page of receipts"""
+        if self.receipts_cursor is None or not self.receipts_loading.acquire(blocking=False):
+            return
+        try:
+            page = self.db.search_receipts(self.receipt_filter, before=self.receipts_cursor,
+                                           limit=self.RECEIPTS_PAGE_SIZE)
+            self.receipts_list.controls.extend(self.create_receipt_card(receipt) for receipt in page)
+            self.set_receipts_cursor(page)
+            if self.receipts_list.page is not None:
+                self.receipts_list.update()
+        finally:
+            self.receipts_loading.release()
+
+    def create_receipt_card(self, receipt):
+        """Create receipt card"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Row(
+                    [
+                        # Receipt Icon
+                        ft.Container(
+                            content=ft.Icon(
+                                ft.Icons.RECEIPT_LONG,
+                                color=ft.Colors.WHITE,
+                                size=30
+                            ),
+                            bgcolor=ft.Colors.BLUE_700,
+                            border_radius=50,
+                            padding=15
+                        ),
+
+                        # Receipt Info
+                        ft.Column(
                             [
-                                # Receipt Icon
-                                ft.Container(
-                                    content=ft.Icon(
-                                        ft.Icons.RECEIPT_LONG,
-                                        color=ft.Colors.WHITE,
-                                        size=30
-                                    ),
-                                    bgcolor=ft.Colors.BLUE_700,
-                                    border_radius=50,
-                                    padding=15
+                                ft.Text(
+                                    f"ใบเสร็จ #{receipt.get('receipt_no') or receipt['id']}",
+                                    size=16,
+                                    weight=ft.FontWeight.BOLD
                                 ),
-
-                                # Receipt Info
-                                ft.Column(
-                                    [
-                                        ft.Text(
-                                            f"ใบเสร็จ #{receipt['id']}",
-                                            size=16,
-                                            weight=ft.FontWeight.BOLD
-                                        ),
-                                        ft.Text(
-                                            f"{receipt['date']}",
-                                            size=12,
-                                            color=ft.Colors.GREY_600
-                                        ),
-                                        ft.Text(
-                                            f"{receipt['items_count']} รายการ",
-                                            size=12,
-                                            color=ft.Colors.GREY_700
-                                        )
-                                    ],
-                                    spacing=2,
-                                    expand=True
+                                ft.Text(
+                                    f"{receipt['date']}",
+                                    size=12,
+                                    color=ft.Colors.GREY_600
                                 ),
+                                ft.Text(
+                                    f"{receipt['items_count']} รายการ",
+                                    size=12,
+                                    color=ft.Colors.GREY_700
+                                )
+                            ],
+                            spacing=2,
+                            expand=True
+                        ),
 
-                                # Amount
-                                ft.Column(
-                                    [
-                                        ft.Text(
-                                            f"฿{receipt['total']:,.2f}",
-                                            size=20,
-                                            weight=ft.FontWeight.BOLD,
-                                            color=ft.Colors.GREEN_700
-                                        ),
-                                        ft.Text(
-                                            f"เงินทอน ฿{receipt['change']:,.2f}",
-                                            size=11,
-                                            color=ft.Colors.GREY_600
-                                        )
-                                    ],
-                                    horizontal_alignment=ft.CrossAxisAlignment.END,
-                                    spacing=2
+                        # Amount
+                        ft.Column(
+                            [
+                                ft.Text(
+                                    f"฿{receipt['total']:,.2f}",
+                                    size=20,
+                                    weight=ft.FontWeight.BOLD,
+                                    color=ft.Colors.GREEN_700
                                 ),
-
-                                # View Button
-                                ft.IconButton(
-                                    icon=ft.Icons.VISIBILITY,
-                                    icon_color=ft.Colors.BLUE_700,
-                                    tooltip="ดูรายละเอียด",
-                                    on_click=lambda e, r=receipt: self.view_receipt_details(r)
+                                ft.Text(
+                                    f"เงินทอน ฿{receipt['change']:,.2f}",
+                                    size=11,
+                                    color=ft.Colors.GREY_600
                                 )
                             ],
-                            spacing=15,
-                            vertical_alignment=ft.CrossAxisAlignment.CENTER
+                            horizontal_alignment=ft.CrossAxisAlignment.END,
+                            spacing=2
                         ),
-                        padding=15
-                    ),
-                    elevation=2
-                )
-            )
 
-        return ft.Column(receipt_cards, spacing=10, scroll=ft.ScrollMode.AUTO)
+                        # View Button
+                        ft.IconButton(
+                            icon=ft.Icons.VISIBILITY,
+                            icon_color=ft.Colors.BLUE_700,
+                            tooltip="ดูรายละเอียด",
+                            on_click=lambda e, r=receipt: self.view_receipt_details(r)
+                        )
+                    ],
+                    spacing=15,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER
+                ),
+                padding=15
+            ),
+            elevation=2
+        )
 
     def view_receipt_details(self, receipt_summary):
         """View receipt details"""
@@ -294,7 +483,7 @@ class HistoryView:
             modal=True,
             title=ft.Row([
                 ft.Icon(ft.Icons.RECEIPT_LONG, color=ft.Colors.BLUE_700, size=32),
-                ft.Text(f"ใบเสร็จ #{receipt['id']}", size=24, weight=ft.FontWeight.BOLD)
+                ft.Text(f"ใบเสร็จ #{receipt.get('receipt_no') or receipt['id']}", size=24, weight=ft.FontWeight.BOLD)
             ]),
             content=ft.Container(
                 content=ft.Column([
@@ -381,6 +570,16 @@ class HistoryView:
             self.page.update()
 
         def do_search(e):
+            # Validate criteria
+            try:
+                date_from = self.parse_date(date_from_field.value)
+                date_to = self.parse_date(date_to_field.value)
+                min_total = float(min_amount_field.value) if min_amount_field.value else None
+                max_total = float(max_amount_field.value) if max_amount_field.value else None
+            except ValueError:
+                self.show_message("❌ รูปแบบวันที่หรือยอดเงินไม่ถูกต้อง", ft.Colors.RED_700)
+                return
+
             search_dlg.open = False
             self.page.update()
 
@@ -399,13 +598,15 @@ class HistoryView:
 
             criteria_text = ", ".join(criteria) if criteria else "ทั้งหมด"
 
-            # Show success
-            self.page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"🔍 ค้นหา: {criteria_text} (Demo)"),
-                bgcolor=ft.Colors.PURPLE_700
-            )
-            self.page.snack_bar.open = True
-            self.page.update()
+            # Date to is inclusive in the dialog
+            self.search_receipts(ReceiptFilter(
+                receipt_id=receipt_id_field.value or None,
+                date_from=date_from,
+                date_to=date_to + timedelta(days=1) if date_to else None,
+                min_total=min_total,
+                max_total=max_total
+            ))
+            self.show_message(f"🔍 ค้นหา: {criteria_text}", ft.Colors.PURPLE_700)
 
         search_dlg = ft.AlertDialog(
             modal=True,
@@ -441,6 +642,31 @@ class HistoryView:
         search_dlg.open = True
         self.page.update()
 
+    def search_receipts(self, receipt_filter):
+        """Show first page of receipts matching receipt_filter"""
+        try:
+            receipts = self.db.search_receipts(receipt_filter, limit=self.RECEIPTS_PAGE_SIZE)
+        except Exception as e:
+            print(f"Error searching receipts: {e}")
+            receipts = []
+
+        self.receipt_filter = receipt_filter
+        self.receipts_container.content = self.build_receipts_list(receipts)
+        if self.receipts_container.page is not None:
+            self.receipts_container.update()
+
+    @staticmethod
+    def parse_date(value):
+        """Parse YYYY-MM-DD (None when empty)"""
+        value = (value or "").strip()
+        return datetime.strptime(value, "%Y-%m-%d") if value else None
+
+    def show_message(self, message, bgcolor):
+        """Show snackbar message"""
+        self.page.snack_bar = ft.SnackBar(content=ft.Text(message), bgcolor=bgcolor)
+        self.page.snack_bar.open = True
+        self.page.update()
+
     def show_report_dialog(self):
         """Show report dialog"""
         report_type = ft.RadioGroup(
@@ -464,22 +690,14 @@ class HistoryView:
         def generate_report(e):
             report_dlg.open = False
             self.page.update()
+            self.show_message("⏳ กำลังสร้างรายงาน...", ft.Colors.ORANGE_700)
 
-            report_names = {
-                "daily": "รายวัน",
-                "weekly": "รายสัปดาห์",
-                "monthly": "รายเดือน",
-                "yearly": "รายปี",
-                "custom": "กำหนดเอง"
-            }
-
-            # Show success
-            self.page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"📊 สร้างรายงาน{report_names.get(report_type.value, 'รายวัน')} (Demo)"),
-                bgcolor=ft.Colors.ORANGE_700
-            )
-            self.page.snack_bar.open = True
-            self.page.update()
+            # Reports read through their own connection, off the UI thread
+            threading.Thread(
+                target=self.generate_report,
+                args=(report_type.value, date_from_field.value or None, date_to_field.value or None),
+                daemon=True
+            ).start()
 
         report_dlg = ft.AlertDialog(
             modal=True,
@@ -511,14 +729,183 @@ class HistoryView:
         report_dlg.open = True
         self.page.update()
 
-    def refresh_data(self):
-        """Refresh data"""
-        # Rebuild the view
-        new_view = self.create()
-        # Update parent container
-        self.page.snack_bar = ft.SnackBar(
-            content=ft.Text("✅ รีเฟรชข้อมูลแล้ว"),
-            bgcolor=ft.Colors.GREEN_700
+    def generate_report(self, report_type, date_from, date_to):
+        """Generate report and show it (runs off the UI thread)"""
+        try:
+            # Receipts still queued for the database count too
+            self.app.receipt_writer.flush(self.BACKGROUND_FLUSH_SECONDS)
+            report = self.app.reports.generate(report_type, date_from=date_from, date_to=date_to)
+        except ValueError:
+            self.show_message("❌ กรุณาระบุช่วงวันที่ให้ถูกต้อง (YYYY-MM-DD)", ft.Colors.RED_700)
+            return
+        except Exception as e:
+            print(f"Error generating report: {e}")
+            self.show_message(f"❌ สร้างรายงานไม่สำเร็จ: {str(e)}", ft.Colors.RED_700)
+            return
+
+        self.show_report(report)
+
+    def show_report(self, report):
+        """Show generated report"""
+        report_names = {
+            "daily": "รายวัน",
+            "weekly": "รายสัปดาห์",
+            "monthly": "รายเดือน",
+            "yearly": "รายปี",
+            "custom": "กำหนดเอง"
+        }
+
+        def close_dlg(e):
+            result_dlg.open = False
+            self.page.update()
+
+        def section(title, rows):
+            return [
+                ft.Text(title, size=14, weight=ft.FontWeight.BOLD),
+                ft.Container(
+                    content=ft.Column([
+                        ft.Row([
+                            ft.Text(label, size=12, expand=True),
+                            ft.Text(value, size=12, weight=ft.FontWeight.BOLD)
+                        ]) for label, value in rows
+                    ] or [ft.Text("ไม่มีข้อมูล", size=12, color=ft.Colors.GREY_600)], spacing=5),
+                    bgcolor=ft.Colors.GREY_50,
+                    padding=10,
+                    border_radius=10
+                ),
+                ft.Divider()
+            ]
+
+        busy_hours = sorted((row for row in report['by_hour'] if row['receipts']),
+                            key=lambda row: -row['sales'])[:5]
+
+        result_dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(f"📊 รายงาน{report_names.get(report['type'], '')}", size=20, weight=ft.FontWeight.BOLD),
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Text(f"{report['date_from']} - {report['date_to']}", size=12, color=ft.Colors.GREY_700),
+                    ft.Row([
+                        ft.Text("ยอดขาย", size=16, weight=ft.FontWeight.BOLD),
+                        ft.Text(f"฿{report['sales']:,.2f}", size=16, weight=ft.FontWeight.BOLD,
+                                color=ft.Colors.GREEN_700)
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    ft.Row([
+                        ft.Text("ใบเสร็จ", size=14),
+                        ft.Text(f"{report['receipts']:,}", size=14, weight=ft.FontWeight.BOLD)
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    ft.Row([
+                        ft.Text("ภาษี 7%", size=14),
+                        ft.Text(f"฿{report['tax']:,.2f}", size=14, weight=ft.FontWeight.BOLD)
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    ft.Divider(),
+                    *section("ตามช่วงเวลา", [
+                        (row['period'], f"฿{row['sales']:,.2f}") for row in report['by_period'] if row['receipts']
+                    ]),
+                    *section("ตามหมวดหมู่", [
+                        (row['category'], f"{row['qty']:,} ชิ้น  ฿{row['sales']:,.2f}") for row in report['by_category']
+                    ]),
+                    *section("สินค้าขายดี", [
+                        (row['name'], f"{row['qty']:,} ชิ้น  ฿{row['sales']:,.2f}") for row in report['by_product'][:10]
+                    ]),
+                    *section("ช่วงเวลาขายดี", [
+                        (f"{row['hour']:02d}:00", f"{row['receipts']:,} ใบ  ฿{row['sales']:,.2f}") for row in busy_hours
+                    ]),
+                    *section("วิธีชำระเงิน", [
+                        (row['payment_method'], f"{row['receipts']:,} ใบ  ฿{row['sales']:,.2f}")
+                        for row in report['by_payment_method']
+                    ]),
+                ], spacing=10, scroll=ft.ScrollMode.AUTO),
+                width=450,
+                height=550
+            ),
+            actions=[
+                ft.TextButton("ปิด", on_click=close_dlg)
+            ]
         )
-        self.page.snack_bar.open = True
+
+        self.page.overlay.append(result_dlg)
+        result_dlg.open = True
         self.page.update()
+
+    def show_export_dialog(self):
+        """Show export dialog"""
+        export_format = ft.RadioGroup(
+            content=ft.Column([
+                ft.Radio(value=fmt, label=fmt.upper()) for fmt in available_formats()
+            ]),
+            value="csv"
+        )
+        incremental = ft.Checkbox(label="เฉพาะรายการใหม่ตั้งแต่ส่งออกครั้งล่าสุด", value=True)
+
+        def close_dlg(e):
+            export_dlg.open = False
+            self.page.update()
+
+        def do_export(e):
+            export_dlg.open = False
+            self.page.update()
+            self.show_message("⏳ กำลังส่งออกข้อมูล...", ft.Colors.BLUE_700)
+
+            # Large tables take a while, keep the UI responsive
+            threading.Thread(
+                target=self.export_receipts,
+                args=(export_format.value, incremental.value),
+                daemon=True
+            ).start()
+
+        export_dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("📤 ส่งออกข้อมูลการขาย", size=20, weight=ft.FontWeight.BOLD),
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Text("รูปแบบไฟล์", size=14, weight=ft.FontWeight.BOLD),
+                    export_format,
+                    ft.Divider(),
+                    incremental,
+                    ft.Text(f"บันทึกที่ {DEFAULT_EXPORT_DIR}", size=12, color=ft.Colors.GREY_700)
+                ], spacing=15, tight=True),
+                width=400
+            ),
+            actions=[
+                ft.TextButton("ยกเลิก", on_click=close_dlg),
+                ft.ElevatedButton(
+                    "ส่งออก",
+                    on_click=do_export,
+                    bgcolor=ft.Colors.TEAL_700,
+                    color=ft.Colors.WHITE
+                )
+            ]
+        )
+
+        self.page.overlay.append(export_dlg)
+        export_dlg.open = True
+        self.page.update()
+
+    def export_receipts(self, fmt, incremental):
+        """Export receipts and line items (runs off the UI thread)"""
+        try:
+            self.app.receipt_writer.flush(self.BACKGROUND_FLUSH_SECONDS)
+            results = export_receipts(self.db.db_path, fmt=fmt, incremental=incremental,
+                                      profile=self.db.profile)
+        except Exception as e:
+            print(f"Error exporting receipts: {e}")
+            self.show_message(f"❌ ส่งออกไม่สำเร็จ: {str(e)}", ft.Colors.RED_700)
+            return
+
+        receipts = results['receipts']
+        if receipts['path'] is None:
+            self.show_message("ℹ️ ไม่มีรายการใหม่ให้ส่งออก", ft.Colors.BLUE_700)
+        else:
+            self.show_message(
+                f"✅ ส่งออก {receipts['rows']} ใบเสร็จ, {results['receipt_items']['rows']} รายการ ไปที่ {DEFAULT_EXPORT_DIR}",
+                ft.Colors.GREEN_700
+            )
+
+    def refresh_data(self):
+        """Refresh data off the UI thread, then confirm"""
+        def reload():
+            self.reload_receipts()
+            self.show_message("✅ รีเฟรชข้อมูลแล้ว", ft.Colors.GREEN_700)
+
+        threading.Thread(target=reload, daemon=True).start()
@@ -3,10 +3,16 @@
 Menu View - Flet Version
 Manage menu items and products
 """
+import sqlite3
+
 import flet as ft
 
+from database.emoji_lookup import product_emojis
+
 
 class MenuView:
+    SOLD_PRODUCT_MESSAGE = "ลบ '{name}' ไม่ได้ เพราะมีประวัติการขายในใบเสร็จแล้ว (แก้ไขชื่อหรือราคาแทนได้)"
+
     def __init__(self, app):
         """Initialize Menu view"""
         self.app = app
@@ -14,6 +20,15 @@ class MenuView:
         self.db = app.db
         self.products_list = None
 
+        # Product row controls keyed by product id
+        self.product_rows = {}
+        self.products_container = None
+        self.product_count_ref = ft.Ref[ft.Text]()
+        self.category_count_ref = ft.Ref[ft.Text]()
+
+        # Patch rows when products change
+        self.app.catalog.subscribe(self.on_catalog_change)
+
     def create(self):
         """Create Menu view layout"""
         # Get all products
@@ -49,17 +64,16 @@ class MenuView:
                     # Stats Cards
                     ft.Row(
                         [
-                            self.build_stat_card("📦 สินค้าทั้งหมด", str(len(products)), ft.Colors.BLUE_600),
-                            self.build_stat_card("🏷️ หมวดหมู่", str(len(self.app.categories)), ft.Colors.GREEN_600),
+                            self.build_stat_card("📦 สินค้าทั้งหมด", str(len(products)), ft.Colors.BLUE_600,
+                                                 value_ref=self.product_count_ref),
+                            self.build_stat_card("🏷️ หมวดหมู่", str(len(self.app.categories)), ft.Colors.GREEN_600,
+                                                 value_ref=self.category_count_ref),
                         ],
                         spacing=20
                     ),
 
                     # Products Table
-                    ft.Container(
-                        content=self.build_products_table(products),
-                        expand=True
-                    )
+                    self.build_products_container(products)
                 ],
                 spacing=20,
                 scroll=ft.ScrollMode.AUTO
@@ -68,14 +82,14 @@ class MenuView:
             expand=True
         )
 
-    def build_stat_card(self, title, value, color):
+    def build_stat_card(self, title, value, color, value_ref=None):
         """Build stat card"""
         return ft.Card(
             content=ft.Container(
                 content=ft.Column(
                     [
                         ft.Text(title, size=14, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD),
-                        ft.Text(value, size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE)
+                        ft.Text(value, size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE, ref=value_ref)
                     ],
                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                     spacing=5
@@ -87,8 +101,19 @@ class MenuView:
             elevation=4
         )
 
+    def build_products_container(self, products):
+        """Build container holding the products table"""
+        self.products_container = ft.Container(
+            content=self.build_products_table(products),
+            expand=True
+        )
+        return self.products_container
+
     def build_products_table(self, products):
         """Build products table"""
+        self.product_rows = {}
+        self.products_list = None
+
         if not products:
             return ft.Container(
                 content=ft.Text("ยังไม่มีสินค้า", size=16, color=ft.Colors.GREY_600),
@@ -96,77 +121,108 @@ class MenuView:
                 padding=40
             )
 
-        rows = []
-        for product in products:
-            rows.append(
-                ft.Card(
-                    content=ft.Container(
-                        content=ft.Row(
+        rows = [self.create_product_row(product) for product in products]
+
+        self.products_list = ft.Column(rows, spacing=10, scroll=ft.ScrollMode.AUTO)
+        return self.products_list
+
+    def create_product_row(self, product):
+        """Create product row card"""
+        row = ft.Card(
+            content=ft.Container(
+                content=ft.Row(
+                    [
+                        # Product emoji
+                        ft.Text(self.get_product_emoji(product), size=32),
+
+                        # Product info
+                        ft.Column(
                             [
-                                # Product emoji
-                                ft.Text(self.get_product_emoji(product), size=32),
-
-                                # Product info
-                                ft.Column(
-                                    [
-                                        ft.Text(product['name'], size=16, weight=ft.FontWeight.BOLD),
-                                        ft.Text(f"🏷️ {product['category']}", size=12, color=ft.Colors.GREY_600)
-                                    ],
-                                    spacing=2,
-                                    expand=True
-                                ),
+                                ft.Text(product['name'], size=16, weight=ft.FontWeight.BOLD),
+                                ft.Text(f"🏷️ {product['category']}", size=12, color=ft.Colors.GREY_600)
+                            ],
+                            spacing=2,
+                            expand=True
+                        ),
 
-                                # Price
-                                ft.Text(
-                                    f"฿{product['price']:.2f}",
-                                    size=20,
-                                    weight=ft.FontWeight.BOLD,
-                                    color=ft.Colors.GREEN_700
-                                ),
+                        # Price
+                        ft.Text(
+                            f"฿{product['price']:.2f}",
+                            size=20,
+                            weight=ft.FontWeight.BOLD,
+                            color=ft.Colors.GREEN_700
+                        ),
 
-                                # Actions
-                                ft.Row(
-                                    [
-                                        ft.IconButton(
-                                            icon=ft.Icons.EDIT,
-                                            icon_color=ft.Colors.BLUE_700,
-                                            tooltip="แก้ไข",
-                                            on_click=lambda e, p=product: self.edit_product(p)
-                                        ),
-                                        ft.IconButton(
-                                            icon=ft.Icons.DELETE,
-                                            icon_color=ft.Colors.RED_700,
-                                            tooltip="ลบ",
-                                            on_click=lambda e, p=product: self.delete_product(p)
-                                        )
-                                    ],
-                                    spacing=5
+                        # Actions
+                        ft.Row(
+                            [
+                                ft.IconButton(
+                                    icon=ft.Icons.EDIT,
+                                    icon_color=ft.Colors.BLUE_700,
+                                    tooltip="แก้ไข",
+                                    on_click=lambda e, p=product: self.edit_product(p)
+                                ),
+                                ft.IconButton(
+                                    icon=ft.Icons.DELETE,
+                                    icon_color=ft.Colors.RED_700,
+                                    tooltip="ลบ",
+                                    on_click=lambda e, p=product: self.delete_product(p)
                                 )
                             ],
-                            spacing=15,
-                            vertical_alignment=ft.CrossAxisAlignment.CENTER
-                        ),
-                        padding=15
-                    ),
-                    elevation=2
-                )
-            )
+                            spacing=5
+                        )
+                    ],
+                    spacing=15,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER
+                ),
+                padding=15
+            ),
+            elevation=2
+        )
 
-        return ft.Column(rows, spacing=10, scroll=ft.ScrollMode.AUTO)
+        self.product_rows[product['id']] = row
+        return row
+
+    def refresh(self, changes):
+        """Apply data changes made while the view was hidden (rows already follow the catalog)"""
+
+    def on_catalog_change(self, change):
+        """Insert, replace or remove only the rows of changed products"""
+        if self.products_container is None:
+            return
+
+        if change.kind == 'reloaded' or self.products_list is None:
+            self.products_container.content = self.build_products_table(self.app.products)
+            changed = [self.products_container]
+        else:
+            product_id = change.product['id']
+            old_row = self.product_rows.pop(product_id, None)
+            if old_row is not None:
+                self.products_list.controls.remove(old_row)
+
+            if change.kind != 'removed':
+                # Keep the catalog order (category, name)
+                index = self.app.products.index(change.product)
+                self.products_list.controls.insert(index, self.create_product_row(change.product))
+            changed = [self.products_list]
+
+        if self.product_count_ref.current is not None:
+            self.product_count_ref.current.value = str(len(self.app.products))
+            self.category_count_ref.current.value = str(len(self.app.categories))
+            changed += [self.product_count_ref.current, self.category_count_ref.current]
+
+        self.update_controls(*changed)
+
+    def update_controls(self, *controls):
+        """Send a targeted update for controls that are mounted on the page"""
+        # Controls of a hidden (cached) view keep their page but are not in its index
+        mounted = [c for c in controls if c.page is not None and self.page.get_control(c.uid) is c]
+        if mounted:
+            self.page.update(*mounted)
 
     def get_product_emoji(self, product):
         """Get emoji for product"""
-        name = product['name'].lower()
-        emoji_map = {
-            'coffee': '☕', 'tea': '🍵', 'latte': '☕', 'juice': '🧃',
-            'sandwich': '🥪', 'croissant': '🥐', 'salad': '🥗', 'burger': '🍔',
-            'pizza': '🍕', 'pasta': '🍝', 'rice': '🍚', 'wings': '🍗',
-            'cake': '🍰', 'ice cream': '🍦', 'brownie': '🧁'
-        }
-        for keyword, emoji in emoji_map.items():
-            if keyword in name:
-                return emoji
-        return '🍽️'
+        return product_emojis.get(product)
 
     def add_product(self):
         """Add new product - Show dialog"""
@@ -192,12 +248,24 @@ class MenuView:
                 self.page.update()
                 return
 
+            try:
+                price = float(price_field.value)
+            except ValueError:
+                self.show_error("ราคาไม่ถูกต้อง")
+                return
+
             add_dlg.open = False
             self.page.update()
 
+            try:
+                self.app.catalog.add_product(name_field.value.strip(), price, category_dropdown.value)
+            except Exception as ex:
+                self.show_error(f"เกิดข้อผิดพลาด: {str(ex)}")
+                return
+
             # Show success
             self.page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"✅ เพิ่มสินค้า '{name_field.value}' สำเร็จ (Demo)"),
+                content=ft.Text(f"✅ เพิ่มสินค้า '{name_field.value}' สำเร็จ"),
                 bgcolor=ft.Colors.GREEN_700
             )
             self.page.snack_bar.open = True
@@ -242,12 +310,30 @@ class MenuView:
             self.page.update()
 
         def save_changes(e):
+            if not name_field.value or not price_field.value or not category_dropdown.value:
+                self.show_error("กรุณากรอกข้อมูลให้ครบ")
+                return
+
+            try:
+                price = float(price_field.value)
+            except ValueError:
+                self.show_error("ราคาไม่ถูกต้อง")
+                return
+
             edit_dlg.open = False
             self.page.update()
 
+            try:
+                self.app.catalog.update_product(
+                    product['id'], name_field.value.strip(), price, category_dropdown.value
+                )
+            except Exception as ex:
+                self.show_error(f"เกิดข้อผิดพลาด: {str(ex)}")
+                return
+
             # Show success
             self.page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"✅ แก้ไข '{name_field.value}' สำเร็จ (Demo)"),
+                content=ft.Text(f"✅ แก้ไข '{name_field.value}' สำเร็จ"),
                 bgcolor=ft.Colors.BLUE_700
             )
             self.page.snack_bar.open = True
@@ -278,6 +364,11 @@ class MenuView:
 
     def delete_product(self, product):
         """Delete product - Show confirmation dialog"""
+        # Receipts keep referring to sold products, so those stay in the menu
+        if self.db.product_has_sales(product['id']):
+            self.show_error(self.SOLD_PRODUCT_MESSAGE.format(name=product['name']))
+            return
+
         def close_dlg(e):
             delete_dlg.open = False
             self.page.update()
@@ -286,9 +377,19 @@ class MenuView:
             delete_dlg.open = False
             self.page.update()
 
+            try:
+                self.app.catalog.delete_product(product['id'])
+            except sqlite3.IntegrityError:
+                # Sold after the dialog opened
+                self.show_error(self.SOLD_PRODUCT_MESSAGE.format(name=product['name']))
+                return
+            except Exception as ex:
+                self.show_error(f"เกิดข้อผิดพลาด: {str(ex)}")
+                return
+
             # Show success
             self.page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"✅ ลบสินค้า '{product['name']}' สำเร็จ (Demo)"),
+                content=ft.Text(f"✅ ลบสินค้า '{product['name']}' สำเร็จ"),
                 bgcolor=ft.Colors.GREEN_700
             )
             self.page.snack_bar.open = True
@@ -315,3 +416,19 @@ class MenuView:
         self.page.overlay.append(delete_dlg)
         delete_dlg.open = True
         self.page.update()
+
+    def show_error(self, message):
+        """Show error message"""
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Row(
+                [
+                    ft.Icon(ft.Icons.ERROR, color=ft.Colors.WHITE, size=20),
+                    ft.Text(message, size=14, color=ft.Colors.WHITE)
+                ],
+                spacing=10
+            ),
+            bgcolor=ft.Colors.RED_700,
+            duration=3000
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
@@ -5,10 +5,22 @@ Main point of sale interface with products, cart, and checkout
 """
 import flet as ft
 import os
+import threading
 from datetime import datetime
 
+from database.emoji_lookup import product_emojis
+
 
 class POSView:
+    # Lazy product grid: cards materialized up front (viewport + overscan),
+    # cards added per scroll step and distance from the end that triggers it
+    GRID_WINDOW_SIZE = 30
+    GRID_WINDOW_STEP = 30
+    GRID_SCROLL_OVERSCAN = 600
+    SEARCH_DEBOUNCE_SECONDS = 0.15
+    # Sales window used by the best sellers grid order
+    VELOCITY_WINDOW = '7d'
+
     def __init__(self, app):
         """Initialize POS view"""
         self.app = app
@@ -22,11 +34,38 @@ class POSView:
         self.total_text = None
         self.product_grid = None
         self.search_field = None
+        self.search_timer = None
         self.table_number_text = None
+        self.grid_order_button = None
+        self.category_tabs = None
+
+        # Cart row controls keyed by product id
+        self.cart_rows = {}
+
+        # Built product cards keyed by product id, reused between renders
+        self.product_cards = {}
+
+        # Name-ordered grid card lists per category ("All" included), each
+        # holding the cards of its grid window; a tab click swaps them in
+        self.category_cards = {}
+
+        # Category tab buttons keyed by category name: (emoji, button)
+        self.category_buttons = {}
+
+        # Products shown by the grid (only a window of them has cards) and
+        # their cards built so far (the grid holds a copy of the list)
+        self.grid_products = []
+        self.grid_cards = []
+
+        # Grid order: "name" or "velocity" (best sellers first)
+        self.grid_order = "name"
 
         # Table number state
         self.selected_table = 4
 
+        # Rebuild only the cards of products that change
+        self.app.catalog.subscribe(self.on_catalog_change)
+
     def create(self):
         """Create POS view layout"""
         return ft.Row(
@@ -57,10 +96,17 @@ class POSView:
 
     def build_search_bar(self):
         """Build search bar"""
+        self.grid_order_button = ft.OutlinedButton(
+            "🔥 ขายดี",
+            on_click=self.toggle_grid_order,
+            style=self.grid_order_style()
+        )
+
         self.search_field = ft.TextField(
             hint_text="ค้นหาสินค้า...",
             border=ft.InputBorder.NONE,
             expand=True,
+            on_change=self.on_search_change,
             on_submit=self.search_products
         )
 
@@ -74,7 +120,8 @@ class POSView:
                         bgcolor=ft.Colors.GREEN_700,
                         color=ft.Colors.WHITE,
                         on_click=self.search_products
-                    )
+                    ),
+                    self.grid_order_button
                 ],
                 spacing=10
             ),
@@ -86,6 +133,19 @@ class POSView:
 
     def build_category_tabs(self):
         """Build category tabs"""
+        self.category_tabs = ft.Row(
+            self.build_category_buttons(),
+            spacing=10,
+            scroll=ft.ScrollMode.AUTO
+        )
+
+        return ft.Container(
+            content=self.category_tabs,
+            height=50
+        )
+
+    def build_category_buttons(self):
+        """Build the "All" button and one button per category"""
         category_buttons = [
             ft.ElevatedButton(
                 f"ทั้งหมด ({len(self.app.products)})",
@@ -95,32 +155,27 @@ class POSView:
             )
         ]
 
-        category_emojis = {
-            'Beverages': '🥤', 'Food': '🍽️', 'Desserts': '🍰',
-            'Snacks': '🍿', 'Dairy': '🥛', 'Breakfast': '🍳',
-            'Soups': '🍲', 'Pasta': '🍝', 'Burgers': '🍔'
-        }
-
+        # Reuse the buttons of categories that kept their name and emoji
+        buttons = {}
         for category in self.app.categories:
-            emoji = category_emojis.get(category, '🏷️')
-            btn = ft.OutlinedButton(
-                f"{emoji} {category}",
-                on_click=lambda e, c=category: self.filter_by_category(c),
-                style=ft.ButtonStyle(
-                    color=ft.Colors.GREY_700,
-                    side=ft.BorderSide(1, ft.Colors.GREY_300)
+            emoji = self.app.catalog.category_emoji(category)
+            cached = self.category_buttons.get(category)
+            if cached is not None and cached[0] == emoji:
+                btn = cached[1]
+            else:
+                btn = ft.OutlinedButton(
+                    f"{emoji} {category}",
+                    on_click=lambda e, c=category: self.filter_by_category(c),
+                    style=ft.ButtonStyle(
+                        color=ft.Colors.GREY_700,
+                        side=ft.BorderSide(1, ft.Colors.GREY_300)
+                    )
                 )
-            )
+            buttons[category] = (emoji, btn)
             category_buttons.append(btn)
+        self.category_buttons = buttons
 
-        return ft.Container(
-            content=ft.Row(
-                category_buttons,
-                spacing=10,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            height=50
-        )
+        return category_buttons
 
     def build_products_grid(self):
         """Build products grid"""
@@ -130,7 +185,8 @@ class POSView:
             child_aspect_ratio=0.9,
             spacing=15,
             run_spacing=15,
-            expand=True
+            expand=True,
+            on_scroll=self.on_grid_scroll
         )
 
         self.display_products()
@@ -143,56 +199,171 @@ class POSView:
     def display_products(self, products=None):
         """Display products in grid"""
         if products is None:
-            if self.app.active_category == "All":
-                products = self.app.products
-            else:
-                products = [p for p in self.app.products if p['category'] == self.app.active_category]
+            if self.grid_order == "name":
+                self.show_category(self.app.active_category)
+                return
 
-        self.product_grid.controls.clear()
+            self.app.velocity.advance()
+            products = self.app.velocity.ordered(self.category_products(self.app.active_category),
+                                                 self.VELOCITY_WINDOW)
+
+        # Search results and best sellers get a card list of their own
+        self.grid_products = products
+        self.grid_cards = []
+        self.product_grid.controls = []
+        self.extend_product_window(self.GRID_WINDOW_SIZE)
+
+        self.update_controls(self.product_grid)
+
+    def show_category(self, category):
+        """Swap in the category's card list (built on its first display)"""
+        self.grid_products = self.category_products(category)
+        self.grid_cards = self.category_cards.setdefault(category, [])
+        self.product_grid.controls = self.grid_cards
+        if not self.grid_cards:
+            self.extend_product_window(self.GRID_WINDOW_SIZE)
+
+        self.update_controls(self.product_grid)
+
+    def category_products(self, category):
+        """Products of a category in name order (the catalog's own lists)"""
+        if category == "All":
+            return self.app.catalog.all()
+        return self.app.catalog.by_category(category)
+
+    def sync_category_cards(self, categories):
+        """Rebuild the card windows of categories whose products changed (in place)"""
+        for category in categories:
+            cards = self.category_cards.get(category)
+            if cards is not None:
+                products = self.category_products(category)
+                cards[:] = [self.get_product_card(p) for p in products[:max(len(cards), self.GRID_WINDOW_SIZE)]]
+
+    def extend_product_window(self, count):
+        """Materialize cards for the next products in the grid window"""
+        start = len(self.grid_cards)
+        cards = [self.get_product_card(product) for product in self.grid_products[start:start + count]]
+        self.grid_cards.extend(cards)
+        self.product_grid.controls.extend(cards)
+
+    def on_grid_scroll(self, e):
+        """Materialize more cards as the grid is scrolled near its end"""
+        if len(self.grid_cards) >= len(self.grid_products):
+            return
+        if e.max_scroll_extent - e.pixels > self.GRID_SCROLL_OVERSCAN:
+            return
 
-        for product in products:
-            self.product_grid.controls.append(
-                self.create_product_card(product)
-            )
+        self.extend_product_window(self.GRID_WINDOW_STEP)
+        self.update_controls(self.product_grid)
+
+    def toggle_grid_order(self, e=None):
+        """Switch the grid between name order and best sellers first"""
+        self.grid_order = "name" if self.grid_order == "velocity" else "velocity"
+        self.grid_order_button.style = self.grid_order_style()
+        self.update_controls(self.grid_order_button)
+        self.search_products()
+
+    def grid_order_style(self):
+        """Style of the best sellers button (filled while active)"""
+        active = self.grid_order == "velocity"
+        return ft.ButtonStyle(
+            color=ft.Colors.WHITE if active else ft.Colors.ORANGE_700,
+            bgcolor=ft.Colors.ORANGE_700 if active else None,
+            side=ft.BorderSide(1, ft.Colors.ORANGE_700)
+        )
 
-        self.page.update()
+    def get_product_card(self, product):
+        """Get product card, reusing a previously built one"""
+        entry = self.product_cards.get(product['id'])
+        if entry is None or entry['product'] is not product:
+            return self.create_product_card(product)
+
+        # Cart may have changed while the card was off screen
+        qty = self.app.cart.qty(product['id'])
+        entry['badge_text'].value = str(qty)
+        entry['badge'].visible = qty > 0
+        return entry['card']
+
+    def on_catalog_change(self, change):
+        """Refresh the grid when a displayed product changes"""
+        if change.kind == 'reloaded':
+            self.invalidate_product_cards()
+        else:
+            self.invalidate_product_cards([change.product['id']])
+
+            categories = {"All", change.product['category']}
+            if change.previous is not None:
+                categories.add(change.previous['category'])
+            self.sync_category_cards(categories)
+
+            # Skip products outside the active category
+            if self.app.active_category not in categories:
+                return
+
+        if self.product_grid is not None:
+            self.display_products()
+
+    def refresh(self, changes):
+        """Apply data changes made while the view was hidden
+
+        Product cards follow the catalog as it changes (on_catalog_change);
+        only the category tabs are rebuilt here.
+        """
+        if not changes & {'products', 'categories'}:
+            return
+
+        if self.app.active_category != "All" and self.app.active_category not in self.app.categories:
+            self.app.active_category = "All"
+            self.display_products()
+
+        self.category_tabs.controls = self.build_category_buttons()
+        self.update_controls(self.category_tabs)
+
+    def invalidate_product_cards(self, product_ids=None):
+        """Drop cached product cards so they are rebuilt on next display
+
+        With no ids every card goes, the per-category card lists included.
+        """
+        if product_ids is None:
+            self.product_cards.clear()
+            self.category_cards.clear()
+            return
+        for product_id in product_ids:
+            self.product_cards.pop(product_id, None)
 
     def create_product_card(self, product):
         """Create product card"""
         emoji = self.get_product_emoji(product)
 
         # Get quantity in cart for this product
-        qty_in_cart = 0
-        for item in self.app.cart:
-            if item['id'] == product['id']:
-                qty_in_cart = item['qty']
-                break
+        qty_in_cart = self.app.cart.qty(product['id'])
 
-        # Create button content with or without quantity
-        if qty_in_cart > 0:
-            button_content = ft.Row(
-                [
-                    ft.Text("🛒 เพิ่มลงตะกร้า", size=13),
-                    ft.Container(
-                        content=ft.Text(
-                            str(qty_in_cart),
-                            size=11,
-                            weight=ft.FontWeight.BOLD,
-                            color=ft.Colors.WHITE
-                        ),
-                        bgcolor=ft.Colors.RED_700,
-                        border_radius=12,
-                        padding=ft.padding.symmetric(horizontal=8, vertical=3),
-                        alignment=ft.alignment.center
-                    )
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-                spacing=8
-            )
-        else:
-            button_content = ft.Text("🛒 เพิ่มลงตะกร้า", size=13)
+        # Quantity badge, hidden while the product is not in the cart
+        badge_text = ft.Text(
+            str(qty_in_cart),
+            size=11,
+            weight=ft.FontWeight.BOLD,
+            color=ft.Colors.WHITE
+        )
+        badge = ft.Container(
+            content=badge_text,
+            bgcolor=ft.Colors.RED_700,
+            border_radius=12,
+            padding=ft.padding.symmetric(horizontal=8, vertical=3),
+            alignment=ft.alignment.center,
+            visible=qty_in_cart > 0
+        )
 
-        return ft.Card(
+        button_content = ft.Row(
+            [
+                ft.Text("🛒 เพิ่มลงตะกร้า", size=13),
+                badge
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            spacing=8
+        )
+
+        card = ft.Card(
             content=ft.Container(
                 content=ft.Column(
                     [
@@ -240,6 +411,46 @@ class POSView:
             elevation=2
         )
 
+        # Register card so cart changes can patch its badge in place
+        self.product_cards[product['id']] = {
+            'product': product,
+            'card': card,
+            'badge': badge,
+            'badge_text': badge_text
+        }
+
+        return card
+
+    def refresh_product_badges(self, product_ids=None):
+        """Update quantity badges of displayed product cards in place"""
+        if product_ids is None:
+            product_ids = list(self.product_cards.keys())
+
+        changed = []
+        for product_id in product_ids:
+            entry = self.product_cards.get(product_id)
+            if entry is None:
+                continue
+
+            qty = self.app.cart.qty(product_id)
+            qty_text = str(qty)
+            visible = qty > 0
+            if entry['badge_text'].value == qty_text and entry['badge'].visible == visible:
+                continue
+
+            entry['badge_text'].value = qty_text
+            entry['badge'].visible = visible
+            changed.append(entry['badge'])
+
+        self.update_controls(*changed)
+
+    def update_controls(self, *controls):
+        """Send a targeted update for controls that are mounted on the page"""
+        # Controls of a hidden (cached) view keep their page but are not in its index
+        mounted = [c for c in controls if c.page is not None and self.page.get_control(c.uid) is c]
+        if mounted:
+            self.page.update(*mounted)
+
     def build_cart_sidebar(self):
         """Build cart sidebar"""
         self.cart_list = ft.Column(spacing=10, scroll=ft.ScrollMode.AUTO)
@@ -248,6 +459,10 @@ class POSView:
         self.tax_text = ft.Text("฿0.00", size=14)
         self.total_text = ft.Text("฿0.00", size=20, weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN_700)
 
+        # Fill rows for items already in the cart
+        self.cart_rows = {}
+        self.update_cart_display()
+
         # Table number text with ref
         self.table_number_text = ft.Text(
             f"โต๊ะ {self.selected_table}",
@@ -400,189 +615,205 @@ class POSView:
 
     def get_product_emoji(self, product):
         """Get emoji for product"""
-        name = product['name'].lower()
-        category = product.get('category', '').lower()
-
-        emoji_map = {
-            'coffee': '☕', 'tea': '🍵', 'latte': '☕', 'juice': '🧃',
-            'sandwich': '🥪', 'croissant': '🥐', 'salad': '🥗', 'burger': '🍔',
-            'pizza': '🍕', 'pasta': '🍝', 'rice': '🍚', 'wings': '🍗',
-            'cake': '🍰', 'ice cream': '🍦', 'brownie': '🧁'
-        }
-
-        for keyword, emoji in emoji_map.items():
-            if keyword in name:
-                return emoji
-
-        return '🍽️'
+        return product_emojis.get(product)
 
     def filter_by_category(self, category):
         """Filter products by category"""
         self.app.active_category = category
         self.display_products()
 
+    def on_search_change(self, e=None):
+        """Search once typing pauses (restarts the timer on every keystroke)"""
+        if self.search_timer is not None:
+            self.search_timer.cancel()
+        self.search_timer = threading.Timer(self.SEARCH_DEBOUNCE_SECONDS, self.search_products)
+        self.search_timer.daemon = True
+        self.search_timer.start()
+
     def search_products(self, e=None):
         """Search products"""
-        query = self.search_field.value.lower()
+        if e is not None and self.search_timer is not None:
+            # Submit / button search right away
+            self.search_timer.cancel()
+        self.search_timer = None
+
+        query = (self.search_field.value or "").strip()
         if query:
-            products = [p for p in self.app.products if query in p['name'].lower()]
-            self.display_products(products)
+            self.display_products(self.app.search_index.search(query))
         else:
             self.display_products()
 
     def add_to_cart(self, product):
         """Add product to cart"""
-        for item in self.app.cart:
-            if item['id'] == product['id']:
-                item['qty'] += 1
-                item['total'] = item['price'] * item['qty']
-                self.update_cart_display()
-                # Refresh product cards to show updated quantity
-                self.display_products()
-                return
-
-        self.app.cart.append({
-            'id': product['id'],
-            'name': product['name'],
-            'price': product['price'],
-            'category': product['category'],
-            'qty': 1,
-            'total': product['price']
-        })
+        self.app.cart.add(product)
+        self.update_cart_display([product['id']])
+        # Refresh quantity badge of this product card
+        self.refresh_product_badges([product['id']])
+
+    def update_cart_display(self, product_ids=None):
+        """Update cart display (only the rows of product_ids when given)"""
+        if product_ids is None:
+            product_ids = list(self.cart_rows) + [
+                pid for pid in self.app.cart.product_ids() if pid not in self.cart_rows
+            ]
+
+        changed = []
+        rows_changed = False
+
+        for product_id in product_ids:
+            item = self.app.cart.get(product_id)
+            row = self.cart_rows.get(product_id)
+
+            if item is None:
+                # Line removed from cart
+                if row is not None:
+                    self.cart_list.controls.remove(row['card'])
+                    del self.cart_rows[product_id]
+                    rows_changed = True
+            elif row is None:
+                # New line, appended like in the cart
+                row = self.create_cart_row(item)
+                self.cart_rows[product_id] = row
+                self.cart_list.controls.append(row['card'])
+                rows_changed = True
+            else:
+                # Existing line, patch quantity and total in place
+                qty_value = str(item['qty'])
+                total_value = f"฿{item['total']:.2f}"
+                if row['qty_text'].value != qty_value:
+                    row['qty_text'].value = qty_value
+                    changed.append(row['qty_text'])
+                if row['total_text'].value != total_value:
+                    row['total_text'].value = total_value
+                    changed.append(row['total_text'])
+
+        if rows_changed:
+            changed.append(self.cart_list)
+
+        # Totals are kept by the cart
+        self.app.subtotal = self.app.cart.subtotal
+        self.app.tax = self.app.cart.tax
+        self.app.total = self.app.cart.total
 
-        self.update_cart_display()
-        # Refresh product cards to show updated quantity
-        self.display_products()
+        # Update text displays
+        self.subtotal_text.value = f"฿{self.app.subtotal:.2f}"
+        self.tax_text.value = f"฿{self.app.tax:.2f}"
+        self.total_text.value = f"฿{self.app.total:.2f}"
 
-    def update_cart_display(self):
-        """Update cart display"""
-        self.cart_list.controls.clear()
+        self.update_controls(*changed, self.subtotal_text, self.tax_text, self.total_text)
 
-        self.app.subtotal = 0
+    def create_cart_row(self, item):
+        """Create cart row card"""
+        emoji = self.get_product_emoji(item)
 
-        for item in self.app.cart:
-            emoji = self.get_product_emoji(item)
+        qty_text = ft.Text(
+            str(item['qty']),
+            size=14,
+            weight=ft.FontWeight.BOLD,
+            text_align=ft.TextAlign.CENTER
+        )
+        total_text = ft.Text(f"฿{item['total']:.2f}", size=14, weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN_700)
 
-            self.cart_list.controls.append(
-                ft.Card(
-                    content=ft.Container(
-                        content=ft.Column(
+        card = ft.Card(
+            content=ft.Container(
+                content=ft.Column(
+                    [
+                        # Top row: emoji, name, price
+                        ft.Row(
                             [
-                                # Top row: emoji, name, price
-                                ft.Row(
+                                # Large emoji icon
+                                ft.Text(emoji, size=28),
+                                # Item details
+                                ft.Column(
                                     [
-                                        # Large emoji icon
-                                        ft.Text(emoji, size=28),
-                                        # Item details
-                                        ft.Column(
-                                            [
-                                                ft.Text(item['name'], size=13, weight=ft.FontWeight.BOLD),
-                                                ft.Text(f"฿{item['price']:.2f}", size=11, color=ft.Colors.GREY_700)
-                                            ],
-                                            spacing=2,
-                                            expand=True
-                                        ),
-                                        # Total price
-                                        ft.Text(f"฿{item['total']:.2f}", size=14, weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN_700)
+                                        ft.Text(item['name'], size=13, weight=ft.FontWeight.BOLD),
+                                        ft.Text(f"฿{item['price']:.2f}", size=11, color=ft.Colors.GREY_700)
                                     ],
-                                    alignment=ft.MainAxisAlignment.START,
-                                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                                    spacing=12
+                                    spacing=2,
+                                    expand=True
                                 ),
-                                # Bottom row: quantity controls
-                                ft.Row(
-                                    [
-                                        # Decrease button
-                                        ft.IconButton(
-                                            icon=ft.Icons.REMOVE_CIRCLE,
-                                            icon_color=ft.Colors.RED_700,
-                                            icon_size=20,
-                                            on_click=lambda _, i=item: self.decrease_quantity(i),
-                                            tooltip="ลดจำนวน"
-                                        ),
-                                        # Quantity display
-                                        ft.Container(
-                                            content=ft.Text(
-                                                str(item['qty']),
-                                                size=14,
-                                                weight=ft.FontWeight.BOLD,
-                                                text_align=ft.TextAlign.CENTER
-                                            ),
-                                            width=40,
-                                            padding=5,
-                                            bgcolor=ft.Colors.GREY_100,
-                                            border_radius=5,
-                                            alignment=ft.alignment.center
-                                        ),
-                                        # Increase button
-                                        ft.IconButton(
-                                            icon=ft.Icons.ADD_CIRCLE,
-                                            icon_color=ft.Colors.GREEN_700,
-                                            icon_size=20,
-                                            on_click=lambda _, i=item: self.increase_quantity(i),
-                                            tooltip="เพิ่มจำนวน"
-                                        ),
-                                        ft.Container(expand=True),
-                                        # Delete button
-                                        ft.IconButton(
-                                            icon=ft.Icons.DELETE,
-                                            icon_color=ft.Colors.RED_400,
-                                            icon_size=20,
-                                            on_click=lambda _, i=item: self.remove_from_cart(i),
-                                            tooltip="ลบรายการ"
-                                        )
-                                    ],
-                                    alignment=ft.MainAxisAlignment.START,
-                                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                                    spacing=5
-                                )
+                                # Total price
+                                total_text
                             ],
-                            spacing=8
+                            alignment=ft.MainAxisAlignment.START,
+                            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                            spacing=12
                         ),
-                        padding=12
-                    )
-                )
+                        # Bottom row: quantity controls
+                        ft.Row(
+                            [
+                                # Decrease button
+                                ft.IconButton(
+                                    icon=ft.Icons.REMOVE_CIRCLE,
+                                    icon_color=ft.Colors.RED_700,
+                                    icon_size=20,
+                                    on_click=lambda _, i=item: self.decrease_quantity(i),
+                                    tooltip="ลดจำนวน"
+                                ),
+                                # Quantity display
+                                ft.Container(
+                                    content=qty_text,
+                                    width=40,
+                                    padding=5,
+                                    bgcolor=ft.Colors.GREY_100,
+                                    border_radius=5,
+                                    alignment=ft.alignment.center
+                                ),
+                                # Increase button
+                                ft.IconButton(
+                                    icon=ft.Icons.ADD_CIRCLE,
+                                    icon_color=ft.Colors.GREEN_700,
+                                    icon_size=20,
+                                    on_click=lambda _, i=item: self.increase_quantity(i),
+                                    tooltip="เพิ่มจำนวน"
+                                ),
+                                ft.Container(expand=True),
+                                # Delete button
+                                ft.IconButton(
+                                    icon=ft.Icons.DELETE,
+                                    icon_color=ft.Colors.RED_400,
+                                    icon_size=20,
+                                    on_click=lambda _, i=item: self.remove_from_cart(i),
+                                    tooltip="ลบรายการ"
+                                )
+                            ],
+                            alignment=ft.MainAxisAlignment.START,
+                            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                            spacing=5
+                        )
+                    ],
+                    spacing=8
+                ),
+                padding=12
             )
+        )
 
-            self.app.subtotal += item['total']
-
-        # Calculate tax and total
-        self.app.tax = self.app.subtotal * 0.07
-        self.app.total = self.app.subtotal + self.app.tax
-
-        # Update text displays
-        self.subtotal_text.value = f"฿{self.app.subtotal:.2f}"
-        self.tax_text.value = f"฿{self.app.tax:.2f}"
-        self.total_text.value = f"฿{self.app.total:.2f}"
-
-        self.page.update()
+        return {
+            'card': card,
+            'qty_text': qty_text,
+            'total_text': total_text
+        }
 
     def increase_quantity(self, item):
         """Increase item quantity in cart"""
-        item['qty'] += 1
-        item['total'] = item['price'] * item['qty']
-        self.update_cart_display()
-        # Refresh product cards to show updated quantity
-        self.display_products()
+        self.app.cart.increase(item['id'])
+        self.update_cart_display([item['id']])
+        # Refresh quantity badge of this product card
+        self.refresh_product_badges([item['id']])
 
     def decrease_quantity(self, item):
-        """Decrease item quantity in cart"""
-        if item['qty'] > 1:
-            item['qty'] -= 1
-            item['total'] = item['price'] * item['qty']
-            self.update_cart_display()
-            # Refresh product cards to show updated quantity
-            self.display_products()
-        else:
-            # If quantity is 1, remove item from cart
-            self.remove_from_cart(item)
+        """Decrease item quantity in cart (removes item at zero)"""
+        self.app.cart.decrease(item['id'])
+        self.update_cart_display([item['id']])
+        # Refresh quantity badge of this product card
+        self.refresh_product_badges([item['id']])
 
     def remove_from_cart(self, item):
         """Remove item from cart"""
-        self.app.cart.remove(item)
-        self.update_cart_display()
-        # Refresh product cards to remove quantity badge
-        self.display_products()
+        self.app.cart.remove(item['id'])
+        self.update_cart_display([item['id']])
+        # Refresh product card to remove quantity badge
+        self.refresh_product_badges([item['id']])
 
     def on_payment_method_change(self, e):
         """Handle payment method change"""
@@ -661,10 +892,11 @@ class POSView:
 
     def clear_cart(self, e):
         """Clear cart"""
+        product_ids = self.app.cart.product_ids()
         self.app.cart.clear()
-        self.update_cart_display()
+        self.update_cart_display(product_ids)
         # Refresh product cards to remove quantity badges
-        self.display_products()
+        self.refresh_product_badges(product_ids)
 
     def checkout(self, e):
         """Process checkout - Show payment dialog"""
@@ -673,10 +905,27 @@ class POSView:
             self.page.snack_bar.open = True
             self.page.update()
             return
+        if not self.cart_in_menu():
+            return
 
         # Show payment dialog with numpad
         self.show_payment_dialog()
 
+    def cart_in_menu(self):
+        """False (and tell the cashier) if a cart line's product was deleted from the menu
+
+        Such a receipt could never be saved, as its line items reference the product.
+        """
+        removed = [item['name'] for item in self.app.cart if item['id'] not in self.app.catalog]
+        if removed:
+            self.page.snack_bar = ft.SnackBar(
+                content=ft.Text(f"❌ {', '.join(removed)} ถูกลบออกจากเมนูแล้ว กรุณานำออกจากตะกร้าก่อนชำระเงิน"),
+                bgcolor=ft.Colors.RED_700
+            )
+            self.page.snack_bar.open = True
+            self.page.update()
+        return not removed
+
     def show_payment_dialog(self):
         """Show payment dialog with numpad"""
         # Cash received input state
@@ -725,24 +974,32 @@ class POSView:
             """Confirm payment and save receipt"""
             payment_dialog.open = False
             self.page.update()
+            if not self.cart_in_menu():
+                return
 
-            # Save to database
+            # Journal receipt (written to the database in the background)
             try:
-                receipt_id = self.db.save_receipt(
-                    cart=self.app.cart,
+                receipt_no = self.app.receipt_writer.submit(
+                    items=self.app.cart,
                     total=self.app.total,
                     cash_received=self.cash_received,
-                    change=self.cash_received - self.app.total
+                    change=self.cash_received - self.app.total,
+                    payment_method=self.app.payment_method
                 )
+                # Best sellers order is applied on the next grid display, so
+                # cards do not jump around under the cashier after each sale
+                self.app.velocity.record(self.app.cart)
+                self.app.notify_change('receipts')
 
                 # Show receipt dialog
-                self.show_receipt_dialog(receipt_id, self.cash_received, self.cash_received - self.app.total)
+                self.show_receipt_dialog(receipt_no, self.cash_received, self.cash_received - self.app.total)
 
                 # Clear cart
+                product_ids = self.app.cart.product_ids()
                 self.app.cart.clear()
-                self.update_cart_display()
+                self.update_cart_display(product_ids)
                 # Refresh product cards to remove quantity badges
-                self.display_products()
+                self.refresh_product_badges(product_ids)
 
             except Exception as ex:
                 self.page.snack_bar = ft.SnackBar(
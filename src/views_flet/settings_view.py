@@ -79,6 +79,9 @@ class SettingsView:
             expand=True
         )
 
+    def refresh(self, changes):
+        """Settings are only edited in this view; nothing to refresh"""
+
     def build_section(self, title, settings):
         """Build settings section"""
         return ft.Card(
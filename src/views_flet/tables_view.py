@@ -93,6 +93,9 @@ class TablesView:
             expand=True
         )
 
+    def refresh(self, changes):
+        """Tables are only edited in this view; nothing to refresh"""
+
     def display_tables(self):
         """Display all tables"""
         self.tables_list.controls.clear()
@@ -72,6 +72,9 @@ class UsersView:
             expand=True
         )
 
+    def refresh(self, changes):
+        """Users are only edited in this view; nothing to refresh"""
+
     def build_stat_card(self, title, value, color):
         """Build stat card"""
         return ft.Card(
@@ -0,0 +1,59 @@
+"""
+Test Cart model
+"""
+import sys
+import os
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import Cart
+
+
+COFFEE = {'id': 1, 'name': 'Coffee', 'price': 45.0, 'category': 'Beverages'}
+CAKE = {'id': 2, 'name': 'Cake', 'price': 80.0, 'category': 'Desserts'}
+
+
+def test_add_merges_lines_by_product_id():
+    cart = Cart()
+    cart.add(COFFEE)
+    cart.add(CAKE)
+    cart.add(COFFEE)
+
+    assert len(cart) == 2
+    assert cart.qty(1) == 2
+    assert cart.get(1)['total'] == 90.0
+    assert [item['id'] for item in cart] == [1, 2]
+
+
+def test_totals_follow_every_change():
+    cart = Cart()
+    cart.add(COFFEE, qty=3)
+    cart.add(CAKE)
+    assert cart.subtotal == 215.0
+
+    cart.decrease(1)
+    cart.increase(2)
+    assert cart.subtotal == 250.0
+    assert round(cart.tax, 2) == 17.5
+    assert round(cart.total, 2) == 267.5
+
+    cart.remove(1)
+    cart.decrease(2)
+    cart.decrease(2)
+    assert not cart
+    assert cart.subtotal == 0.0
+    assert cart.qty(2) == 0
+
+
+def test_save_receipt_accepts_cart(make_db):
+    db = make_db([("Coffee", 45.0, "Beverages")])
+
+    cart = Cart()
+    cart.add(COFFEE, qty=2)
+    receipt_id = db.save_receipt(cart, cart.total, 100.0, 100.0 - cart.total)
+
+    receipt = db.get_receipt_by_id(receipt_id)
+    assert [(item['id'], item['qty'], item['total']) for item in receipt['items']] == [(1, 2, 90.0)]
+    db.close()
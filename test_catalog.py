@@ -0,0 +1,70 @@
+"""
+Test ProductCatalog indexes and change events
+"""
+import sys
+import os
+import sqlite3
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import ProductCatalog
+
+
+PRODUCTS = [("Latte", 55.0, "Beverages"), ("Green Tea", 40.0, "Beverages"), ("Chocolate Cake", 80.0, "Desserts")]
+
+
+def test_indexes_match_database(make_db):
+    db = make_db(PRODUCTS)
+    catalog = ProductCatalog(db)
+    catalog.load()
+
+    assert [p['name'] for p in catalog.all()] == [p['name'] for p in db.get_all_products()]
+    assert catalog.categories() == db.get_all_categories()
+    assert [p['name'] for p in catalog.by_category("Beverages")] == ["Green Tea", "Latte"]
+    assert [p['name'] for p in catalog.search_prefix("ca")] == ["Chocolate Cake"]
+    assert [p['name'] for p in catalog.search_prefix("t")] == ["Green Tea"]
+    db.close()
+
+
+def test_changes_update_indexes_and_notify(make_db):
+    db = make_db(PRODUCTS)
+    catalog = ProductCatalog(db)
+    catalog.load()
+    events = []
+    catalog.subscribe(events.append)
+
+    cookie = catalog.add_product("Cookie", 25.0, "Desserts")
+    latte = catalog.search_prefix("latte")[0]
+    catalog.update_product(latte['id'], "Iced Latte", 60.0, "Cold Drinks")
+    catalog.delete_product(cookie['id'])
+
+    assert [e.kind for e in events] == ['added', 'updated', 'removed']
+    assert events[1].previous is latte
+    assert catalog.get(latte['id'])['category'] == "Cold Drinks"
+    assert [p['name'] for p in catalog.by_category("Beverages")] == ["Green Tea"]
+    assert [p['name'] for p in catalog.search_prefix("latte")] == ["Iced Latte"]
+    assert [p['name'] for p in catalog.search_prefix("iced")] == ["Iced Latte"]
+    assert cookie['id'] not in catalog
+    assert [p['name'] for p in catalog.all()] == [p['name'] for p in db.get_all_products()]
+    db.close()
+
+
+def test_sold_products_cannot_be_deleted(make_db):
+    db = make_db(PRODUCTS)
+    catalog = ProductCatalog(db)
+    catalog.load()
+    latte, tea = catalog.search_prefix("latte")[0], catalog.search_prefix("green")[0]
+    db.save_receipts([{'items': [{'id': latte['id'], 'name': latte['name'], 'price': 55.0, 'qty': 1, 'total': 55.0}],
+                       'total': 55.0, 'cash_received': 55.0, 'change': 0.0}])
+
+    assert db.product_has_sales(latte['id']) and not db.product_has_sales(tea['id'])
+    with pytest.raises(sqlite3.IntegrityError):
+        catalog.delete_product(latte['id'])
+    assert catalog.get(latte['id']) == latte and db.get_product_by_id(latte['id']) is not None
+
+    assert catalog.delete_product(tea['id'])
+    assert tea['id'] not in catalog
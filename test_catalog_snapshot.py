@@ -0,0 +1,75 @@
+"""
+Test the binary catalog snapshot and its staleness check
+"""
+import sys
+import os
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import CategoryRecord, ProductCatalog, ProductRecord, load_snapshot, save_snapshot, snapshot_path
+
+
+PRODUCTS = [
+    ("ลาเต้เย็น", 55.0, "เครื่องดื่ม"),
+    ("Espresso", 45.5, "Beverages"),
+    ("Brownie", 60.0, "ขนม"),
+]
+
+
+def test_roundtrip(tmp_path):
+    path = str(tmp_path / "catalog.snap")
+    categories = [CategoryRecord(2, "Beverages", "🥤"), CategoryRecord(5, "Snacks"), CategoryRecord(1, "เครื่องดื่ม")]
+    products = [ProductRecord(7, "ลาเต้เย็น", 55.0, "เครื่องดื่ม"), ProductRecord(9, "Espresso", 45.5, "Beverages")]
+
+    save_snapshot(path, 3, categories, products)
+
+    assert load_snapshot(path, 3) == (categories, products)
+    assert load_snapshot(path, 4) is None
+    assert load_snapshot(str(tmp_path / "missing.snap"), 3) is None
+    assert snapshot_path(str(tmp_path / "pos.db")) == str(tmp_path / "pos_catalog.snap")
+
+
+def test_damaged_snapshot_is_ignored(tmp_path):
+    path = str(tmp_path / "catalog.snap")
+    save_snapshot(path, 1, [CategoryRecord(1, "Beverages")], [ProductRecord(1, "Espresso", 45.5, "Beverages")])
+    data = open(path, "rb").read()
+
+    for damaged in (data[:-3], data[:20], data + b"x", b"", b"garbage" + data):
+        with open(path, "wb") as f:
+            f.write(damaged)
+        assert load_snapshot(path, 1) is None
+
+
+def test_catalog_uses_snapshot_until_products_change(make_db):
+    db = make_db(PRODUCTS)
+    path = snapshot_path(db.db_path)
+
+    catalog = ProductCatalog(db, snapshot_path=path)
+    catalog.load()
+    assert load_snapshot(path, db.get_catalog_version()) == (db.get_categories(), db.get_all_products())
+
+    # Changes through the catalog keep the snapshot current
+    record = catalog.add_product("Mocha", 65.0, "Beverages")
+    assert load_snapshot(path, db.get_catalog_version()) == (catalog.category_records(), catalog.all())
+
+    # A change made elsewhere makes it stale: the next load reads the database
+    db.update_product(record.id, "Mocha", 70.0, "Beverages")
+    assert load_snapshot(path, db.get_catalog_version()) is None
+
+    fresh = ProductCatalog(db, snapshot_path=path)
+    fresh.load()
+    assert fresh.get(record.id)['price'] == 70.0
+    assert load_snapshot(path, db.get_catalog_version()) == (db.get_categories(), db.get_all_products())
+
+    # Category renames go through the database and reload
+    catalog.update_category("ขนม", "Desserts")
+    assert "Desserts" in catalog.categories()
+    assert load_snapshot(path, db.get_catalog_version()) == (catalog.category_records(), catalog.all())
+
+
+def test_empty_catalog(tmp_path):
+    path = str(tmp_path / "catalog.snap")
+    save_snapshot(path, 0, [], [])
+    assert load_snapshot(path, 0) == ([], [])
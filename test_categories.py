@@ -0,0 +1,109 @@
+"""
+Test the categories table and its migration from category names on products
+"""
+import sys
+import os
+import json
+import sqlite3
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager, ProductCatalog
+from database import migrations
+
+
+def test_migrates_category_names(tmp_path, monkeypatch):
+    emojis = tmp_path / "category_emojis.json"
+    emojis.write_text(json.dumps({'Beverages': '🧋', 'Empty': '🫙'}), encoding="utf-8")
+    monkeypatch.setattr(migrations, "LEGACY_CATEGORY_EMOJIS_PATH", str(emojis))
+
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE products (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                               price REAL NOT NULL, category TEXT NOT NULL,
+                               created_at TIMESTAMP, updated_at TIMESTAMP);
+        INSERT INTO products (id, name, price, category) VALUES (3, 'Latte', 55, 'Beverages');
+        INSERT INTO products (id, name, price, category) VALUES (5, 'Brownie', 60, 'Desserts');
+        INSERT INTO products (id, name, price, category) VALUES (8, '_placeholder_Empty', 0, 'Empty');
+    """)
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+
+    assert [(c.name, c.emoji) for c in db.get_categories()] == [
+        ('Beverages', '🧋'), ('Desserts', '🍰'), ('Empty', '🫙')
+    ]
+    assert [(p.id, p.name, p.category) for p in db.get_all_products()] == [
+        (3, 'Latte', 'Beverages'), (5, 'Brownie', 'Desserts')
+    ]
+    assert [p['name'] for p in db.search_products("latte")] == ["Latte"]
+    assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.conn.execute("INSERT INTO products (name, price, category_id) VALUES ('Tea', 30, 99)")
+    db.close()
+
+
+def test_rename_touches_one_row(make_db):
+    db = make_db()
+    latte = db.add_product("Latte", 55.0, "Beverages")
+    category_id = db.get_category_id("Beverages")
+    version = db.get_catalog_version()
+
+    assert db.update_category("Beverages", "Drinks")
+
+    assert db.get_category_id("Drinks") == category_id
+    assert db.get_product_by_id(latte)['category'] == "Drinks"
+    assert db.conn.execute("SELECT category_id FROM products WHERE id = ?", (latte,)).fetchone()[0] == category_id
+    assert db.get_catalog_version() == version + 1
+    db.close()
+
+
+def test_empty_categories_merge_and_delete(make_db):
+    db = make_db()
+    catalog = ProductCatalog(db)
+    catalog.load()
+
+    assert catalog.add_category("Snacks", "🍘")
+    assert not catalog.add_category("Snacks")
+    assert catalog.categories() == ["Snacks"]
+    assert catalog.category_emoji("Snacks") == "🍘"
+
+    catalog.add_product("Latte", 55.0, "Beverages")
+    catalog.add_product("Chips", 20.0, "Snacks")
+    assert catalog.category_emoji("Beverages") == "🥤"
+
+    # Renaming onto an existing category merges the two
+    assert catalog.update_category("Snacks", "Beverages")
+    assert catalog.categories() == ["Beverages"]
+    assert [p['name'] for p in catalog.by_category("Beverages")] == ["Chips", "Latte"]
+
+    assert catalog.delete_category("Beverages")
+    assert catalog.categories() == ["อื่นๆ"]
+    assert len(catalog.by_category("อื่นๆ")) == 2
+    assert catalog.categories() == db.get_all_categories()
+    db.close()
+
+
+def test_migration_recovers_from_interrupted_rebuild(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE products (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                               price REAL NOT NULL, category TEXT NOT NULL);
+        INSERT INTO products (name, price, category) VALUES ('Latte', 55, 'Beverages');
+        CREATE TABLE products_new (id INTEGER PRIMARY KEY);
+    """)
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+    assert [(p.name, p.category) for p in db.get_all_products()] == [('Latte', 'Beverages')]
+    assert db.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'products_new'").fetchone() is None
+    db.close()
@@ -0,0 +1,127 @@
+"""
+Test connection pool: read-only per-thread readers, one writer, concurrent load
+"""
+import sys
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import ReportEngine
+from database.pool import ConnectionPool
+
+
+ITEM = {'id': 1, 'name': 'Coffee', 'price': 45.0, 'qty': 2, 'total': 90.0}
+PRODUCTS = [("Coffee", 45.0, "Drinks")]
+
+
+def test_readers_are_read_only_and_per_thread(make_db):
+    db = make_db(PRODUCTS)
+    with db.reader() as conn:
+        with db.reader() as nested:
+            assert nested is conn
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM products")
+
+        with ThreadPoolExecutor(1) as executor:
+            other = executor.submit(lambda: db.reader().__enter__()).result()
+        assert other is not conn
+
+
+def test_readers_do_not_wait_for_writes(make_db):
+    db = make_db(PRODUCTS)
+    db.save_receipt([ITEM], 90.0, 100.0, 10.0)
+
+    with db.write_transaction() as cursor:
+        cursor.execute("DELETE FROM receipts")
+        with ThreadPoolExecutor(1) as executor:
+            seen = executor.submit(lambda: db.get_sales_summary()['total_receipts']).result(timeout=2)
+        assert seen == 1
+
+    assert db.get_sales_summary()['total_receipts'] == 0
+
+
+def test_checkouts_wait_for_a_free_reader(make_db, tmp_path):
+    make_db(PRODUCTS).close()
+    pool = ConnectionPool(str(tmp_path / "pos.db"), readers=1)
+    released = threading.Event()
+
+    def hold():
+        with pool.reader():
+            released.wait(2)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    with ThreadPoolExecutor(1) as executor:
+        waiting = executor.submit(lambda: pool.reader().__enter__())
+        assert not waiting.done()
+        released.set()
+        assert waiting.result(timeout=2) is pool._readers[0]
+    holder.join()
+    assert len(pool._readers) == 1
+    pool.close()
+
+
+def test_checkout_and_reports_under_load(make_db):
+    db = make_db(PRODUCTS)
+    reports = ReportEngine(db)
+    done = threading.Event()
+    errors = []
+
+    def checkout():
+        for _ in range(50):
+            db.save_receipt([ITEM], 90.0, 100.0, 10.0)
+
+    def report_load():
+        while not done.is_set():
+            with db.reader() as conn:
+                conn.execute("BEGIN")
+                receipts = conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0]
+                rollup = conn.execute("SELECT COALESCE(SUM(receipts), 0) FROM daily_sales").fetchone()[0]
+            # A snapshot never sees a receipt without its rollup
+            assert receipts == rollup
+            report = reports.generate('daily')
+            assert report['sales'] == 90.0 * report['receipts']
+            db.search_receipts(limit=10)
+
+    def run(fn):
+        try:
+            fn()
+        except Exception as e:  # collected and re-raised below
+            errors.append(e)
+
+    readers = [threading.Thread(target=run, args=(report_load,)) for _ in range(4)]
+    writers = [threading.Thread(target=run, args=(checkout,)) for _ in range(4)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert db.get_sales_summary()['total_receipts'] == 200
+    assert reports.generate('daily')['by_product'][0]['qty'] == 400
+
+
+def test_nested_write_transaction_commits_once(make_db):
+    db = make_db()
+    with db.write_transaction():
+        db.add_category("Beverages")
+        assert db.conn.in_transaction
+        assert db.get_category_id("Beverages") is None  # readers see committed data only
+
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.write_transaction() as cursor:
+                cursor.execute("INSERT INTO categories (name) VALUES ('Snacks')")
+                cursor.execute("INSERT INTO categories (name) VALUES ('Snacks')")
+
+    assert db.get_all_categories() == ["Beverages"]
+    db.close()
@@ -0,0 +1,38 @@
+"""
+Test product emoji lookup
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.emoji_lookup import EmojiLookup, PRODUCT_KEYWORD_EMOJIS, product_emojis
+
+
+def keyword_scan(name):
+    """Reference: the per-render keyword loop the lookup replaces"""
+    for keyword, emoji in PRODUCT_KEYWORD_EMOJIS.items():
+        if keyword in name.lower():
+            return emoji
+    return '🍽️'
+
+
+def test_matches_keyword_scan_priority():
+    names = ['Iced Latte', 'Ice Cream Cake', 'Green Tea Latte', 'Chicken Wings',
+             'Fried Rice Burger', 'Water', 'Steak', 'Brownie with ice cream']
+    for name in names:
+        assert product_emojis.match(name) == keyword_scan(name), name
+
+
+def test_category_fallback_and_cache_refresh():
+    lookup = EmojiLookup({'cake': '🍰'}, {'drinks': '🥤'}, default='🛒')
+    product = {'id': 7, 'name': 'Cola', 'category': 'Drinks'}
+    assert lookup.get(product) == '🥤'
+
+    # Renamed product is resolved again
+    product['name'] = 'Cola Cake'
+    assert lookup.get(product) == '🍰'
+
+    lookup.build([{'id': 8, 'name': 'Soap', 'category': 'Other'}])
+    assert lookup.get({'id': 8, 'name': 'Soap', 'category': 'Other'}) == '🛒'
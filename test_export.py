@@ -0,0 +1,82 @@
+"""
+Test streaming receipt export
+"""
+import sys
+import os
+import csv
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database.export import export_receipts, load_state, main
+
+
+PRODUCTS = [("กาแฟ", 45.0, "Drinks")]
+
+
+def add_receipts(db, count):
+    item = {'id': 1, 'name': 'กาแฟ', 'price': 45.0, 'qty': 2, 'total': 90.0}
+    db.save_receipts([{'items': [item, item], 'total': 180.0, 'cash_received': 200.0, 'change': 20.0}
+                      for _ in range(count)])
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_export_in_chunks(make_db, tmp_path):
+    db = make_db(PRODUCTS)
+    add_receipts(db, 23)
+    out = str(tmp_path / "out")
+    results = export_receipts(db.db_path, out, chunk_size=5)
+
+    receipts = read_csv(results['receipts']['path'])
+    items = read_csv(results['receipt_items']['path'])
+    assert results['receipts']['path'].endswith("receipts_1-23.csv")
+    assert [int(r['id']) for r in receipts] == list(range(1, 24))
+    assert len(items) == results['receipt_items']['rows'] == 46
+    assert items[0]['product_name'] == 'กาแฟ' and float(items[0]['total']) == 90.0
+    assert load_state(out) == {'receipts': 23, 'receipt_items': 46}
+    assert sorted(os.listdir(out)) == ['export_state.json', 'receipt_items_1-46.csv', 'receipts_1-23.csv']
+
+
+def test_incremental_export_only_writes_new_rows(make_db, tmp_path, capsys):
+    db = make_db(PRODUCTS)
+    add_receipts(db, 3)
+    out = str(tmp_path / "out")
+    export_receipts(db.db_path, out, incremental=True)
+
+    add_receipts(db, 2)
+    results = export_receipts(db.db_path, out, incremental=True)
+    assert [r['id'] for r in read_csv(results['receipts']['path'])] == ['4', '5']
+    assert results['receipt_items']['rows'] == 4
+
+    main(["--db", db.db_path, "--out", out, "--incremental"])
+    assert "nothing new to export" in capsys.readouterr().out
+    assert load_state(out) == {'receipts': 5, 'receipt_items': 10}
+
+
+def test_columnar_formats(make_db, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    db = make_db(PRODUCTS)
+    add_receipts(db, 12)
+    out = str(tmp_path / "out")
+    parquet = export_receipts(db.db_path, out, fmt='parquet', chunk_size=5)
+    assert pq.read_table(parquet['receipts']['path']).column('id').to_pylist() == list(range(1, 13))
+
+    arrow = export_receipts(db.db_path, out, fmt='arrow', chunk_size=5)
+    with pa.ipc.open_file(arrow['receipt_items']['path']) as reader:
+        assert reader.read_all().num_rows == 24
+
+
+def test_unknown_format(make_db, tmp_path):
+    db = make_db(PRODUCTS)
+    add_receipts(db, 1)
+    with pytest.raises(ValueError):
+        export_receipts(db.db_path, str(tmp_path / "out"), fmt='xlsx')
@@ -0,0 +1,76 @@
+"""
+Test connection profiles and schema migrations
+"""
+import sys
+import os
+import sqlite3
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+from database.connection import open_connection
+from database.migrations import MIGRATIONS, migrate
+
+
+def test_new_database_gets_latest_schema(make_db):
+    db = make_db()
+
+    assert db.schema_version == MIGRATIONS[-1][0]
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    # Migrations run once
+    assert migrate(db.conn) == db.schema_version
+    versions = [row[0] for row in db.conn.execute("SELECT version FROM schema_version")]
+    assert versions == [step for step, _, _ in MIGRATIONS]
+
+
+def test_upgrades_database_in_place(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE products (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                               price REAL NOT NULL, category TEXT NOT NULL,
+                               created_at TIMESTAMP, updated_at TIMESTAMP);
+        INSERT INTO products (name, price, category) VALUES ('Latte', 55, 'Beverages');
+    """)
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+    assert db.schema_version == MIGRATIONS[-1][0]
+    assert [p['name'] for p in db.search_products("latte")] == ["Latte"]
+    assert db.get_sales_summary()['total_receipts'] == 0
+
+
+def test_profiles(tmp_path):
+    conn = open_connection(str(tmp_path / "a.db"), "network_share")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+
+    with pytest.raises(ValueError):
+        open_connection(str(tmp_path / "b.db"), "nope")
+
+
+def test_failed_migration_rolls_back_and_raises(tmp_path, monkeypatch):
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TRIGGER half_done_insert AFTER INSERT ON half_done BEGIN SELECT 1; END")
+        raise sqlite3.OperationalError("step failed")
+
+    path = str(tmp_path / "pos.db")
+    DatabaseManager(path).close()
+    monkeypatch.setattr("database.migrations.MIGRATIONS", MIGRATIONS + [(MIGRATIONS[-1][0] + 1, "Broken", broken)])
+
+    with pytest.raises(sqlite3.OperationalError):
+        DatabaseManager(path)
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'half_done%'").fetchall() == []
+    assert conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] == MIGRATIONS[-1][0]
+    conn.close()
@@ -0,0 +1,57 @@
+"""
+Test full-text product search in SQLite
+"""
+import sys
+import os
+import sqlite3
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+
+
+PRODUCTS = [("Latte", 50.0, "Beverages"), ("Iced Latte", 50.0, "Beverages"),
+            ("Chocolate Cake", 50.0, "Desserts"), ("ข้าวผัดกะเพรา", 50.0, "อาหาร")]
+
+
+def test_ranked_search(make_db):
+    db = make_db(PRODUCTS)
+
+    assert [p['name'] for p in db.search_products_ranked("latte")] == ["Latte", "Iced Latte"]
+    assert [p['name'] for p in db.search_products_ranked("ผัดกะ")] == ["ข้าวผัดกะเพรา"]
+    assert [p['name'] for p in db.search_products_ranked("te")] == ["Chocolate Cake", "Iced Latte", "Latte"]
+    assert db.search_products_ranked('50% "off"') == []
+
+
+def test_index_follows_product_changes(make_db):
+    db = make_db(PRODUCTS)
+    product_id = db.add_product("Green Tea", 40.0, "Beverages")
+    assert [p['id'] for p in db.search_products("green")] == [product_id]
+
+    db.update_product(product_id, "Matcha", 40.0, "Beverages")
+    assert db.search_products("green") == []
+    assert [p['id'] for p in db.search_products("matcha")] == [product_id]
+
+    db.delete_product(product_id)
+    assert db.search_products("matcha") == []
+
+
+def test_migrates_database_without_index(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE products (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                               price REAL NOT NULL, category TEXT NOT NULL);
+        INSERT INTO products (name, price, category) VALUES ('Iced Americano', 45, 'Beverages');
+    """)
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+    assert [p['name'] for p in db.search_products_ranked("americano")] == ["Iced Americano"]
+    assert db.fts_enabled
+
+    db.add_product("Hot Americano", 40.0, "Beverages")
+    assert len(db.search_products_ranked("americano")) == 2
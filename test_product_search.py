@@ -0,0 +1,71 @@
+"""
+Test ProductSearchIndex results
+"""
+import sys
+import os
+import random
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import ProductCatalog, ProductSearchIndex
+from database.search import normalize
+
+
+WORDS = ["iced", "hot", "latte", "mocha", "green", "tea", "cake", "rice",
+         "ข้าว", "ผัด", "กะเพรา", "ต้มยำ", "น้ำ", "ชา", "เย็น", "ไก่"]
+
+
+def make_products(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        {'id': i + 1,
+         'name': " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f" {i}",
+         'price': 50.0,
+         'category': f"Category {i % 10}"}
+        for i in range(count)
+    ]
+
+
+def naive_search(catalog, query):
+    q = normalize(query.strip())
+    return [p for p in catalog.all() if q in normalize(p['name'])]
+
+
+def test_matches_substring_scan():
+    catalog = ProductCatalog()
+    catalog.load(make_products(2000))
+    index = ProductSearchIndex(catalog)
+
+    for query in ["l", "la", "LATTE", "tte m", "ข้าวผัด", "ขาวผด", "น้ำ ชา", "12", "zzz", "ice"]:
+        assert index.search(query) == naive_search(catalog, query), query
+
+
+def test_thai_tone_marks_are_ignored():
+    catalog = ProductCatalog()
+    catalog.load([{'id': 1, 'name': "ข้าวผัดกะเพรา", 'price': 60.0, 'category': "อาหาร"}])
+    index = ProductSearchIndex(catalog)
+
+    assert [p['id'] for p in index.search("ขาวผัด")] == [1]
+    assert [p['id'] for p in index.search("ข้าวผัด")] == [1]
+
+
+def test_follows_catalog_changes(make_db):
+    db = make_db([("Latte", 55.0, "Beverages")])
+
+    catalog = ProductCatalog(db)
+    catalog.load()
+    index = ProductSearchIndex(catalog)
+    assert len(index.search("lat")) == 1
+
+    added = catalog.add_product("Iced Latte", 65.0, "Beverages")
+    assert [p['name'] for p in index.search("lat")] == ["Iced Latte", "Latte"]
+
+    catalog.update_product(added.id, "Iced Mocha", 65.0, "Beverages")
+    assert [p['name'] for p in index.search("lat")] == ["Latte"]
+    assert [p['name'] for p in index.search("moc")] == ["Iced Mocha"]
+
+    catalog.delete_product(added.id)
+    assert index.search("moc") == []
+
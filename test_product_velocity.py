@@ -0,0 +1,95 @@
+"""
+Test hourly product sales and rolling velocity counters
+"""
+import sys
+import os
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager, ProductVelocity
+
+
+def line(product_id, qty):
+    return {'id': product_id, 'name': f"Product {product_id}", 'price': 10.0, 'qty': qty, 'total': 10.0 * qty}
+
+
+PRODUCTS = [(f"Product {i}", 10.0, "Test") for i in (1, 2, 3)]
+SALES = [
+    {'items': [line(1, 2), line(2, 1)], 'total': 30.0, 'cash_received': 30.0, 'change': 0.0,
+     'date': "2024-03-10 09:10:00"},
+    {'items': [line(1, 1)], 'total': 10.0, 'cash_received': 10.0, 'change': 0.0,
+     'date': "2024-03-10 09:50:00"},
+    {'items': [line(2, 5)], 'total': 50.0, 'cash_received': 50.0, 'change': 0.0,
+     'date': "2024-03-01 12:00:00"},
+    {'items': [line(3, 9)], 'total': 90.0, 'cash_received': 90.0, 'change': 0.0,
+     'date': "2024-01-01 12:00:00"},
+]
+
+
+def test_hourly_sales_follow_receipts(make_db):
+    db = make_db(PRODUCTS)
+    db.save_receipts(SALES)
+    top = db.get_top_products("2024-03-01")
+    assert [(row['product_id'], row['qty']) for row in top] == [(2, 6), (1, 3)]
+    assert [(row['product_id'], row['qty']) for row in db.get_top_products("2024-03-10 09:00:00")] == [
+        (1, 3), (2, 1)]
+
+    receipt_id = db.conn.execute("SELECT id FROM receipts WHERE total = 50").fetchone()[0]
+    db.conn.execute("DELETE FROM receipts WHERE id = ?", (receipt_id,))
+    db.conn.commit()
+    assert [(row['product_id'], row['qty']) for row in db.get_top_products("2024-03-01")] == [(1, 3), (2, 1)]
+
+    # Migration backfills databases that had receipts before the table
+    db.conn.execute("DELETE FROM product_sales_hourly")
+    db.conn.execute("DELETE FROM schema_version WHERE version >= 8")
+    db.conn.commit()
+    db.close()
+    db = DatabaseManager(db.db_path)
+    assert [row['product_id'] for row in db.get_top_products("2024-01-01")] == [3, 1, 2]
+
+
+def test_windows_roll_forward(make_db):
+    db = make_db(PRODUCTS)
+    db.save_receipts(SALES)
+    velocity = ProductVelocity(db, now="2024-03-10 09:59:00")
+    assert velocity.counts(1) == {'hour': 3, 'today': 3, '7d': 3, '30d': 3}
+    assert velocity.counts(2) == {'hour': 1, 'today': 1, '7d': 1, '30d': 6}
+    assert velocity.get(3, '30d') == 0
+
+    velocity.record([line(3, 4)], when="2024-03-10 10:05:00")
+    assert velocity.counts(1)['hour'] == 0
+    assert velocity.counts(3) == {'hour': 4, 'today': 4, '7d': 4, '30d': 4}
+    assert velocity.top('7d') == [3, 1, 2]
+
+    velocity.advance("2024-03-11 00:30:00")
+    assert velocity.get(3, 'today') == 0 and velocity.get(3, '7d') == 4
+
+    velocity.advance("2024-03-20 13:00:00")
+    assert velocity.counts(2) == {'hour': 0, 'today': 0, '7d': 0, '30d': 6}
+    assert [p['id'] for p in velocity.ordered([{'id': 1}, {'id': 2}, {'id': 3}], '30d')] == [2, 3, 1]
+    assert [p['id'] for p in velocity.ordered([{'id': 1}, {'id': 2}, {'id': 3}], '7d')] == [1, 2, 3]
+
+    # Long idle gap empties every window
+    velocity.advance("2025-01-01 00:00:00")
+    assert velocity.top('30d') == [] and velocity._buckets == {}
+
+
+def test_sales_recorded_while_loading_are_counted_once(make_db):
+    db = make_db(PRODUCTS)
+    db.save_receipts(SALES)
+    now = "2024-03-10 09:59:00"
+    velocity = ProductVelocity(now=now)
+    last_receipt = db.get_last_receipt_id()
+
+    # Checkout while history loads: one sale already committed, one still queued
+    sale = {'items': [line(3, 2)], 'total': 20.0, 'cash_received': 20.0, 'change': 0.0,
+            'date': "2024-03-10 09:55:00"}
+    db.save_receipts([sale])
+    velocity.record(sale['items'], when=sale['date'])
+    velocity.record([line(3, 1)], when=now)
+
+    velocity.merge(ProductVelocity(db, now=now, up_to_receipt=last_receipt))
+    assert velocity.counts(1) == {'hour': 3, 'today': 3, '7d': 3, '30d': 3}
+    assert velocity.counts(3) == {'hour': 3, 'today': 3, '7d': 3, '30d': 3}
@@ -0,0 +1,66 @@
+"""
+Test integer receipt timestamps and date range queries
+"""
+import sys
+import os
+import sqlite3
+from datetime import date, datetime
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+from database.db_manager import to_timestamp
+
+
+def make_old_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE receipts (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL,
+                               total REAL NOT NULL, cash_received REAL NOT NULL,
+                               change REAL NOT NULL, created_at TIMESTAMP);
+        INSERT INTO receipts (date, total, cash_received, change) VALUES
+            ('2024-01-31 23:59:59', 100, 100, 0),
+            ('2024-02-01 00:00:00', 200, 200, 0),
+            ('2024-02-15 12:30:00', 300, 300, 0),
+            ('2024-03-01 00:00:00', 400, 400, 0);
+    """)
+    conn.commit()
+    conn.close()
+
+
+def test_migration_converts_text_dates(tmp_path):
+    path = str(tmp_path / "old.db")
+    make_old_db(path)
+    db = DatabaseManager(path)
+
+    rows = db.conn.execute("SELECT date, date_ts FROM receipts").fetchall()
+    assert all(row['date_ts'] == to_timestamp(row['date']) for row in rows)
+
+    february = db.receipts_between(date(2024, 2, 1), date(2024, 3, 1))
+    assert [r['total'] for r in february] == [200.0, 300.0]
+    assert db.sales_between("2024-01-01", "2024-12-31") == {'receipts': 4, 'sales': 1000.0}
+    assert db.receipts_between(datetime(2024, 2, 1), "2024-02-15 12:30:00") == february[:1]
+
+
+def test_new_and_changed_receipts_get_timestamps(make_db):
+    db = make_db()
+    db.save_receipts([{'items': [], 'total': 50.0, 'cash_received': 50.0, 'change': 0.0,
+                       'date': "2024-05-01 08:00:00"}])
+    db.conn.execute("INSERT INTO receipts (date, total, cash_received, change) "
+                    "VALUES ('2024-05-02 09:00:00', 60, 60, 0)")
+    db.conn.execute("UPDATE receipts SET date = '2024-06-01 10:00:00' WHERE total = 50")
+    db.conn.commit()
+
+    assert [r['total'] for r in db.receipts_between("2024-05-01", "2024-06-01")] == [60.0]
+    assert [r['total'] for r in db.receipts_between("2024-06-01", "2024-06-02")] == [50.0]
+
+
+def test_range_totals_use_covering_index(make_db):
+    db = make_db()
+    plan = " ".join(row[3] for row in db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*), SUM(total) FROM receipts WHERE date_ts >= ? AND date_ts < ?",
+        (0, 1)
+    ))
+    assert "USING COVERING INDEX" in plan
@@ -0,0 +1,52 @@
+"""
+Test keyset-paginated receipt history
+"""
+import sys
+import os
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+
+
+ITEMS = [
+    {'id': 1, 'name': 'Coffee', 'price': 45.0, 'qty': 2, 'total': 90.0},
+    {'id': 2, 'name': 'Cake', 'price': 80.0, 'qty': 1, 'total': 80.0},
+]
+PRODUCTS = [(item['name'], item['price'], "Test") for item in ITEMS]
+
+
+def test_pages_walk_all_receipts_newest_first(make_db):
+    db = make_db(PRODUCTS)
+    # Several receipts share a timestamp, so paging must break ties by id
+    batch = [
+        {'items': ITEMS[:1 + i % 2], 'total': float(i), 'cash_received': 500.0, 'change': 0.0,
+         'date': f"2024-01-{1 + i // 3:02d} 10:00:00"}
+        for i in range(10)
+    ]
+    db.save_receipts(batch)
+
+    seen = []
+    page = db.get_receipts_page(limit=4)
+    while page:
+        seen.extend(page)
+        page = db.get_receipts_page(before=(page[-1]['date_ts'], page[-1]['id']), limit=4)
+
+    assert [r['total'] for r in seen] == [9.0, 8.0, 7.0, 6.0, 5.0, 4.0, 3.0, 2.0, 1.0, 0.0]
+    assert [r['items_count'] for r in seen[:2]] == [2, 1]
+    assert db.get_all_receipts(limit=3) == seen[:3]
+
+
+def test_migration_counts_existing_items(make_db):
+    db = make_db(PRODUCTS)
+    receipt_id = db.save_receipt(ITEMS, 170.0, 200.0, 30.0)
+    db.conn.execute("UPDATE receipts SET items_count = 0")
+    db.conn.execute("DELETE FROM schema_version WHERE version >= 6")
+    db.conn.commit()
+    db.close()
+
+    db = DatabaseManager(db.db_path)
+    assert db.get_receipts_page()[0]['items_count'] == 2
+    assert db.get_receipt_by_id(receipt_id)['total'] == 170.0
@@ -0,0 +1,150 @@
+"""
+Test background receipt writer and journal replay
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import ReceiptWriter
+
+
+ITEMS = [{'id': 1, 'name': 'Coffee', 'price': 45.0, 'qty': 2, 'total': 90.0}]
+PRODUCTS = [("Coffee", 45.0, "Beverages")]
+
+
+def test_submit_returns_before_write_and_flush_commits(make_db):
+    db = make_db(PRODUCTS)
+    writer = ReceiptWriter(db.db_path, fsync=False)
+    writer.start()
+
+    numbers = [writer.submit(ITEMS, 90.0, 100.0, 10.0) for _ in range(20)]
+    writer.flush()
+
+    assert len(set(numbers)) == 20
+    rows = db.conn.execute("SELECT receipt_no FROM receipts ORDER BY id").fetchall()
+    assert [row['receipt_no'] for row in rows] == numbers
+    assert os.path.getsize(writer.journal_path) == 0
+    writer.stop()
+
+
+def test_replays_journal_after_crash(make_db, tmp_path):
+    db = make_db(PRODUCTS)
+    journal = tmp_path / "pos_receipts.journal"
+
+    # First receipt reached the database before the crash, second did not,
+    # third was being written when the power went out
+    committed = {'receipt_no': "A-1", 'date': "2024-01-01 09:00:00", 'items': ITEMS,
+                 'total': 90.0, 'cash_received': 100.0, 'change': 10.0}
+    lost = dict(committed, receipt_no="A-2", date="2024-01-01 09:05:00")
+    db.save_receipts([committed])
+    journal.write_text(json.dumps(committed) + "\n" + json.dumps(lost) + "\n" + '{"receipt_no": "A-',
+                       encoding="utf-8")
+
+    writer = ReceiptWriter(db.db_path)
+    assert writer.start() == 1
+    writer.stop()
+
+    rows = db.conn.execute("SELECT receipt_no, date FROM receipts ORDER BY id").fetchall()
+    assert [tuple(row) for row in rows] == [("A-1", "2024-01-01 09:00:00"), ("A-2", "2024-01-01 09:05:00")]
+    assert journal.read_text(encoding="utf-8") == ""
+
+
+def test_failing_receipt_is_set_aside(make_db):
+    db = make_db(PRODUCTS)
+    writer = ReceiptWriter(db.db_path, fsync=False)
+    writer.start()
+
+    # Product deleted while still in the cart: its receipt can never be saved
+    good = writer.submit(ITEMS, 90.0, 100.0, 10.0)
+    bad = writer.submit([dict(ITEMS[0], id=99)], 90.0, 100.0, 10.0)
+    after = writer.submit(ITEMS, 90.0, 100.0, 10.0)
+    assert writer.flush(timeout=5)
+
+    rows = db.conn.execute("SELECT receipt_no FROM receipts ORDER BY id").fetchall()
+    assert [row['receipt_no'] for row in rows] == [good, after]
+    assert writer.failed == 1
+    with open(writer.failed_path, encoding="utf-8") as f:
+        assert [json.loads(line)['receipt_no'] for line in f] == [bad]
+    writer.stop()
+
+
+def test_replay_sets_aside_only_failing_receipts(make_db, tmp_path):
+    db = make_db(PRODUCTS)
+    journal = tmp_path / "pos_receipts.journal"
+    good = {'receipt_no': "A-1", 'date': "2024-01-01 09:00:00", 'items': ITEMS,
+            'total': 90.0, 'cash_received': 100.0, 'change': 10.0}
+    bad = dict(good, receipt_no="A-2", items=[dict(ITEMS[0], id=99)])
+    later = dict(good, receipt_no="A-3")
+    journal.write_text("".join(json.dumps(r) + "\n" for r in (good, bad, later)), encoding="utf-8")
+
+    writer = ReceiptWriter(db.db_path)
+    assert writer.start() == 2
+    writer.stop()
+
+    rows = db.conn.execute("SELECT receipt_no FROM receipts ORDER BY id").fetchall()
+    assert [row['receipt_no'] for row in rows] == ["A-1", "A-3"]
+    with open(writer.failed_path, encoding="utf-8") as f:
+        assert [json.loads(line)['receipt_no'] for line in f] == ["A-2"]
+
+
+def test_terminals_never_share_receipt_numbers(make_db):
+    db = make_db(PRODUCTS)
+    # Two terminals on one shared database, first sale of the same second
+    first = ReceiptWriter(db.db_path, journal_path=db.db_path + ".first", fsync=False)
+    second = ReceiptWriter(db.db_path, journal_path=db.db_path + ".second", fsync=False)
+    first.start()
+    second.start()
+
+    numbers = [first.submit(ITEMS, 90.0, 100.0, 10.0), second.submit(ITEMS, 90.0, 100.0, 10.0)]
+    assert first.flush(timeout=5) and second.flush(timeout=5)
+    first.stop()
+    second.stop()
+
+    assert numbers[0] != numbers[1]
+    assert db.conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0] == 2
+
+
+def test_reused_receipt_number_is_set_aside(make_db, tmp_path):
+    db = make_db(PRODUCTS)
+    journal = tmp_path / "pos_receipts.journal"
+    saved = {'receipt_no': "A-1", 'date': "2024-01-01 09:00:00", 'items': ITEMS,
+             'total': 90.0, 'cash_received': 100.0, 'change': 10.0}
+    other_sale = dict(saved, total=45.0, items=[dict(ITEMS[0], qty=1, total=45.0)])
+    db.save_receipts([saved])
+    journal.write_text(json.dumps(other_sale) + "\n", encoding="utf-8")
+
+    writer = ReceiptWriter(db.db_path)
+    assert writer.start() == 0
+    writer.stop()
+
+    assert writer.failed == 1
+    with open(writer.failed_path, encoding="utf-8") as f:
+        assert [json.loads(line)['total'] for line in f] == [45.0]
+
+
+def test_set_aside_receipts_are_reported_and_retried(make_db):
+    db = make_db(PRODUCTS)
+    failures = []
+    writer = ReceiptWriter(db.db_path, fsync=False, on_failed=lambda receipt, error: failures.append(receipt))
+    writer.start()
+
+    bad = writer.submit([dict(ITEMS[0], id=99)], 90.0, 100.0, 10.0)
+    assert writer.flush(timeout=5)
+    assert [r['receipt_no'] for r in failures] == [bad]
+    assert [(r['receipt_no'], 'FOREIGN KEY' in r['error']) for r in writer.failed_receipts()] == [(bad, True)]
+
+    # Once the cause is fixed the manager saves it from History
+    with db.write_transaction() as cursor:
+        cursor.execute("INSERT INTO products (id, name, price, category_id) VALUES (99, 'Tea', 45.0, 1)")
+    assert writer.retry_failed() == 1
+    assert writer.flush(timeout=5)
+    writer.stop()
+
+    assert writer.failed_receipts() == []
+    assert not os.path.exists(writer.failed_path)
+    rows = db.conn.execute("SELECT receipt_no FROM receipts").fetchall()
+    assert [row['receipt_no'] for row in rows] == [bad]
@@ -0,0 +1,108 @@
+"""
+Test receipt search filters, paging and result cache
+"""
+import sys
+import os
+import itertools
+import threading
+import time
+from datetime import date
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager, ReceiptFilter
+
+
+RECEIPTS = [
+    {'items': [], 'total': float(10 * (i % 30)), 'cash_received': 500.0, 'change': 0.0,
+     'date': f"2024-{1 + i % 3:02d}-{1 + i % 28:02d} {i % 24:02d}:00:00", 'receipt_no': f"R-{i}"}
+    for i in range(200)
+]
+
+
+def all_pages(db, filters, limit=7):
+    results = []
+    page = db.search_receipts(filters, limit=limit)
+    while page:
+        results.extend(page)
+        page = db.search_receipts(filters, before=(page[-1]['date_ts'], page[-1]['id']), limit=limit)
+    return results
+
+
+def test_every_filter_combination_matches_a_scan(make_db):
+    db = make_db()
+    db.save_receipts(RECEIPTS)
+    everything = all_pages(db, None)
+    assert len(everything) == 200
+
+    values = {
+        'receipt_id': ["17", "R-42"],
+        'date_from': [date(2024, 2, 1)],
+        'date_to': ["2024-03-01"],
+        'min_total': [100],
+        'max_total': [200.0],
+    }
+    for n in range(1, len(values) + 1):
+        for fields in itertools.combinations(values, n):
+            for combo in itertools.product(*(values[f] for f in fields)):
+                filters = ReceiptFilter(**dict(zip(fields, combo)))
+                expected = [r for r in everything if matches(r, filters)]
+                assert all_pages(db, filters) == expected, filters
+
+
+def matches(receipt, filters):
+    if filters.receipt_id is not None and filters.receipt_id not in (str(receipt['id']), receipt['receipt_no']):
+        return False
+    day = receipt['date'][:10]
+    if filters.date_from is not None and day < str(filters.date_from):
+        return False
+    if filters.date_to is not None and day >= str(filters.date_to):
+        return False
+    if filters.min_total is not None and receipt['total'] < filters.min_total:
+        return False
+    if filters.max_total is not None and receipt['total'] > filters.max_total:
+        return False
+    return True
+
+
+def test_cache_is_dropped_when_receipts_change(make_db):
+    db = make_db()
+    db.save_receipts(RECEIPTS)
+    filters = ReceiptFilter(min_total=290)
+    first = db.search_receipts(filters)
+    assert db.search_receipts(filters) == first
+    assert len(db._receipt_cache) == 1
+
+    # Write through another connection (like the background receipt writer)
+    other = DatabaseManager(db.db_path)
+    other.save_receipts([{'items': [], 'total': 999.0, 'cash_received': 999.0, 'change': 0.0,
+                          'date': "2025-01-01 10:00:00"}])
+    assert db.search_receipts(filters)[0]['total'] == 999.0
+
+    db.conn.execute("DELETE FROM receipts WHERE total = 999")
+    db.conn.commit()
+    assert db.search_receipts(filters) == first
+
+
+def test_search_does_not_wait_for_writes(make_db):
+    db = make_db()
+    db.save_receipts(RECEIPTS)
+    holding, release = threading.Event(), threading.Event()
+
+    def long_write():
+        with db.write_transaction():
+            holding.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=long_write)
+    writer.start()
+    holding.wait()
+    start = time.perf_counter()
+    try:
+        assert len(db.search_receipts(None)) == 50
+    finally:
+        release.set()
+        writer.join()
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,68 @@
+"""
+Test record rows returned by DatabaseManager reads
+"""
+import sys
+import os
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+import pytest
+
+from database import ProductRecord, ReceiptItemRecord, ReceiptRecord, ReceiptSummary
+
+
+ITEMS = [
+    {'id': 1, 'name': 'Coffee', 'price': 45.0, 'qty': 2, 'total': 90.0},
+    {'id': 2, 'name': 'Cake', 'price': 80.0, 'qty': 1, 'total': 80.0},
+]
+PRODUCTS = [(item['name'], item['price'], "Test") for item in ITEMS]
+
+
+def test_product_reads_return_records(make_db):
+    db = make_db(PRODUCTS)
+
+    products = db.get_all_products()
+    assert all(type(p) is ProductRecord for p in products)
+    assert type(db.get_products_by_category("Test")[0]) is ProductRecord
+    assert type(db.search_products("Cof")[0]) is ProductRecord
+
+    product = db.get_product_by_id(products[0]['id'])
+    assert product == products[0]
+    assert db.get_product_by_id(999) is None
+
+
+def test_records_read_like_dicts():
+    product = ProductRecord(1, "Coffee", 45.0, "Drinks")
+
+    assert product['name'] == product.name == "Coffee"
+    assert product.get('category') == "Drinks"
+    assert product.get('qty', 1) == 1
+    assert 'price' in product and 'qty' not in product
+    assert dict(product) == product.to_dict() == {'id': 1, 'name': "Coffee", 'price': 45.0, 'category': "Drinks"}
+    assert {**product, 'qty': 2}['qty'] == 2
+    assert product == product.to_dict()
+    assert ProductRecord.from_dict(product.to_dict()) == product
+    assert hash(product) == hash(ProductRecord(1, "Coffee", 45.0, "Drinks"))
+    with pytest.raises(KeyError):
+        product['qty']
+
+
+def test_receipt_reads_return_records(make_db):
+    db = make_db(PRODUCTS)
+    receipt_id, = db.save_receipts([{'items': ITEMS, 'total': 170.0, 'cash_received': 200.0, 'change': 30.0,
+                                     'date': "2024-03-01 09:30:00"}])
+
+    summary = db.get_all_receipts()[0]
+    assert type(summary) is ReceiptSummary
+    assert summary['items_count'] == 2
+    assert summary['date_ts'] == 1709285400
+    assert db.receipts_between("2024-03-01", "2024-03-02") == [summary]
+
+    receipt = db.get_receipt_by_id(receipt_id)
+    assert type(receipt) is ReceiptRecord
+    assert receipt['total'] == 170.0
+    assert all(type(item) is ReceiptItemRecord for item in receipt['items'])
+    assert receipt['items'] == ITEMS
+    assert db.get_receipt_by_id(999) is None
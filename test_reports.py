@@ -0,0 +1,85 @@
+"""
+Test sales report engine
+"""
+import sys
+import os
+from datetime import date
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import ReportEngine
+from database.reports import report_range
+
+
+PRODUCTS = [('Coffee', 45.0, 'Drinks'), ('Tea', 30.0, 'Drinks'), ('Cake', 80.0, 'Bakery')]
+
+
+def receipt(when, lines, payment_method="Cash"):
+    items = [{'id': pid, 'name': PRODUCTS[pid - 1][0], 'price': PRODUCTS[pid - 1][1], 'qty': qty,
+              'total': PRODUCTS[pid - 1][1] * qty} for pid, qty in lines]
+    total = sum(item['total'] for item in items)
+    return {'items': items, 'total': total, 'cash_received': total, 'change': 0.0,
+            'date': when, 'payment_method': payment_method}
+
+
+def test_report_ranges():
+    today = date(2024, 2, 14)  # Wednesday
+    assert report_range('daily', today) == (today, today)
+    assert report_range('weekly', today) == (date(2024, 2, 12), date(2024, 2, 18))
+    assert report_range('monthly', today) == (date(2024, 2, 1), date(2024, 2, 29))
+    assert report_range('yearly', today) == (date(2024, 1, 1), date(2024, 12, 31))
+    assert report_range('custom', today, "2024-01-05", "2024-01-06") == (date(2024, 1, 5), date(2024, 1, 6))
+    with pytest.raises(ValueError):
+        report_range('custom', today, "2024-01-05", None)
+    with pytest.raises(ValueError):
+        report_range('hourly', today)
+
+
+def test_report_breakdowns(make_db):
+    db = make_db(PRODUCTS)
+    db.save_receipts([
+        receipt("2024-02-13 09:15:00", [(1, 2), (3, 1)]),
+        receipt("2024-02-13 09:45:00", [(2, 1)], "QR"),
+        receipt("2024-02-14 18:00:00", [(1, 1)]),
+        receipt("2024-03-01 10:00:00", [(3, 5)]),  # outside February
+    ])
+
+    report = ReportEngine(db).generate('monthly', today="2024-02-14")
+    assert (report['receipts'], report['sales']) == (3, 245.0)
+    assert report['tax'] == pytest.approx(245.0 * 7 / 107)
+    assert len(report['by_period']) == 29
+    assert report['by_period'][12] == {'period': '2024-02-13', 'receipts': 2, 'sales': 200.0,
+                                       'tax': pytest.approx(200.0 * 7 / 107)}
+    assert [(r['category'], r['qty'], r['sales']) for r in report['by_category']] == [
+        ('Drinks', 4, 165.0), ('Bakery', 1, 80.0)]
+    assert [(r['name'], r['qty']) for r in report['by_product']] == [('Coffee', 3), ('Cake', 1), ('Tea', 1)]
+    assert report['by_hour'][9] == {'hour': 9, 'receipts': 2, 'sales': 200.0}
+    assert report['by_hour'][18]['sales'] == 45.0
+    assert [(r['payment_method'], r['receipts']) for r in report['by_payment_method']] == [('Cash', 2), ('QR', 1)]
+
+    yearly = ReportEngine(db).generate('yearly', today="2024-02-14")
+    assert [(r['period'], r['receipts']) for r in yearly['by_period'][:3]] == [
+        ('2024-01', 0), ('2024-02', 3), ('2024-03', 1)]
+
+
+def test_closed_days_are_cached_until_they_change(make_db):
+    db = make_db(PRODUCTS)
+    db.save_receipts([receipt("2024-02-13 09:00:00", [(1, 1)]), receipt("2024-02-14 09:00:00", [(2, 1)])])
+    engine = ReportEngine(db)
+
+    first = engine.generate('weekly', today="2024-02-14")
+    assert '2024-02-13' in engine._days and '2024-02-14' not in engine._days
+    assert engine.generate('weekly', today="2024-02-14") == first
+
+    # Today is always recomputed
+    db.save_receipts([receipt("2024-02-14 10:00:00", [(3, 1)])])
+    assert engine.generate('weekly', today="2024-02-14")['sales'] == first['sales'] + 80.0
+
+    # A closed day that changed is recomputed too
+    db.save_receipts([receipt("2024-02-12 10:00:00", [(3, 2)])])
+    report = engine.generate('weekly', today="2024-02-14")
+    assert report['by_category'][0] == {'category': 'Bakery', 'qty': 3, 'sales': 240.0}
@@ -0,0 +1,69 @@
+"""
+Test daily_sales rollup behind get_sales_summary
+"""
+import sys
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+
+
+ITEMS = [{'id': 1, 'name': 'Coffee', 'price': 53.5, 'qty': 2, 'total': 107.0}]
+PRODUCTS = [("Coffee", 53.5, "Beverages")]
+
+
+def rollup(db):
+    return {tuple(row) for row in db.conn.execute(
+        "SELECT day, payment_method, receipts, ROUND(gross, 2), ROUND(tax, 2) FROM daily_sales WHERE receipts > 0"
+    )}
+
+
+def test_summary_follows_receipt_changes(make_db):
+    db = make_db(PRODUCTS)
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    db.save_receipt(ITEMS, 107.0, 200.0, 93.0)
+    card_id = db.save_receipt(ITEMS, 214.0, 214.0, 0.0, payment_method="Card")
+    db.save_receipts([{'items': ITEMS, 'total': 107.0, 'cash_received': 107.0, 'change': 0.0,
+                       'date': "2024-01-02 10:00:00"}])
+
+    summary = db.get_sales_summary()
+    assert summary['total_receipts'] == 3
+    assert summary['total_sales'] == pytest.approx(428.0)
+    assert summary['today_receipts'] == 2
+    assert summary['today_sales'] == pytest.approx(321.0)
+    assert summary['today_tax'] == pytest.approx(21.0)
+    assert summary['today_by_payment_method'] == {'Cash': 107.0, 'Card': 214.0}
+
+    db.conn.execute("UPDATE receipts SET payment_method = 'QR' WHERE id = ?", (card_id,))
+    db.conn.execute("DELETE FROM receipts WHERE date LIKE '2024-01-02%'")
+    db.conn.commit()
+    assert rollup(db) == {(today, 'Cash', 1, 107.0, 7.0), (today, 'QR', 1, 214.0, 14.0)}
+    assert db.get_sales_summary()['total_receipts'] == 2
+
+
+def test_migration_backfills_rollup(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE receipts (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL,
+                               total REAL NOT NULL, cash_received REAL NOT NULL,
+                               change REAL NOT NULL, created_at TIMESTAMP);
+        INSERT INTO receipts (date, total, cash_received, change) VALUES
+            ('2024-01-01 09:00:00', 107, 107, 0),
+            ('2024-01-01 12:00:00', 214, 300, 86),
+            ('2024-01-02 09:00:00', 53.5, 60, 6.5);
+    """)
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+    assert rollup(db) == {('2024-01-01', 'Cash', 2, 321.0, 21.0), ('2024-01-02', 'Cash', 1, 53.5, 3.5)}
+    assert db.get_sales_summary()['total_sales'] == pytest.approx(374.5)
@@ -0,0 +1,56 @@
+"""
+Test batched receipt writes
+"""
+import sys
+import os
+import sqlite3
+
+import pytest
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+
+ITEMS = [
+    {'id': 1, 'name': 'Coffee', 'price': 45.0, 'qty': 2, 'total': 90.0},
+    {'id': 2, 'name': 'Cake', 'price': 80.0, 'qty': 1, 'total': 80.0},
+]
+PRODUCTS = [(item['name'], item['price'], "Test") for item in ITEMS]
+
+
+def count(db, table):
+    return db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_save_receipts_in_one_transaction(make_db):
+    db = make_db(PRODUCTS)
+    batch = [
+        {'items': ITEMS, 'total': 170.0, 'cash_received': 200.0, 'change': 30.0},
+        {'items': ITEMS[:1], 'total': 90.0, 'cash_received': 100.0, 'change': 10.0,
+         'date': "2024-01-02 10:00:00"},
+    ]
+
+    receipt_ids = db.save_receipts(batch)
+
+    assert len(receipt_ids) == 2
+    assert count(db, "receipt_items") == 3
+    second = db.get_receipt_by_id(receipt_ids[1])
+    assert second['date'] == "2024-01-02 10:00:00"
+    assert [item['name'] for item in second['items']] == ["Coffee"]
+
+
+def test_failed_batch_writes_nothing(make_db):
+    db = make_db(PRODUCTS)
+    db.save_receipt(ITEMS, 170.0, 200.0, 30.0)
+
+    bad_item = dict(ITEMS[0], id=999)  # unknown product (foreign key)
+    batch = [
+        {'items': ITEMS, 'total': 170.0, 'cash_received': 200.0, 'change': 30.0},
+        {'items': [bad_item], 'total': 45.0, 'cash_received': 50.0, 'change': 5.0},
+    ]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.save_receipts(batch)
+
+    assert count(db, "receipts") == 1
+    assert count(db, "receipt_items") == 2